@@ -1,16 +1,37 @@
-from fastapi import Depends, HTTPException, status
+from typing import Any, Awaitable, Callable, Optional
+import httpx
+from fastapi import Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import canonical_hash
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.idempotency import IdempotencyConflict, IdempotencyInProgress, IdempotencyStore
+from app.core.revocation import revocation_list
+from app.db.async_session import get_async_db
 from app.models.user_models import User
+from app.services.ai_enhancement import ResumeEnhancementService
+from app.services.ai_service import AIService
+from app.services.pdf_executor import PDFRenderExecutor
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
 
+def user_from_claims(payload: dict) -> User:
+    """Build a transient (not session-bound) User from access token claims"""
+    return User(
+        id=payload["uid"],
+        email=payload["sub"],
+        full_name=payload.get("full_name"),
+        google_id=payload.get("google_id"),
+        picture=payload.get("picture"),
+        is_active=True,
+    )
+
+
 async def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
 ) -> User:
     if not token:
         raise HTTPException(
@@ -22,12 +43,73 @@ async def get_current_user(
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         email: str = payload.get("sub")
-        if email is None:
+        # Refresh tokens carry the same claims but must only reach /refresh-token
+        if email is None or payload.get("type") != "access":
             raise HTTPException(status_code=401, detail="Invalid token")
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user = db.query(User).filter(User.email == email).first()
-    if not user:
+    # Logged-out tokens and deactivated users (an in-memory lookup)
+    if revocation_list.is_revoked(payload):
+        raise HTTPException(status_code=401, detail="Token revoked")
+
+    # Stateless mode: the signed claims are authoritative, so no DB round trip.
+    # AsyncSession only checks out a connection on first use, so `db` stays idle.
+    if settings.STATELESS_SESSIONS and payload.get("uid") is not None:
+        return user_from_claims(payload)
+
+    user = await db.scalar(select(User).where(User.email == email))
+    if not user or not user.is_active:
         raise HTTPException(status_code=401, detail="User not found")
     return user
+
+
+def get_enhancement_service(request: Request) -> ResumeEnhancementService:
+    """Process-wide ResumeEnhancementService created in the app lifespan"""
+    return request.app.state.enhancement_service
+
+
+def get_ai_service(request: Request) -> AIService:
+    """Process-wide AIService created in the app lifespan"""
+    return request.app.state.ai_service
+
+
+def get_pdf_executor(request: Request) -> PDFRenderExecutor:
+    """Process-wide PDF render pool started in the app lifespan"""
+    return request.app.state.pdf_executor
+
+
+def get_google_http_client(request: Request) -> httpx.AsyncClient:
+    """Process-wide Google connection pool created in the app lifespan"""
+    return request.app.state.google_http_client
+
+
+def get_idempotency_store(request: Request) -> IdempotencyStore:
+    """Process-wide Idempotency-Key store created in the app lifespan"""
+    return request.app.state.idempotency_store
+
+
+async def run_idempotent(
+    store: IdempotencyStore,
+    idempotency_key: Optional[str],
+    scope: str,
+    payload: Any,
+    response: Response,
+    compute: Callable[[], Awaitable[Any]],
+) -> Any:
+    """Run ``compute`` once per ``Idempotency-Key`` and replay its JSON result.
+
+    ``scope`` namespaces the key (route plus user where there is one), and
+    the payload hash detects a key reused for a different request.
+    """
+    if idempotency_key is None:
+        return await compute()
+    try:
+        result = await store.run(f"{scope}:{idempotency_key}", canonical_hash(payload), compute)
+    except IdempotencyConflict as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": "1"})
+    if result.hit:
+        response.headers["Idempotent-Replayed"] = "true"
+    return result.value
@@ -0,0 +1,57 @@
+from typing import Any, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, Security, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.query_profiler import query_profiler
+from app.core.revocation import revocation_list
+from app.db.async_session import get_async_db
+from app.models.user import User
+
+router = APIRouter()
+
+
+async def get_admin_user(current_user: User = Security(get_current_user)) -> User:
+    if current_user.email not in settings.ADMIN_EMAILS:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+@router.get("/queries", response_model=Dict[str, Any])
+async def query_report(
+    limit: int = Query(50, ge=1, le=500),
+    order_by: str = Query("total", pattern="^(total|count|mean|p50|p99|max)$"),
+    admin: User = Security(get_admin_user),
+):
+    """
+    Hottest query fingerprints in this worker, with suspected N+1 patterns
+
+    Statistics are sampled (`QUERY_PROFILER_SAMPLE_RATE`) and per process.
+    """
+    return query_profiler.report(limit, order_by)
+
+
+@router.delete("/queries", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_report(admin: User = Security(get_admin_user)):
+    """
+    Clear the collected query statistics
+    """
+    query_profiler.reset()
+
+
+@router.post("/users/{user_id}/deactivate", status_code=status.HTTP_204_NO_CONTENT)
+async def deactivate_user(
+    user_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    admin: User = Security(get_admin_user),
+):
+    """
+    Deactivate a user; their outstanding tokens stop working on this worker at
+    once and on the others at their next revocation-list refresh
+    """
+    user = await db.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    user.is_active = False
+    await db.commit()
+    revocation_list.revoke_user(user_id)
@@ -1,23 +1,20 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
 from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session
-from google.oauth2 import id_token
-from google.auth.transport import requests
-from google.auth.exceptions import GoogleAuthError
-from app.core.database import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.deps import get_current_user, get_google_http_client, oauth2_scheme
+from app.db.async_session import get_async_db, get_or_create
 from app.core.config import settings
+from app.core.google_verifier import google_token_verifier
+from app.core.revocation import revocation_list
 from app.models.user_models import User
 import httpx
 from datetime import timedelta
 from app.core.security import create_access_token, create_token_pair, verify_token
-from typing import Dict
+from typing import Any, Dict, Optional
 
 router = APIRouter()
 
-GOOGLE_AUTH_URL = "https://accounts.google.com/o/oauth2/v2/auth"
-GOOGLE_TOKEN_URL = "https://oauth2.googleapis.com/token"
-GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v1/userinfo"
-
 
 class GoogleAuthException(HTTPException):
     def __init__(self, detail: str):
@@ -31,13 +28,13 @@ async def login_google():
         params = {
             "client_id": settings.GOOGLE_CLIENT_ID,
             "response_type": "code",
-            "scope": "email profile",
+            "scope": "openid email profile",
             "redirect_uri": settings.GOOGLE_REDIRECT_URI,
             "prompt": "select_account",
         }
 
         query_string = "&".join(f"{k}={v}" for k, v in params.items())
-        auth_url = f"{GOOGLE_AUTH_URL}?{query_string}"
+        auth_url = f"{settings.GOOGLE_AUTH_URL}?{query_string}"
 
         return {"auth_url": auth_url}  # Return URL instead of redirecting
 
@@ -50,8 +47,11 @@ async def login_google():
 
 @router.get("/callback")
 async def auth_callback(
-    code: str = None, error: str = None, db: Session = Depends(get_db)
-) -> Dict[str, str]:
+    code: str = None,
+    error: str = None,
+    db: AsyncSession = Depends(get_async_db),
+    http_client: httpx.AsyncClient = Depends(get_google_http_client),
+) -> Dict[str, Any]:
     """Handle Google OAuth2 callback"""
 
     # Handle OAuth2 errors
@@ -68,36 +68,31 @@ async def auth_callback(
         raise GoogleAuthException("No authorization code provided")
 
     try:
-        # Exchange code for tokens
-        async with httpx.AsyncClient() as client:
-            token_response = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "client_id": settings.GOOGLE_CLIENT_ID,
-                    "client_secret": settings.GOOGLE_CLIENT_SECRET,
-                    "code": code,
-                    "grant_type": "authorization_code",
-                    "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-                },
-                timeout=10.0,  # Add timeout
-            )
-
-            if token_response.status_code != 200:
-                raise GoogleAuthException("Failed to obtain access token")
-
-            token_data = token_response.json()
+        # Exchange code for tokens over the shared, keep-alive connection pool
+        token_response = await http_client.post(
+            settings.GOOGLE_TOKEN_URL,
+            data={
+                "client_id": settings.GOOGLE_CLIENT_ID,
+                "client_secret": settings.GOOGLE_CLIENT_SECRET,
+                "code": code,
+                "grant_type": "authorization_code",
+                "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+            },
+        )
 
-            # Get user info using access token
-            user_response = await client.get(
-                GOOGLE_USERINFO_URL,
-                headers={"Authorization": f"Bearer {token_data['access_token']}"},
-                timeout=10.0,
-            )
+        if token_response.status_code != 200:
+            raise GoogleAuthException("Failed to obtain access token")
 
-            if user_response.status_code != 200:
-                raise GoogleAuthException("Failed to get user info")
+        id_token = token_response.json().get("id_token")
+        if not id_token:
+            raise GoogleAuthException("No ID token returned by Google")
 
-            user_data = user_response.json()
+        # The ID token already carries the profile; verifying it locally
+        # against Google's cached keys saves a userinfo round trip
+        try:
+            user_data = await google_token_verifier.verify(id_token)
+        except ValueError:
+            raise GoogleAuthException("Invalid ID token")
 
         # Verify email domain if needed
         email = user_data.get("email")
@@ -109,31 +104,31 @@ async def auth_callback(
         #     raise GoogleAuthException("Email domain not allowed")
 
         # Check if user exists, create if not
-        user = db.query(User).filter(User.email == email).first()
-        if not user:
-            user = User(
+        try:
+            user = await get_or_create(
+                db,
+                User,
+                defaults={
+                    "full_name": user_data.get("name", ""),
+                    "google_id": user_data["sub"],
+                    "picture": user_data.get("picture"),
+                },
                 email=email,
-                full_name=user_data.get("name", ""),
-                google_id=user_data["id"],
-                picture=user_data.get("picture"),
             )
-            try:
-                db.add(user)
-                db.commit()
-                db.refresh(user)
-            except Exception as e:
-                db.rollback()
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail="Database error while creating user",
-                )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Database error while creating user",
+            )
 
         # Create access token
         access_token = create_access_token(
             data={
                 "sub": user.email,
+                "uid": user.id,
                 "google_id": user.google_id,
                 "full_name": user.full_name,
+                "picture": user.picture,
             }
         )
 
@@ -168,7 +163,7 @@ async def auth_callback(
 
 # Add a test endpoint to verify token
 @router.get("/verify-token")
-async def verify_token(current_user: User = Depends(get_current_user)):
+async def verify_access_token(current_user: User = Depends(get_current_user)):
     return {
         "email": current_user.email,
         "full_name": current_user.full_name,
@@ -177,29 +172,34 @@ async def verify_token(current_user: User = Depends(get_current_user)):
 
 
 @router.post("/refresh-token")
-async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
+async def refresh_token(refresh_token: str, db: AsyncSession = Depends(get_async_db)):
     """Refresh access token using refresh token"""
     try:
         # Verify refresh token
         payload = verify_token(refresh_token, "refresh")
-        if not payload:
+        if not payload or revocation_list.is_revoked(payload):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
             )
 
         # Get user
-        user = db.query(User).filter(User.email == payload.get("sub")).first()
-        if not user:
+        user = await db.scalar(select(User).where(User.email == payload.get("sub")))
+        if not user or not user.is_active:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
             )
 
+        # Rotate: each refresh token can be exchanged once
+        revocation_list.revoke_payload(payload)
+
         # Create new token pair
         access_token, new_refresh_token = create_token_pair(
             {
                 "sub": user.email,
+                "uid": user.id,
                 "google_id": user.google_id,
                 "full_name": user.full_name,
+                "picture": user.picture,
             }
         )
 
@@ -213,3 +213,20 @@ async def refresh_token(refresh_token: str, db: Session = Depends(get_db)):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Could not refresh token"
         )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(refresh_token: Optional[str] = None, token: Optional[str] = Depends(oauth2_scheme)):
+    """Revoke the bearer access token and, if given, the caller's refresh token"""
+    payload = verify_token(token, "access") if token else None
+    if not payload:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+        )
+    revocation_list.revoke_payload(payload)
+
+    if refresh_token:
+        refresh_payload = verify_token(refresh_token, "refresh")
+        # Only the caller's own refresh token; anything else is ignored
+        if refresh_payload and refresh_payload.get("sub") == payload.get("sub"):
+            revocation_list.revoke_payload(refresh_payload)
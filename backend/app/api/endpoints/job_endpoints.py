@@ -0,0 +1,44 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Security, status
+from app.core.auth import get_current_user
+from app.jobs.queue import JobQueue
+from app.models.user import User
+from app.schemas.job_schemas import JobResponse, JobSubmit
+
+router = APIRouter()
+
+
+def get_job_queue(request: Request) -> JobQueue:
+    return request.app.state.job_queue
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def submit_job(
+    job: JobSubmit,
+    current_user: User = Security(get_current_user),
+    queue: JobQueue = Depends(get_job_queue),
+):
+    """
+    Queue an AI enhancement, content generation or PDF job
+
+    Returns immediately with the job id; poll `GET /jobs/{id}` for the result.
+    """
+    try:
+        submitted = await queue.submit(job.type, job.payload, owner=current_user.email)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return JobResponse(**submitted.model_dump())
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: str,
+    current_user: User = Security(get_current_user),
+    queue: JobQueue = Depends(get_job_queue),
+):
+    """
+    Report a job's status and, once finished, its result or error
+    """
+    job = await queue.get(job_id)
+    if job is None or job.owner != current_user.email:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return JobResponse(**job.model_dump())
@@ -1,32 +1,173 @@
-from fastapi import APIRouter, HTTPException, Depends, Security
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Security, Request, Response, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Dict, Any, List, Optional
+import asyncio
+import logging
+from app.api.deps import get_enhancement_service, get_idempotency_store, run_idempotent
+from app.core.idempotency import IdempotencyStore
 from app.services.ai_enhancement import ResumeEnhancementService
-from app.schemas.resume_schemas import ResumeCreate, ResumeResponse
+from app.schemas.resume_schemas import (
+    JobMatchRequest,
+    JobMatchScore,
+    ResumeCreate,
+    ResumeMatchRequest,
+    ResumeMatchScore,
+    ResumePage,
+    ResumeResponse,
+    ResumeSearchHit,
+    ResumeSearchPage,
+    ResumeUpdate,
+    ResumeVersionContent,
+    ResumeVersionDiff,
+    ResumeVersionInfo,
+)
+from app.services.resume_service import ResumeService
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.async_session import get_async_db
 from app.core.auth import get_current_user, verify_token_manually
+from app.core import json_codec
+from app.core.config import settings
 from app.models.resume_models import Resume
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json_codec.dumps(data)}\n\n"
+
 # Protected endpoint (requires authentication)
 @router.post("/enhance", response_model=Dict[str, Any])
 async def enhance_resume(
     resume: ResumeCreate,
-    current_user: User = Security(get_current_user)
+    request: Request,
+    response: Response,
+    current_user: User = Security(get_current_user),
+    service: ResumeEnhancementService = Depends(get_enhancement_service),
+    idempotency_store: IdempotencyStore = Depends(get_idempotency_store),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
 ):
     """
     Enhance a resume using AI
+
+    Identical resumes are answered from the result cache; send
+    `Cache-Control: no-cache` to force a fresh generation. Retries that
+    repeat an `Idempotency-Key` get the original response replayed.
     """
-    try:
-        service = ResumeEnhancementService()
-        enhanced_resume = await service.enhance_resume(resume.model_dump())
-        return enhanced_resume
-    except Exception as e:
+    bypass_cache = "no-cache" in request.headers.get("cache-control", "").lower()
+    payload = resume.model_dump()
+
+    async def compute():
+        try:
+            result = await service.enhance_resume_cached(payload, bypass_cache=bypass_cache)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Error enhancing resume: {str(e)}"
+            )
+        response.headers["X-Cache"] = "HIT" if result.hit else "MISS"
+        return result.value
+
+    return await run_idempotent(
+        idempotency_store,
+        idempotency_key,
+        f"enhance:{current_user.id}",
+        payload,
+        response,
+        compute,
+    )
+
+# Protected endpoint (requires authentication)
+@router.post("/enhance/stream")
+async def enhance_resume_stream(
+    resume: ResumeCreate,
+    request: Request,
+    current_user: User = Security(get_current_user),
+    service: ResumeEnhancementService = Depends(get_enhancement_service),
+):
+    """
+    Enhance a resume using AI, streaming the text as Server-Sent Events
+
+    Emits `delta` events with `{"text": ...}` as tokens arrive, then a single
+    `done` (or `error`) event. When the client disconnects the response task
+    is cancelled, which aborts the upstream model stream.
+    """
+    bypass_cache = "no-cache" in request.headers.get("cache-control", "").lower()
+    payload = resume.model_dump()
+
+    async def event_stream() -> AsyncIterator[str]:
+        stream = service.stream_enhancement(payload, bypass_cache=bypass_cache)
+        try:
+            async for delta in stream:
+                yield _sse_event("delta", {"text": delta})
+            yield _sse_event("done", {})
+        except asyncio.CancelledError:
+            logger.info("Client disconnected, cancelling enhancement stream")
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming enhancement: {str(e)}", exc_info=True)
+            yield _sse_event("error", {"detail": f"Error enhancing resume: {str(e)}"})
+        finally:
+            await stream.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Protected endpoint (requires authentication)
+@router.post("/enhance/batch")
+async def enhance_resume_batch(
+    resumes: List[ResumeCreate],
+    request: Request,
+    current_user: User = Security(get_current_user),
+    service: ResumeEnhancementService = Depends(get_enhancement_service),
+):
+    """
+    Enhance many resumes concurrently, streaming results as NDJSON
+
+    One line is written per resume as soon as it finishes, in completion
+    order: `{"index": i, "status": "ok", "result": ...}` or
+    `{"index": i, "status": "error", "detail": ...}`.
+    """
+    if not resumes:
+        raise HTTPException(status_code=422, detail="Batch must contain at least one resume")
+    if len(resumes) > settings.ENHANCE_BATCH_MAX_ITEMS:
         raise HTTPException(
-            status_code=500,
-            detail=f"Error enhancing resume: {str(e)}"
+            status_code=413,
+            detail=f"Batch size exceeds limit of {settings.ENHANCE_BATCH_MAX_ITEMS}",
         )
 
+    bypass_cache = "no-cache" in request.headers.get("cache-control", "").lower()
+    payloads = [resume.model_dump() for resume in resumes]
+
+    async def result_lines() -> AsyncIterator[bytes]:
+        results = service.enhance_many(payloads, bypass_cache=bypass_cache)
+        try:
+            async for index, outcome in results:
+                if isinstance(outcome, Exception):
+                    line = {
+                        "index": index,
+                        "status": "error",
+                        "detail": f"Error enhancing resume: {str(outcome)}",
+                    }
+                else:
+                    line = {
+                        "index": index,
+                        "status": "ok",
+                        "cached": outcome.hit,
+                        "result": outcome.value,
+                    }
+                yield json_codec.dumps_bytes(line) + b"\n"
+        finally:
+            # Cancels items still in flight if the client went away
+            await results.aclose()
+
+    return StreamingResponse(result_lines(), media_type="application/x-ndjson")
+
 # Protected endpoint (requires authentication)
 @router.get("/test-private")
 async def test_private_endpoint(
@@ -57,3 +198,249 @@ async def verify_token(token: str):
     Test endpoint to verify token manually
     """
     return await verify_token_manually(token)
+
+
+def get_resume_service(db: AsyncSession = Depends(get_async_db)) -> ResumeService:
+    return ResumeService(db)
+
+
+def get_match_service(db: AsyncSession = Depends(get_async_db)):
+    # Imported lazily so numpy stays out of `import app.main`
+    from app.services.match_service import ResumeMatchService
+
+    return ResumeMatchService(db)
+
+
+async def _get_owned_resume(
+    resume_id: int, current_user: User, service: ResumeService
+):
+    resume = await service.get(current_user.id, resume_id)
+    if resume is None:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return resume
+
+
+# Declared before /{resume_id} so "search" is not parsed as an id
+@router.get("/search", response_model=ResumeSearchPage)
+async def search_resumes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Full-text search across the current user's resumes
+
+    Supports web-search syntax (`"exact phrase"`, `or`, `-exclude`). Results are
+    ranked by relevance with `<mark>` highlighted snippets.
+    """
+    try:
+        hits, next_cursor = await service.search(current_user.id, q, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ResumeSearchPage(
+        items=[
+            ResumeSearchHit(
+                id=resume.id,
+                user_id=resume.user_id,
+                content=resume.content,
+                created_at=resume.created_at,
+                updated_at=resume.updated_at,
+                rank=rank,
+                highlight=highlight,
+            )
+            for resume, rank, highlight in hits
+        ],
+        next_cursor=next_cursor,
+    )
+
+# Declared before /{resume_id} so "match" is not parsed as an id
+@router.post("/match", response_model=List[ResumeMatchScore])
+async def match_resumes(
+    match: ResumeMatchRequest,
+    current_user: User = Security(get_current_user),
+    matcher=Depends(get_match_service),
+):
+    """
+    Rank the current user's resumes against one job description
+
+    Scores are TF-IDF cosine similarities over the skills and experience
+    sections, computed locally without a model call. Pass `resume_ids` to
+    restrict the candidates.
+    """
+    scored = await matcher.match_resumes(
+        current_user.id, match.job_description, match.resume_ids
+    )
+    scored.sort(key=lambda item: item[1], reverse=True)
+    return [
+        ResumeMatchScore(resume_id=resume.id, score=score)
+        for resume, score in scored[:match.limit]
+    ]
+
+# Stored resume CRUD (declared last so /test-* paths are matched first)
+@router.post("", response_model=ResumeResponse, status_code=status.HTTP_201_CREATED)
+async def create_resume(
+    resume: ResumeCreate,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Store a resume for the current user
+    """
+    return await service.create(current_user.id, resume.content)
+
+@router.get("", response_model=ResumePage)
+async def list_resumes(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    List the current user's resumes, newest first
+
+    Pass `next_cursor` from the previous page as `cursor` to continue.
+    """
+    try:
+        items, next_cursor = await service.list(current_user.id, limit, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ResumePage(items=items, next_cursor=next_cursor)
+
+@router.get("/{resume_id}", response_model=ResumeResponse)
+async def get_resume(
+    resume_id: int,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Fetch one of the current user's resumes
+    """
+    return await _get_owned_resume(resume_id, current_user, service)
+
+@router.put("/{resume_id}", response_model=ResumeResponse)
+async def update_resume(
+    resume_id: int,
+    update: ResumeUpdate,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Replace the content of one of the current user's resumes
+    """
+    resume = await _get_owned_resume(resume_id, current_user, service)
+    return await service.update(resume, update.content)
+
+@router.delete("/{resume_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_resume(
+    resume_id: int,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Delete one of the current user's resumes
+    """
+    resume = await _get_owned_resume(resume_id, current_user, service)
+    await service.delete(resume)
+
+@router.post("/{resume_id}/match", response_model=List[JobMatchScore])
+async def match_resume(
+    resume_id: int,
+    match: JobMatchRequest,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+    matcher=Depends(get_match_service),
+):
+    """
+    Score one resume against many job descriptions, best match first
+    """
+    if len(match.job_descriptions) > settings.MATCH_MAX_JOBS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Number of job descriptions exceeds limit of {settings.MATCH_MAX_JOBS}",
+        )
+    resume = await _get_owned_resume(resume_id, current_user, service)
+    scores = await matcher.match_jobs(resume, match.job_descriptions)
+    ranked = sorted(enumerate(scores), key=lambda item: item[1], reverse=True)
+    return [JobMatchScore(index=index, score=score) for index, score in ranked]
+
+@router.get("/{resume_id}/versions", response_model=List[ResumeVersionInfo])
+async def list_resume_versions(
+    resume_id: int,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    List the stored versions of a resume, newest first
+    """
+    await _get_owned_resume(resume_id, current_user, service)
+    return await service.versions.list(resume_id)
+
+@router.get("/{resume_id}/versions/{version}", response_model=ResumeVersionContent)
+async def get_resume_version(
+    resume_id: int,
+    version: int,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Reconstruct the content of a resume at a given version
+    """
+    await _get_owned_resume(resume_id, current_user, service)
+    content = await service.versions.reconstruct(resume_id, version)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    return ResumeVersionContent(version=version, content=content)
+
+@router.get("/{resume_id}/versions/{from_version}/diff/{to_version}", response_model=ResumeVersionDiff)
+async def diff_resume_versions(
+    resume_id: int,
+    from_version: int,
+    to_version: int,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Structural JSON diff (RFC 6902 style operations) between two versions
+    """
+    await _get_owned_resume(resume_id, current_user, service)
+    operations = await service.versions.diff(resume_id, from_version, to_version)
+    if operations is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    return ResumeVersionDiff(
+        from_version=from_version, to_version=to_version, operations=operations
+    )
+
+@router.post("/{resume_id}/versions/{version}/restore", response_model=ResumeResponse)
+async def restore_resume_version(
+    resume_id: int,
+    version: int,
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Make a past version the current content
+
+    The restore is recorded as a new version, so it can itself be undone.
+    """
+    resume = await _get_owned_resume(resume_id, current_user, service)
+    content = await service.versions.reconstruct(resume_id, version)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Version not found")
+    return await service.update(resume, content)
+
+@router.post("/{resume_id}/versions/compact")
+async def compact_resume_versions(
+    resume_id: int,
+    keep_last: int = Query(settings.RESUME_VERSION_KEEP_LAST, ge=1),
+    current_user: User = Security(get_current_user),
+    service: ResumeService = Depends(get_resume_service),
+):
+    """
+    Drop intermediate diffs older than the newest `keep_last` versions
+    """
+    await _get_owned_resume(resume_id, current_user, service)
+    removed = await service.versions.compact(resume_id, keep_last)
+    await service.db.commit()
+    return {"removed": removed}
@@ -1,32 +1,111 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, Security
+from typing import List, Optional
+import os
+from app.api.deps import get_ai_service, get_idempotency_store, get_pdf_executor, run_idempotent
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.core.idempotency import IdempotencyStore
+from app.models.user import User
 from app.schemas.resume_schemas import ResumeRequest, ResumeData
 from app.services.ai_service import AIService
-from app.services.pdf_service import PDFService
+from app.services.pdf_executor import PDFRenderExecutor, RenderQueueFull, render_resume
+from app.services.pdf_template_specs import TEMPLATES
 
 router = APIRouter()
-ai_service = AIService()
-pdf_service = PDFService()
+
+
+def _queue_full(e: RenderQueueFull) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+
+
+def _check_template(template: str) -> None:
+    if template not in TEMPLATES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"Unknown template '{template}', expected one of {sorted(TEMPLATES)}",
+        )
 
 
 @router.post("/generate-resume", response_model=ResumeData)
-async def generate_resume(request: ResumeRequest):
-    try:
-        content = await ai_service.generate_resume_content(request.description)
+async def generate_resume(
+    request: ResumeRequest,
+    response: Response,
+    current_user: User = Security(get_current_user),
+    ai_service: AIService = Depends(get_ai_service),
+    idempotency_store: IdempotencyStore = Depends(get_idempotency_store),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+):
+    """Retries that repeat an `Idempotency-Key` get the original response replayed"""
+
+    async def compute():
+        try:
+            content = await ai_service.generate_resume_content(request.description)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
         return ResumeData(
             name=request.name,
             email=request.email,
             phone=request.phone,
             address=request.address,
             content=content,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        ).model_dump(mode="json")
+
+    return await run_idempotent(
+        idempotency_store,
+        idempotency_key,
+        f"generate:{current_user.id}",
+        request.model_dump(),
+        response,
+        compute,
+    )
 
 
 @router.post("/generate-pdf")
-async def generate_pdf(data: ResumeData):
+async def generate_pdf(
+    data: ResumeData,
+    template: str = "classic",
+    current_user: User = Security(get_current_user),
+    executor: PDFRenderExecutor = Depends(get_pdf_executor),
+):
+    _check_template(template)
     try:
-        file_path = pdf_service.create_resume(data)
-        return {"message": "Resume PDF generated successfully", "file_path": file_path}
+        file_path = await executor.render(
+            render_resume, data.model_dump(), settings.PDF_OUTPUT_DIR, template
+        )
+        return {"message": "Resume PDF generated successfully", "file_name": os.path.basename(file_path)}
+    except RenderQueueFull as e:
+        raise _queue_full(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/generate-pdf/batch")
+async def generate_pdf_batch(
+    resumes: List[ResumeData],
+    template: str = "classic",
+    current_user: User = Security(get_current_user),
+    executor: PDFRenderExecutor = Depends(get_pdf_executor),
+):
+    """Render many resumes in parallel across the render pool"""
+    _check_template(template)
+    max_batch = min(settings.PDF_RENDER_MAX_BATCH, executor.queue_depth)
+    if len(resumes) > max_batch:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {max_batch} resumes per batch; split larger batches",
+        )
+    try:
+        results = await executor.render_many(
+            render_resume,
+            [(data.model_dump(), settings.PDF_OUTPUT_DIR, template) for data in resumes],
+        )
+    except RenderQueueFull as e:
+        raise _queue_full(e)
+    return {
+        "results": [
+            {"index": i, "status": "error", "detail": str(result)}
+            if isinstance(result, Exception)
+            else {"index": i, "status": "ok", "file_name": os.path.basename(result)}
+            for i, result in enumerate(results)
+        ]
+    }
@@ -1,16 +1,12 @@
 from fastapi import Depends, HTTPException, status, Security
 from fastapi.security import OAuth2AuthorizationCodeBearer
-from google.oauth2 import id_token
-from google.auth.transport import requests
-from app.core.config import settings
+from app.core.google_verifier import google_token_verifier
 from app.models.user import User
-from sqlalchemy.orm import Session
-from app.db.session import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.async_session import get_async_db, get_or_create
 import logging
 import json
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 oauth2_scheme = OAuth2AuthorizationCodeBearer(
@@ -20,7 +16,7 @@ oauth2_scheme = OAuth2AuthorizationCodeBearer(
 
 async def get_current_user(
     token: str = Security(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     try:
         # Log the received token (first 10 characters for security)
@@ -28,26 +24,14 @@ async def get_current_user(
         
         # For debugging purposes, let's try to decode the token first
         try:
-            # Verify Google token
-            idinfo = id_token.verify_oauth2_token(
-                token, 
-                requests.Request(), 
-                settings.GOOGLE_CLIENT_ID
-            )
+            # Verify Google token locally against the cached JWKS
+            idinfo = await google_token_verifier.verify(token)
             logger.info(f"Token verification successful. Email: {idinfo.get('email', 'No email found')}")
             
             # Get user from database or create if doesn't exist
-            user = db.query(User).filter(User.email == idinfo['email']).first()
-            if not user:
-                logger.info(f"Creating new user with email: {idinfo['email']}")
-                user = User(email=idinfo['email'])
-                db.add(user)
-                db.commit()
-                db.refresh(user)
-                logger.info("New user created successfully")
-            else:
-                logger.info(f"Existing user found with email: {idinfo['email']}")
-            
+            user = await get_or_create(db, User, email=idinfo['email'])
+            if not user.is_active:
+                raise ValueError("User is deactivated")
             return user
 
         except ValueError as ve:
@@ -72,11 +56,7 @@ async def get_current_user(
 # Optional: Add a test function to verify token manually
 async def verify_token_manually(token: str):
     try:
-        idinfo = id_token.verify_oauth2_token(
-            token, 
-            requests.Request(), 
-            settings.GOOGLE_CLIENT_ID
-        )
+        idinfo = await google_token_verifier.verify(token)
         return {"status": "success", "token_info": idinfo}
     except Exception as e:
         return {"status": "error", "message": str(e)} 
\ No newline at end of file
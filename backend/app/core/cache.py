@@ -0,0 +1,115 @@
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional
+from cachetools import TTLCache
+from app.core import json_codec
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def canonical_hash(*parts: Any) -> str:
+    """Stable SHA-256 of JSON-serializable parts, independent of dict key order"""
+    canonical = json_codec.dumps_bytes(parts, sort_keys=True, default=str)
+    return hashlib.sha256(canonical).hexdigest()
+
+
+class CachedResult(NamedTuple):
+    value: Any
+    hit: bool
+
+
+class RedisCacheTier:
+    """Persistent cache tier; entries survive API restarts and are shared by workers"""
+
+    def __init__(self, prefix: str, ttl: int, client=None):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.client.get(f"{self.prefix}:{key}")
+        return json_codec.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: Any) -> None:
+        await self.client.set(f"{self.prefix}:{key}", json_codec.dumps_bytes(value), ex=self.ttl)
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+class ResultCache:
+    """Two-tier result cache: a TTL+LRU in-process tier in front of an
+    optional persistent tier.
+
+    Persistent-tier errors are logged and treated as misses so a cache outage
+    never fails the request.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: int,
+        maxsize: int,
+        persistent: Optional[RedisCacheTier] = None,
+    ):
+        self.name = name
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.persistent = persistent
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self.memory.get(key)
+        if value is None and self.persistent is not None:
+            try:
+                value = await self.persistent.get(key)
+            except Exception as e:
+                logger.error(f"{self.name} cache read failed: {str(e)}")
+            if value is not None:
+                self.memory[key] = value
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self.memory[key] = value
+        if self.persistent is not None:
+            try:
+                await self.persistent.set(key, value)
+            except Exception as e:
+                logger.error(f"{self.name} cache write failed: {str(e)}")
+
+    async def get_or_compute(
+        self, key: str, compute: Callable[[], Awaitable[Any]], bypass: bool = False
+    ) -> CachedResult:
+        """Return the cached value, or compute and store it.
+
+        With ``bypass`` the lookup is skipped but the fresh value still
+        replaces whatever was cached.
+        """
+        if not bypass:
+            value = await self.get(key)
+            if value is not None:
+                return CachedResult(value, True)
+        value = await compute()
+        await self.set(key, value)
+        return CachedResult(value, False)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.memory),
+            "maxsize": int(self.memory.maxsize),
+        }
+
+    async def close(self) -> None:
+        if self.persistent is not None:
+            await self.persistent.close()
@@ -16,10 +16,41 @@ class Settings(BaseSettings):
     HOST: str = "0.0.0.0"
     PORT: int = 8000
     DEBUG: bool = False
+    LOG_LEVEL: str = "INFO"
+    JSON_CODEC: str = "auto"  # "auto" (orjson if installed), "orjson" or "stdlib"
+    GZIP_MINIMUM_SIZE: int = 1024  # Bytes; smaller responses are sent uncompressed
     
     # Rate Limiter Settings
-    RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_PER_MINUTE: int = 60  # Per client IP, per RATE_LIMIT_WINDOW
+    RATE_LIMIT_PER_USER: int = 60  # Per authenticated user, per RATE_LIMIT_WINDOW
     RATE_LIMIT_WINDOW: int = 60
+    RATE_LIMIT_BACKEND: str = "memory"  # "memory" (single worker) or "redis" (shared)
+    RATE_LIMIT_MAX_KEYS: int = 100000  # LRU bound for the in-memory backend
+
+    # Metrics Settings
+    METRICS_ENABLED: bool = True  # Serve Prometheus metrics at /metrics
+
+    # Query Profiler Settings
+    QUERY_PROFILER_ENABLED: bool = True
+    QUERY_PROFILER_SAMPLE_RATE: float = 0.05  # Fraction of requests whose queries are profiled
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD: int = 10  # Same fingerprint this often in one request
+    QUERY_PROFILER_MAX_FINGERPRINTS: int = 2000
+    ADMIN_EMAILS: List[str] = []  # Users allowed to read the /admin reports
+
+    # Redis Settings
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Background Job Settings
+    JOB_BACKEND: str = "memory"  # "memory" (in-process) or "redis" (shared with scripts/run_worker.py)
+    JOB_WORKERS: int = 4
+    JOB_RUN_WORKERS_IN_API: bool = True  # Disable on API-only nodes when using redis
+    JOB_TIMEOUT: float = 120.0  # Seconds per attempt
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_RETRY_BACKOFF: float = 2.0  # Base delay, doubled on every retry
+    JOB_RESULT_TTL: int = 86400  # Seconds job status and results are kept
+    JOB_HEARTBEAT_TTL: int = 30  # A redis consumer silent this long is presumed dead
+    JOB_REAP_INTERVAL: float = 15.0  # How often consumers look for dead peers' jobs
     
     # CORS Settings
     CORS_ORIGINS: List[str] = ["http://localhost:3000", "http://localhost:8000"]
@@ -32,6 +63,26 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = "Resume Builder API"
     TEMP_DIR: str = "temp"
     
+    # Resume Version History Settings
+    RESUME_SNAPSHOT_INTERVAL: int = 20  # Full snapshot every N versions, diffs in between
+    RESUME_VERSION_KEEP_LAST: int = 50  # Versions kept with full fidelity by compaction
+
+    # Resume Match Scoring Settings
+    MATCH_FEATURES: int = 2**18  # Hashed feature buckets
+    MATCH_IDF_SAMPLE_SIZE: int = 50000  # Most recent resumes used to fit IDF
+    MATCH_IDF_REFRESH_SECONDS: int = 3600
+    MATCH_MAX_RESUMES: int = 10000  # Resumes scored per bulk request
+    MATCH_MAX_JOBS: int = 100  # Job descriptions scored per request
+
+    # PDF Rendering Settings
+    PDF_RENDER_WORKERS: int = 0  # Process pool size; 0 means one per CPU core
+    PDF_RENDER_QUEUE_DEPTH: int = 64  # Renders queued or running before rejecting with 503
+    PDF_RENDER_MAX_BATCH: int = 32  # Resumes per /generate-pdf/batch; capped at the queue depth
+    PDF_RENDER_START_METHOD: str = "spawn"
+    PDF_OUTPUT_DIR: str = "output"
+    PDF_FONT_DIR: Optional[str] = None  # Directory with the TTF family to embed (subsetted)
+    PDF_FONT_FAMILY: str = "DejaVuSans"  # Expects <family>.ttf and <family>-Bold.ttf
+
     # Database Settings
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
@@ -44,12 +95,85 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str = "http://localhost:8000/api/v1/auth/callback"
+    GOOGLE_AUTH_URL: str = "https://accounts.google.com/o/oauth2/v2/auth"
+    GOOGLE_TOKEN_URL: str = "https://oauth2.googleapis.com/token"  # Point at a stub server in tests
+    GOOGLE_JWKS_URL: str = "https://www.googleapis.com/oauth2/v3/certs"
+    GOOGLE_JWKS_DEFAULT_MAX_AGE: int = 3600  # Used when Google sends no Cache-Control
+    GOOGLE_JWKS_MIN_REFRESH_SECONDS: int = 30  # Floor between forced key refetches
+    GOOGLE_TOKEN_CACHE_SIZE: int = 10000  # Verified-claims cache entries
+    GOOGLE_TOKEN_CLOCK_SKEW_SECONDS: int = 10
+
+    # Google HTTP Connection Pool Settings (OAuth token exchange, JWKS)
+    GOOGLE_HTTP2: bool = True
+    GOOGLE_MAX_CONNECTIONS: int = 50
+    GOOGLE_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    GOOGLE_KEEPALIVE_EXPIRY: float = 60.0  # Seconds an idle connection is kept open
+    GOOGLE_CONNECT_TIMEOUT: float = 3.0
+    GOOGLE_READ_TIMEOUT: float = 10.0
+    GOOGLE_POOL_TIMEOUT: float = 5.0  # Wait for a free connection from the pool
 
     # OpenAI Settings
     OPENAI_API_KEY: str
+    LLM_ENHANCE_MODEL: str = "gpt-4o-mini"
+    LLM_GENERATE_MODEL: str = "gpt-4"
+    # "single": one JSON completion; "sections": one smaller prompt per section, run concurrently
+    LLM_GENERATE_MODE: str = "single"
+    LLM_SECTION_RETRIES: int = 2  # Extra attempts for a section that fails or is invalid
+    LLM_SECTION_RETRY_BACKOFF: float = 0.5  # Seconds before the first section retry, doubled after each
+
+    # LLM Router Settings; models are "provider:model" (bare names use OpenAI)
+    LLM_ENHANCE_FALLBACK_MODELS: List[str] = []  # e.g. ["groq:llama-3.3-70b-versatile"]
+    LLM_GENERATE_FALLBACK_MODELS: List[str] = []
+    ANTHROPIC_API_KEY: Optional[str] = None
+    GROQ_API_KEY: Optional[str] = None
+    MISTRAL_API_KEY: Optional[str] = None
+    LLM_HEDGE_ENABLED: bool = True
+    LLM_HEDGE_QUANTILE: float = 0.95  # Hedge once the primary is slower than this quantile
+    LLM_HEDGE_MIN_DELAY: float = 1.0  # Never hedge earlier than this many seconds
+    LLM_ROUTER_WINDOW: int = 100  # Calls per provider kept for latency/error stats
+    LLM_ROUTER_MIN_SAMPLES: int = 10  # Below this, a provider ranks by config order
+    LLM_ROUTER_DEFAULT_LATENCY: float = 10.0  # Assumed latency (and hedge delay) while cold
+    LLM_BREAKER_FAILURES: int = 5  # Consecutive failures that open the breaker
+    LLM_BREAKER_COOLDOWN: float = 30.0  # Seconds before a half-open probe is allowed
+
+    # Prompt Construction Settings
+    LLM_PROMPT_TOKEN_BUDGET: int = 3000  # Tokens for the variable part of a prompt
+    LLM_PROMPT_FIELD_TOKEN_LIMIT: int = 600  # Any single text field is trimmed to this
+    LLM_TOKENIZER: str = "auto"  # "auto" (tiktoken if installed) or "heuristic"
+
+    # LLM HTTP Connection Pool Settings
+    LLM_MAX_CONNECTIONS: int = 100
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_KEEPALIVE_EXPIRY: float = 30.0  # Seconds an idle connection is kept open
+    LLM_CONNECT_TIMEOUT: float = 5.0
+    LLM_READ_TIMEOUT: float = 60.0
+    LLM_POOL_TIMEOUT: float = 10.0  # Wait for a free connection from the pool
+    LLM_MAX_RETRIES: int = 2
+
+    # Idempotency-Key Settings (/resumes/enhance, /generate-resume)
+    IDEMPOTENCY_BACKEND: str = "memory"  # "memory" (single worker) or "redis" (shared)
+    IDEMPOTENCY_TTL: int = 86400  # Seconds a completed response is replayed
+    IDEMPOTENCY_LOCK_TTL: int = 120  # In-progress claim expiry after a worker dies (extended while it lives)
+    IDEMPOTENCY_WAIT_TIMEOUT: float = 60.0  # How long a retry waits for the original
+    IDEMPOTENCY_MAX_KEYS: int = 10000  # LRU bound for the in-memory backend
+
+    # Enhancement Result Cache Settings
+    ENHANCE_CACHE_ENABLED: bool = True
+    ENHANCE_CACHE_TTL: int = 86400  # Seconds
+    ENHANCE_CACHE_MAX_ENTRIES: int = 1024  # In-process LRU bound
+    ENHANCE_CACHE_PERSISTENT: bool = False  # Also keep results in Redis across restarts
+
+    # Batch Enhancement Settings
+    ENHANCE_BATCH_MAX_ITEMS: int = 100
+    ENHANCE_BATCH_CONCURRENCY: int = 10  # Model calls in flight per batch request
 
     # Security Settings
     SECRET_KEY: str
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    # Authorize access tokens from their claims alone, without a per-request user query
+    STATELESS_SESSIONS: bool = False
+    REVOCATION_REFRESH_SECONDS: int = 30
     
     # Pool Settings
     POOL_SIZE: int = 20
@@ -66,6 +190,26 @@ class Settings(BaseSettings):
         encoded_password = quote_plus(self.POSTGRES_PASSWORD)
         return f"postgresql://{self.POSTGRES_USER}:{encoded_password}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def json_serializer(self):
+        """JSON/JSONB column serializer for the database engines"""
+        from app.core.json_codec import dumps
+
+        return dumps
+
+    @property
+    def json_deserializer(self):
+        from app.core.json_codec import loads
+
+        return loads
+
+    @property
+    def get_async_database_url(self) -> str:
+        """Database URL using the asyncpg driver"""
+        url = self.get_database_url
+        scheme, rest = url.split("://", 1)
+        return f"postgresql+asyncpg://{rest}" if scheme.startswith("postgresql") else url
+
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -0,0 +1,211 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import re
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+from cachetools import TLRUCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE_RE = re.compile(r"max-age=(\d+)")
+
+
+def _b64url_to_int(value: str) -> int:
+    padded = value + "=" * (-len(value) % 4)
+    return int.from_bytes(base64.urlsafe_b64decode(padded), "big")
+
+
+def _unverified_header(token: str) -> Dict[str, Any]:
+    """Decode the JOSE header of a JWT without checking the signature"""
+    try:
+        header_segment = token.split(".", 1)[0]
+        padded = header_segment + "=" * (-len(header_segment) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded))
+    except Exception:
+        raise ValueError("Malformed token header")
+
+
+def jwks_to_pem(jwks: Dict[str, Any]) -> Dict[str, bytes]:
+    """Convert a JWKS document into a ``{kid: PEM public key}`` mapping"""
+    import rsa
+
+    keys = {}
+    for jwk in jwks.get("keys", []):
+        if jwk.get("kty") != "RSA" or "kid" not in jwk:
+            continue
+        public_key = rsa.PublicKey(_b64url_to_int(jwk["n"]), _b64url_to_int(jwk["e"]))
+        keys[jwk["kid"]] = public_key.save_pkcs1(format="PEM")
+    return keys
+
+
+def create_google_http_client() -> httpx.AsyncClient:
+    """Keep-alive, HTTP/2-capable pool for Google's OAuth and key endpoints"""
+    return httpx.AsyncClient(
+        http2=settings.GOOGLE_HTTP2,
+        limits=httpx.Limits(
+            max_connections=settings.GOOGLE_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.GOOGLE_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.GOOGLE_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.GOOGLE_READ_TIMEOUT,
+            connect=settings.GOOGLE_CONNECT_TIMEOUT,
+            pool=settings.GOOGLE_POOL_TIMEOUT,
+        ),
+    )
+
+
+def parse_max_age(cache_control: Optional[str]) -> Optional[int]:
+    """Extract max-age (seconds) from a Cache-Control header"""
+    if not cache_control:
+        return None
+    match = _MAX_AGE_RE.search(cache_control)
+    return int(match.group(1)) if match else None
+
+
+class GoogleTokenVerifier:
+    """Verifies Google ID tokens locally against a cached copy of Google's JWKS.
+
+    Signing keys are refreshed in the background according to the
+    Cache-Control max-age of the JWKS response, and verified claims are
+    memoized per token hash until the token's ``exp``.
+    """
+
+    def __init__(
+        self,
+        audience: str,
+        jwks_url: str = settings.GOOGLE_JWKS_URL,
+        http_client: Optional[httpx.AsyncClient] = None,
+        cache_size: int = settings.GOOGLE_TOKEN_CACHE_SIZE,
+        min_refresh_interval: int = settings.GOOGLE_JWKS_MIN_REFRESH_SECONDS,
+        default_max_age: int = settings.GOOGLE_JWKS_DEFAULT_MAX_AGE,
+        clock_skew: int = settings.GOOGLE_TOKEN_CLOCK_SKEW_SECONDS,
+    ):
+        self.audience = audience
+        self.jwks_url = jwks_url
+        self.min_refresh_interval = min_refresh_interval
+        self.default_max_age = default_max_age
+        self.clock_skew = clock_skew
+
+        self._http_client = http_client
+        self._owns_client = http_client is None
+        self._keys: Dict[str, bytes] = {}
+        self._expires_at = 0.0
+        self._last_fetch = 0.0
+        self._lock = asyncio.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._claims = TLRUCache(
+            maxsize=cache_size,
+            ttu=lambda _key, claims, _now: claims["exp"],
+            timer=time.time,
+        )
+
+    @property
+    def http_client(self) -> httpx.AsyncClient:
+        if self._http_client is None:
+            self._http_client = create_google_http_client()
+        return self._http_client
+
+    def use_http_client(self, http_client: httpx.AsyncClient) -> None:
+        """Fetch keys over a pool owned (and closed) by the caller"""
+        self._http_client = http_client
+        self._owns_client = False
+
+    async def start(self) -> None:
+        """Prime the key cache and start the background refresh task"""
+        try:
+            await self.refresh_keys()
+        except Exception as e:
+            # Verification falls back to an on-demand fetch
+            logger.error(f"Initial JWKS fetch failed: {str(e)}")
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+            self._refresh_task = None
+        if self._owns_client and self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def refresh_keys(self, force: bool = False) -> None:
+        """Fetch the JWKS if the cached copy expired (or ``force`` is set)"""
+        async with self._lock:
+            now = time.time()
+            if not force and self._keys and now < self._expires_at:
+                return
+            if force and now - self._last_fetch < self.min_refresh_interval:
+                return
+
+            response = await self.http_client.get(self.jwks_url)
+            response.raise_for_status()
+            keys = jwks_to_pem(response.json())
+            if not keys:
+                raise ValueError("JWKS response contained no usable RSA keys")
+
+            max_age = parse_max_age(response.headers.get("cache-control"))
+            self._keys = keys
+            self._last_fetch = now
+            self._expires_at = now + (max_age if max_age is not None else self.default_max_age)
+            logger.info(f"Loaded {len(keys)} Google signing keys, valid for {int(self._expires_at - now)}s")
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            # Refresh shortly before the cached keys go stale
+            delay = max(self._expires_at - time.time() - 60, self.min_refresh_interval)
+            await asyncio.sleep(delay)
+            try:
+                await self.refresh_keys(force=True)
+            except Exception as e:
+                logger.error(f"Background JWKS refresh failed: {str(e)}")
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Verify a Google ID token and return its claims.
+
+        Raises ``ValueError`` if the token is malformed, expired, has the wrong
+        audience/issuer or is not signed by one of Google's current keys.
+        """
+        cache_key = hashlib.sha256(token.encode()).hexdigest()
+        claims = self._claims.get(cache_key)
+        if claims is not None:
+            return claims
+
+        kid = _unverified_header(token).get("kid")
+        await self.refresh_keys()
+        if kid not in self._keys:
+            # Google rotated its keys before our cached copy expired
+            await self.refresh_keys(force=True)
+        if kid not in self._keys:
+            raise ValueError(f"Token signed with unknown key id: {kid}")
+
+        # Deferred: google.auth is slow to import and only needed on a cache miss
+        from google.auth import jwt as google_jwt
+
+        claims = google_jwt.decode(
+            token,
+            certs={kid: self._keys[kid]},
+            audience=self.audience,
+            clock_skew_in_seconds=self.clock_skew,
+        )
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+
+        self._claims[cache_key] = claims
+        return claims
+
+
+google_token_verifier = GoogleTokenVerifier(audience=settings.GOOGLE_CLIENT_ID)
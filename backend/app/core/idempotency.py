@@ -0,0 +1,268 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional
+from cachetools import TTLCache
+from app.core import json_codec
+from app.core.cache import CachedResult
+from app.core.config import settings
+from app.core.metrics import IDEMPOTENCY_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+# Poll interval while another request with the same key is still running
+WAIT_POLL_SECONDS = 0.1
+
+
+class IdempotencyConflict(Exception):
+    """The key was already used for a request with a different payload"""
+
+
+class IdempotencyInProgress(Exception):
+    """The original request is still running after the wait timeout"""
+
+
+class InMemoryIdempotencyBackend:
+    """Per-process records; a retry only replays if it reaches the same worker"""
+
+    def __init__(self, max_keys: int = settings.IDEMPOTENCY_MAX_KEYS):
+        self.records = TTLCache(maxsize=max_keys, ttl=settings.IDEMPOTENCY_TTL)
+        self.pending: Dict[str, Dict[str, Any]] = {}
+
+    async def reserve(self, key: str, record: Dict[str, Any], ttl: int) -> Optional[Dict[str, Any]]:
+        """Claim ``key`` for ``record``; returns the existing record if already claimed"""
+        existing = await self.get(key)
+        if existing is not None:
+            return existing
+        self.pending[key] = {**record, "expires_at": time.monotonic() + ttl}
+        return None
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        record = self.records.get(key)
+        if record is None:
+            record = self.pending.get(key)
+            if record is not None and record["expires_at"] < time.monotonic():
+                del self.pending[key]
+                record = None
+        return record
+
+    def _owns(self, key: str, claim: Dict[str, Any]) -> bool:
+        record = self.pending.get(key)
+        return (
+            record is not None
+            and record["token"] == claim["token"]
+            and record["expires_at"] >= time.monotonic()
+        )
+
+    async def extend(self, key: str, claim: Dict[str, Any], ttl: int) -> None:
+        """Push back the expiry of ``claim`` if it still holds ``key``"""
+        if self._owns(key, claim):
+            self.pending[key]["expires_at"] = time.monotonic() + ttl
+
+    async def complete(self, key: str, claim: Dict[str, Any], record: Dict[str, Any], ttl: int) -> bool:
+        """Store ``record`` if ``claim`` still holds ``key``; returns whether it did"""
+        if not self._owns(key, claim):
+            return False
+        del self.pending[key]
+        self.records[key] = record
+        return True
+
+    async def release(self, key: str, claim: Dict[str, Any]) -> None:
+        if self._owns(key, claim):
+            del self.pending[key]
+
+    async def close(self) -> None:
+        return None
+
+
+# KEYS[1] = record key, ARGV[1] = the pending claim as written by reserve
+# Compare-and-delete / compare-and-expire / compare-and-set: a worker whose
+# claim lapsed must not touch the claim of the worker that took over
+RELEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# ARGV[2] = ttl
+EXTEND_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# ARGV[2] = completed record, ARGV[3] = ttl
+COMPLETE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+
+class RedisIdempotencyBackend:
+    """Records shared by every worker through Redis.
+
+    The claim is a ``SET NX`` of a pending marker that expires after
+    ``IDEMPOTENCY_LOCK_TTL``, so a worker that dies mid-request does not
+    block retries forever. A live worker keeps extending it. The marker
+    carries a per-claim token, and extend/complete/release only act while
+    the stored marker is still this worker's.
+    """
+
+    def __init__(self, client=None, prefix: str = "idempotency"):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+        self._release = client.register_script(RELEASE_LUA)
+        self._extend = client.register_script(EXTEND_LUA)
+        self._complete = client.register_script(COMPLETE_LUA)
+
+    async def reserve(self, key: str, record: Dict[str, Any], ttl: int) -> Optional[Dict[str, Any]]:
+        claimed = await self.client.set(
+            f"{self.prefix}:{key}", json_codec.dumps_bytes(record), nx=True, ex=ttl
+        )
+        if claimed:
+            return None
+        existing = await self.get(key)
+        if existing is None:
+            # Expired between SET and GET; try once more
+            return await self.reserve(key, record, ttl)
+        return existing
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raw = await self.client.get(f"{self.prefix}:{key}")
+        return json_codec.loads(raw) if raw is not None else None
+
+    async def extend(self, key: str, claim: Dict[str, Any], ttl: int) -> None:
+        await self._extend(keys=[f"{self.prefix}:{key}"], args=[json_codec.dumps_bytes(claim), ttl])
+
+    async def complete(self, key: str, claim: Dict[str, Any], record: Dict[str, Any], ttl: int) -> bool:
+        stored = await self._complete(
+            keys=[f"{self.prefix}:{key}"],
+            args=[json_codec.dumps_bytes(claim), json_codec.dumps_bytes(record), ttl],
+        )
+        return bool(stored)
+
+    async def release(self, key: str, claim: Dict[str, Any]) -> None:
+        await self._release(keys=[f"{self.prefix}:{key}"], args=[json_codec.dumps_bytes(claim)])
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_idempotency_backend():
+    if settings.IDEMPOTENCY_BACKEND == "redis":
+        return RedisIdempotencyBackend()
+    return InMemoryIdempotencyBackend()
+
+
+class IdempotencyStore:
+    """Replays the stored response for a repeated ``Idempotency-Key``.
+
+    The first request with a key runs and its JSON result is kept for
+    ``ttl`` seconds. A retry that arrives while the first is still running
+    waits for it (up to ``wait_timeout``) rather than executing again.
+    Reusing a key with a different payload is rejected. Failures are not
+    stored: the key is released so the client can retry.
+
+    The pending claim only lives ``lock_ttl`` seconds, which is shorter than
+    a slow generation with retries and fallbacks, so it is re-extended every
+    third of that while ``compute`` runs. It lapses ``lock_ttl`` after the
+    worker dies.
+    """
+
+    def __init__(
+        self,
+        backend=None,
+        ttl: int = settings.IDEMPOTENCY_TTL,
+        lock_ttl: int = settings.IDEMPOTENCY_LOCK_TTL,
+        wait_timeout: float = settings.IDEMPOTENCY_WAIT_TIMEOUT,
+    ):
+        self.backend = backend or create_idempotency_backend()
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.wait_timeout = wait_timeout
+
+    async def _wait(self, key: str) -> Optional[Dict[str, Any]]:
+        deadline = time.monotonic() + self.wait_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+            record = await self.backend.get(key)
+            if record is None:
+                # The original failed and released the key
+                return None
+            if record["state"] == DONE:
+                return record
+        IDEMPOTENCY_REQUESTS.labels("in_progress").inc()
+        raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+
+    async def _keep_claimed(self, key: str, claim: Dict[str, Any]) -> None:
+        while True:
+            await asyncio.sleep(self.lock_ttl / 3)
+            try:
+                await self.backend.extend(key, claim, self.lock_ttl)
+            except Exception as e:
+                logger.warning(f"Failed to extend idempotency claim: {str(e)}")
+
+    async def run(
+        self, key: str, fingerprint: str, compute: Callable[[], Awaitable[Any]]
+    ) -> CachedResult:
+        """Return ``(value, replayed)`` for ``key``, computing at most once per TTL"""
+        claim = {"state": PENDING, "fingerprint": fingerprint, "token": uuid.uuid4().hex}
+        while True:
+            existing = await self.backend.reserve(key, claim, self.lock_ttl)
+            if existing is None:
+                break
+            if existing["fingerprint"] != fingerprint:
+                IDEMPOTENCY_REQUESTS.labels("conflict").inc()
+                raise IdempotencyConflict(
+                    "Idempotency-Key was already used with a different request body"
+                )
+            if existing["state"] == PENDING:
+                existing = await self._wait(key)
+                if existing is None:
+                    continue
+            IDEMPOTENCY_REQUESTS.labels("replayed").inc()
+            return CachedResult(existing["value"], True)
+
+        keeper = asyncio.create_task(self._keep_claimed(key, claim))
+        try:
+            value = await compute()
+        except BaseException:
+            await self._release_quietly(key, claim)
+            raise
+        finally:
+            keeper.cancel()
+        try:
+            stored = await self.backend.complete(
+                key, claim, {"state": DONE, "fingerprint": fingerprint, "value": value}, self.ttl
+            )
+        except Exception as e:
+            logger.error(f"Failed to store idempotent response: {str(e)}")
+            # Let waiting retries run instead of polling a marker nobody will finish
+            await self._release_quietly(key, claim)
+            return CachedResult(value, False)
+        if stored:
+            IDEMPOTENCY_REQUESTS.labels("stored").inc()
+        else:
+            logger.warning("Idempotency claim lapsed before the response was stored")
+        return CachedResult(value, False)
+
+    async def _release_quietly(self, key: str, claim: Dict[str, Any]) -> None:
+        try:
+            await self.backend.release(key, claim)
+        except Exception as e:
+            logger.error(f"Failed to release idempotency claim: {str(e)}")
+
+    async def close(self) -> None:
+        await self.backend.close()
@@ -0,0 +1,63 @@
+import json
+import logging
+from typing import Any, Callable, Optional, Union
+from fastapi.responses import JSONResponse
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# One JSON codec for API responses, JSONB columns and cache entries.
+# JSON_CODEC="auto" uses orjson when installed and the stdlib otherwise;
+# both produce compact UTF-8 output with the same key order semantics.
+USE_ORJSON = orjson is not None and settings.JSON_CODEC in ("auto", "orjson")
+if settings.JSON_CODEC == "orjson" and orjson is None:
+    logger.warning("JSON_CODEC=orjson but orjson is not installed, using the stdlib codec")
+
+
+def _default(obj: Any) -> Any:
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_bytes(
+    obj: Any, sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None
+) -> bytes:
+    if USE_ORJSON:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=default or _default, option=option)
+    return dumps(obj, sort_keys=sort_keys, default=default).encode("utf-8")
+
+
+def dumps(obj: Any, sort_keys: bool = False, default: Optional[Callable[[Any], Any]] = None) -> str:
+    if USE_ORJSON:
+        return dumps_bytes(obj, sort_keys=sort_keys, default=default).decode("utf-8")
+    return json.dumps(
+        obj,
+        sort_keys=sort_keys,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=default or _default,
+    )
+
+
+def loads(data: Union[str, bytes, bytearray]) -> Any:
+    if USE_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class CodecJSONResponse(JSONResponse):
+    """Default response class: renders with the configured codec"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_bytes(content)
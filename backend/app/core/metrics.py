@@ -0,0 +1,200 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+from fastapi import Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Prometheus metrics for the hot paths.
+#
+# With several uvicorn/gunicorn workers, set PROMETHEUS_MULTIPROC_DIR to an
+# empty directory shared by the workers (wipe it on every deploy). Each process
+# then writes its samples to mmap'd files and /metrics aggregates all of them,
+# whichever worker serves the scrape. Gunicorn should call
+# ``mark_worker_dead(worker.pid)`` from its ``child_exit`` hook.
+
+MULTIPROCESS = bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5)
+LLM_BUCKETS = (0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests by route template and status", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to response start, by route template",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being handled", multiprocess_mode="livesum"
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Cursor execution time by statement type", ["statement"],
+    buckets=QUERY_BUCKETS,
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a pooled connection", ["pool"],
+    buckets=QUERY_BUCKETS,
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total", "Checkouts that gave up after POOL_TIMEOUT", ["pool"]
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out", "Connections currently checked out", ["pool"], multiprocess_mode="livesum"
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow", "Connections open beyond POOL_SIZE", ["pool"], multiprocess_mode="livesum"
+)
+
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds", "Model call latency", ["model", "operation", "outcome"],
+    buckets=LLM_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total", "Tokens reported by the provider", ["model", "operation", "kind"]
+)
+LLM_PROMPT_TOKENS = Histogram(
+    "llm_prompt_tokens", "Locally counted prompt tokens per call", ["model", "operation"],
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384),
+)
+LLM_PROMPT_TRIMMED = Counter(
+    "llm_prompt_trimmed_total", "Prompts trimmed to fit the token budget", ["model", "operation"]
+)
+LLM_ROUTER_CALLS = Counter(
+    "llm_router_calls_total", "Routed model calls by provider", ["provider", "outcome"]
+)
+LLM_BREAKER_OPEN = Gauge(
+    "llm_breaker_open", "1 while the provider's circuit breaker is open", ["provider"],
+    multiprocess_mode="max",
+)
+COALESCED_CALLS = Counter(
+    "singleflight_coalesced_total", "Calls that joined an identical in-flight call", ["name"]
+)
+IDEMPOTENCY_REQUESTS = Counter(
+    "idempotency_requests_total", "Requests carrying an Idempotency-Key", ["outcome"]
+)
+
+PDF_RENDER_LATENCY = Histogram(
+    "pdf_render_duration_seconds", "Render time including pool queueing", ["outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+PDF_RENDER_PENDING = Gauge(
+    "pdf_render_pending", "Renders queued or running", multiprocess_mode="livesum"
+)
+
+
+class MetricsMiddleware:
+    """Per-route latency and status counts, labelled with the route template
+    (``/resumes/{resume_id}``) so label cardinality stays bounded"""
+
+    async def __call__(self, request: Request, call_next):
+        start = time.perf_counter()
+        status = 500
+        HTTP_IN_PROGRESS.inc()
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            HTTP_IN_PROGRESS.dec()
+            route = request.scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            HTTP_LATENCY.labels(request.method, path).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(request.method, path, str(status)).inc()
+
+
+def observe_query(statement: str, duration: float) -> None:
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "OTHER"
+    DB_QUERY_LATENCY.labels(keyword).observe(duration)
+
+
+class _InstrumentedPoolMixin:
+    """Times checkouts and tracks pool usage; use via the concrete pools below"""
+
+    metrics_label = "sync"
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            DB_POOL_TIMEOUTS.labels(self.metrics_label).inc()
+            raise
+        finally:
+            DB_POOL_WAIT.labels(self.metrics_label).observe(time.perf_counter() - start)
+        self._record_usage()
+        return connection
+
+    def _do_return_conn(self, record):
+        super()._do_return_conn(record)
+        self._record_usage()
+
+    def _record_usage(self) -> None:
+        DB_POOL_CHECKED_OUT.labels(self.metrics_label).set(self.checkedout())
+        DB_POOL_OVERFLOW.labels(self.metrics_label).set(max(self.overflow(), 0))
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+class LLMCall:
+    """Labels of a tracked model call; set ``model`` once the answering model is known"""
+
+    def __init__(self, model: str):
+        self.model = model
+
+
+@contextmanager
+def track_llm_call(model: str, operation: str) -> Iterator[LLMCall]:
+    start = time.perf_counter()
+    outcome = "error"
+    call = LLMCall(model)
+    try:
+        yield call
+        outcome = "ok"
+    finally:
+        LLM_LATENCY.labels(call.model, operation, outcome).observe(time.perf_counter() - start)
+
+
+def record_llm_usage(model: str, operation: str, usage: Optional[object]) -> None:
+    if usage is None:
+        return
+    for kind in ("request_tokens", "response_tokens"):
+        count = getattr(usage, kind, None)
+        if count:
+            LLM_TOKENS.labels(model, operation, kind.split("_")[0]).inc(count)
+
+
+def metrics_response(request: Request) -> Response:
+    """Prometheus exposition; in multiprocess mode merges every worker's samples"""
+    registry = REGISTRY
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_worker_dead(pid: int) -> None:
+    """Drop a dead worker's live gauges (gunicorn ``child_exit`` hook)"""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,187 @@
+import logging
+import random
+import re
+import threading
+from collections import Counter, deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Deque, Dict, List, Optional
+from fastapi import Request
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_COMMENT_RE = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PARAM_RE = re.compile(r"%\([^)]+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_NUMBER_RE = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.I)
+_VALUES_RE = re.compile(r"\bVALUES\s*(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\1)*", re.I)
+_SPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """Normalize a statement so queries differing only in literals, bind
+    parameters or IN-list length share one fingerprint.
+
+    SQLAlchemy reuses compiled statement strings, so the cache hit rate is
+    high and normalization runs once per distinct statement.
+    """
+    text = _COMMENT_RE.sub(" ", statement)
+    text = _STRING_RE.sub("?", text)
+    text = _PARAM_RE.sub("?", text)
+    text = _NUMBER_RE.sub("?", text)
+    text = _IN_LIST_RE.sub("IN (...)", text)
+    text = _VALUES_RE.sub("VALUES (...)", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+@dataclass
+class FingerprintStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+    # Uniform reservoir of durations for the percentile estimates
+    samples: List[float] = field(default_factory=list)
+
+    def add(self, duration: float, reservoir_size: int) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        if len(self.samples) < reservoir_size:
+            self.samples.append(duration)
+        else:
+            slot = random.randrange(self.count)
+            if slot < reservoir_size:
+                self.samples[slot] = duration
+
+    def percentile(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class RequestProfile:
+    queries: Counter = field(default_factory=Counter)
+
+
+_current_request: ContextVar[Optional[RequestProfile]] = ContextVar("query_profile", default=None)
+# Marks requests that were not sampled, so their queries skip the random draw
+_UNSAMPLED = RequestProfile()
+
+
+class QueryProfiler:
+    """Sampled per-fingerprint query statistics and N+1 detection.
+
+    Sampling is decided once per request (or per query outside a request);
+    unsampled work pays only a context-variable lookup in the cursor hooks.
+    Statistics are per process.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = settings.QUERY_PROFILER_ENABLED,
+        sample_rate: float = settings.QUERY_PROFILER_SAMPLE_RATE,
+        n_plus_one_threshold: int = settings.QUERY_PROFILER_N_PLUS_ONE_THRESHOLD,
+        max_fingerprints: int = settings.QUERY_PROFILER_MAX_FINGERPRINTS,
+        reservoir_size: int = 512,
+    ):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.max_fingerprints = max_fingerprints
+        self.reservoir_size = reservoir_size
+        self._stats: Dict[str, FingerprintStats] = {}
+        self._n_plus_one: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self._dropped = 0
+        # Sync engines record from threadpool threads
+        self._lock = threading.Lock()
+
+    def should_record(self) -> bool:
+        if not self.enabled:
+            return False
+        profile = _current_request.get()
+        if profile is not None:
+            return profile is not _UNSAMPLED
+        return random.random() < self.sample_rate
+
+    def record(self, statement: str, duration: float) -> None:
+        key = fingerprint(statement)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    self._dropped += 1
+                    return
+                stats = self._stats[key] = FingerprintStats()
+            stats.add(duration, self.reservoir_size)
+        profile = _current_request.get()
+        if profile is not None:
+            profile.queries[key] += 1
+
+    def begin_request(self) -> Any:
+        sampled = self.enabled and random.random() < self.sample_rate
+        return _current_request.set(RequestProfile() if sampled else _UNSAMPLED)
+
+    def end_request(self, token: Any, route: str) -> None:
+        profile = _current_request.get()
+        _current_request.reset(token)
+        if profile is None or profile is _UNSAMPLED:
+            return
+        for key, count in profile.queries.items():
+            if count >= self.n_plus_one_threshold:
+                logger.warning(f"Possible N+1: {count}x in {route}: {key}")
+                self._n_plus_one.append({"route": route, "fingerprint": key, "count": count})
+
+    def report(self, limit: int = 50, order_by: str = "total") -> Dict[str, Any]:
+        with self._lock:
+            rows = [
+                {
+                    "fingerprint": key,
+                    "count": stats.count,
+                    "total": stats.total,
+                    "mean": stats.total / stats.count,
+                    "p50": stats.percentile(0.50),
+                    "p99": stats.percentile(0.99),
+                    "max": stats.max,
+                }
+                for key, stats in self._stats.items()
+            ]
+            n_plus_one = list(self._n_plus_one)
+            dropped = self._dropped
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return {
+            "sample_rate": self.sample_rate,
+            "fingerprints": len(rows),
+            "dropped_untracked": dropped,
+            "queries": rows[:limit],
+            "n_plus_one": n_plus_one,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._n_plus_one.clear()
+            self._dropped = 0
+
+
+query_profiler = QueryProfiler()
+
+
+class QueryProfilerMiddleware:
+    """Opens a per-request profile so repeated fingerprints can be attributed"""
+
+    def __init__(self, profiler: QueryProfiler = query_profiler):
+        self.profiler = profiler
+
+    async def __call__(self, request: Request, call_next):
+        token = self.profiler.begin_request()
+        try:
+            return await call_next(request)
+        finally:
+            route = getattr(request.scope.get("route"), "path", request.url.path)
+            self.profiler.end_request(token, f"{request.method} {route}")
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+from typing import Dict, FrozenSet, Optional
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.models.user_models import User
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """In-memory set of deactivated users and revoked token ids.
+
+    Used by stateless sessions instead of loading the user on every request.
+    Deactivated users are reloaded from the database every
+    ``refresh_interval`` seconds; revocations made through this process take
+    effect immediately.
+    """
+
+    def __init__(self, refresh_interval: int = settings.REVOCATION_REFRESH_SECONDS):
+        self.refresh_interval = refresh_interval
+        self._revoked_users: FrozenSet[int] = frozenset()
+        self._local_revoked_users: set = set()
+        self._revoked_tokens: Dict[str, float] = {}  # jti -> token expiry
+        self._task: Optional[asyncio.Task] = None
+
+    def is_revoked(self, payload: dict) -> bool:
+        user_id = payload.get("uid")
+        if user_id in self._revoked_users or user_id in self._local_revoked_users:
+            return True
+        jti = payload.get("jti")
+        return jti is not None and jti in self._revoked_tokens
+
+    def revoke_user(self, user_id: int) -> None:
+        self._local_revoked_users.add(user_id)
+
+    def revoke_token(self, jti: str, expires_at: float) -> None:
+        self._revoked_tokens[jti] = expires_at
+
+    def revoke_payload(self, payload: dict) -> None:
+        """Revoke a decoded token until it would have expired anyway"""
+        if payload.get("jti") is not None:
+            self.revoke_token(payload["jti"], payload["exp"])
+
+    async def refresh(self) -> None:
+        """Reload deactivated user ids and drop expired token revocations"""
+        async with AsyncSessionLocal() as db:
+            result = await db.scalars(select(User.id).where(User.is_active.is_(False)))
+            self._revoked_users = frozenset(result.all())
+
+        # Once the database reflects a local revocation it no longer needs tracking here
+        self._local_revoked_users -= self._revoked_users
+        now = time.time()
+        self._revoked_tokens = {
+            jti: exp for jti, exp in self._revoked_tokens.items() if exp > now
+        }
+
+    async def start(self) -> None:
+        try:
+            await self.refresh()
+        except Exception as e:
+            logger.error(f"Initial revocation list load failed: {str(e)}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Revocation list refresh failed: {str(e)}")
+
+
+revocation_list = RevocationList()
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
+import uuid
 from jose import JWTError, jwt
 from app.core.config import settings
 
@@ -12,18 +13,22 @@ def create_token_pair(data: dict) -> Tuple[str, str]:
 
 
 def create_access_token(data: dict) -> str:
-    """Create access token"""
+    """Create access token.
+
+    ``data`` should carry ``sub`` (email) and ``uid`` (user id) so the token
+    can be authorized without a user lookup when stateless sessions are on.
+    """
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
 
 
 def create_refresh_token(data: dict) -> str:
-    """Create refresh token"""
+    """Create refresh token; the ``jti`` lets it be revoked individually"""
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm="HS256")
 
 
@@ -0,0 +1,41 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict
+from app.core.metrics import COALESCED_CALLS
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key starts ``compute``; callers arriving while it
+    is still running await the same task instead of starting their own. A
+    caller that is cancelled (e.g. the client disconnected) does not cancel
+    the shared call for the others. Nothing is remembered once the call
+    finishes; pair with a cache for that.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[str, asyncio.Task] = {}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled() and task.exception() is not None:
+            # Retrieved here so an error nobody is left awaiting isn't reported as unhandled
+            logger.debug(f"{self.name} call failed: {task.exception()}")
+
+    async def do(self, key: str, compute: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(compute())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            COALESCED_CALLS.labels(self.name).inc()
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._calls)
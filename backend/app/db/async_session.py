@@ -0,0 +1,98 @@
+from typing import Any, AsyncGenerator, Dict, Optional, Type, TypeVar
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from app.core.config import settings
+from app.core.metrics import InstrumentedAsyncQueuePool
+from app.db import instrumentation  # noqa: F401  (query metrics and profiler hooks)
+import logging
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT")
+
+# Single process-wide pool shared by every async request handler. Created by
+# init_async_engine() in the app lifespan (or on first use in scripts), so
+# importing the app does not load the driver or build the pool.
+async_engine: Optional[AsyncEngine] = None
+
+AsyncSessionLocal = async_sessionmaker(
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+def init_async_engine() -> AsyncEngine:
+    global async_engine
+    if async_engine is None:
+        async_engine = create_async_engine(
+            settings.get_async_database_url,
+            poolclass=InstrumentedAsyncQueuePool,  # Exports checkout wait and usage metrics
+            pool_pre_ping=True,
+            pool_size=settings.POOL_SIZE,
+            max_overflow=settings.MAX_OVERFLOW,
+            pool_recycle=settings.POOL_RECYCLE,
+            pool_timeout=settings.POOL_TIMEOUT,
+            echo=settings.DEBUG,
+            json_serializer=settings.json_serializer,
+            json_deserializer=settings.json_deserializer,
+            connect_args={
+                "timeout": 60,
+                "server_settings": {
+                    "application_name": "resume_builder",
+                    "statement_timeout": "60000",
+                    "idle_in_transaction_session_timeout": "60000",
+                },
+            },
+        )
+        AsyncSessionLocal.configure(bind=async_engine)
+    return async_engine
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Async database dependency; a connection is only checked out on first query"""
+    init_async_engine()
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            logger.error(f"Database error: {str(e)}")
+            await db.rollback()
+            raise
+
+
+async def get_or_create(
+    db: AsyncSession,
+    model: Type[ModelT],
+    defaults: Optional[Dict[str, Any]] = None,
+    **lookup: Any,
+) -> ModelT:
+    """Fetch the row matching ``lookup`` or insert it with ``defaults``.
+
+    Concurrent first logins race on the unique constraint; the loser rolls
+    back and re-reads the row the winner inserted.
+    """
+    query = select(model).filter_by(**lookup).limit(1)
+    instance = await db.scalar(query)
+    if instance is not None:
+        return instance
+
+    instance = model(**lookup, **(defaults or {}))
+    db.add(instance)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        instance = await db.scalar(query)
+        if instance is None:
+            raise
+        return instance
+    await db.refresh(instance)
+    return instance
+
+
+async def dispose_async_engine() -> None:
+    global async_engine
+    if async_engine is not None:
+        engine, async_engine = async_engine, None
+        await engine.dispose()
@@ -0,0 +1,35 @@
+"""Cursor hooks for every SQLAlchemy engine in the process.
+
+The listeners are attached to the ``Engine`` class, so they cover the sync
+engine and the async engine (which runs on a sync ``Engine`` underneath)
+alike. They register on import; ``app.db.async_session`` imports this
+module so any code path that can reach the database has them installed.
+"""
+import logging
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.core.config import settings
+from app.core.metrics import observe_query
+from app.core.query_profiler import query_profiler
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_SECONDS = 0.5
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.time())
+    if settings.DEBUG:
+        logger.debug("Start Query: %s", statement)
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    total = time.time() - conn.info["query_start_time"].pop()
+    observe_query(statement, total)
+    if query_profiler.should_record():
+        query_profiler.record(statement, total)
+    if total > SLOW_QUERY_SECONDS:
+        logger.warning("Slow Query: %s\nTime: %f", statement, total)
@@ -0,0 +1,44 @@
+from typing import Any, Dict, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from app.core.config import settings
+from app.jobs.queue import PermanentJobError
+from app.schemas.resume_schemas import ResumeCreate, ResumeData
+from app.services.pdf_executor import render_resume
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def _parse(model: Type[ModelT], payload: Dict[str, Any]) -> ModelT:
+    """Invalid payloads fail the same way on every attempt, so don't retry them"""
+    try:
+        return model(**payload)
+    except ValidationError as e:
+        raise PermanentJobError(f"Invalid payload: {e}")
+
+
+async def enhance_resume(payload: Dict[str, Any], context: Dict[str, Any]) -> Any:
+    resume = _parse(ResumeCreate, payload)
+    return await context["enhancement_service"].enhance_resume(resume.model_dump())
+
+
+async def generate_resume_content(payload: Dict[str, Any], context: Dict[str, Any]) -> Any:
+    description = payload.get("description")
+    if not isinstance(description, str):
+        raise PermanentJobError("Invalid payload: 'description' must be a string")
+    content = await context["ai_service"].generate_resume_content(description)
+    return content.model_dump()
+
+
+async def create_pdf(payload: Dict[str, Any], context: Dict[str, Any]) -> Any:
+    data = _parse(ResumeData, payload)
+    file_path = await context["pdf_executor"].render(
+        render_resume, data.model_dump(), settings.PDF_OUTPUT_DIR
+    )
+    return {"file_path": file_path}
+
+
+JOB_HANDLERS = {
+    "enhance_resume": enhance_resume,
+    "generate_resume_content": generate_resume_content,
+    "create_pdf": create_pdf,
+}
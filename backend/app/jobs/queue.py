@@ -0,0 +1,304 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from cachetools import TTLCache
+from app.core.config import settings
+from app.schemas.job_schemas import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[Dict[str, Any], Dict[str, Any]], Awaitable[Any]]
+
+
+class PermanentJobError(Exception):
+    """A failure retrying cannot fix (e.g. an invalid payload); fails the job at once"""
+
+
+class InMemoryJobBackend:
+    """Single-process backend: an asyncio queue plus a TTL-bounded job store"""
+
+    def __init__(self, result_ttl: int = settings.JOB_RESULT_TTL, max_jobs: int = 100000):
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._jobs = TTLCache(maxsize=max_jobs, ttl=result_ttl)
+
+    async def save(self, job: Job) -> None:
+        self._jobs[job.id] = job
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    async def push(self, job_id: str, delay: float = 0) -> None:
+        if delay > 0:
+            asyncio.get_running_loop().call_later(delay, self._queue.put_nowait, job_id)
+        else:
+            await self._queue.put(job_id)
+
+    async def pop(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def ack(self, job_id: str) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisJobBackend:
+    """Backend shared by API nodes and standalone workers through Redis.
+
+    Job records live under ``jobs:<id>`` with a TTL; ready job ids sit in a
+    list and retries wait in a sorted set scored by their due time.
+
+    Popping ``BLMOVE``s the id into this consumer's processing list, and it
+    is only removed there by ``ack`` once the attempt is settled. Each
+    consumer refreshes a heartbeat key; any consumer finding a peer whose
+    heartbeat expired (crash, killed deploy) moves that peer's in-flight
+    jobs back onto the queue.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        prefix: str = "jobs",
+        result_ttl: int = settings.JOB_RESULT_TTL,
+        heartbeat_ttl: int = settings.JOB_HEARTBEAT_TTL,
+        reap_interval: float = settings.JOB_REAP_INTERVAL,
+    ):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+        self.result_ttl = result_ttl
+        self.heartbeat_ttl = heartbeat_ttl
+        self.reap_interval = reap_interval
+        self.queue_key = f"{prefix}:queue"
+        self.delayed_key = f"{prefix}:delayed"
+        self.consumers_key = f"{prefix}:consumers"
+        self.consumer_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.processing_key = self._processing_key(self.consumer_id)
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._next_reap = 0.0
+
+    def _processing_key(self, consumer_id: str) -> str:
+        return f"{self.prefix}:processing:{consumer_id}"
+
+    def _alive_key(self, consumer_id: str) -> str:
+        return f"{self.prefix}:alive:{consumer_id}"
+
+    async def save(self, job: Job) -> None:
+        await self.client.set(
+            f"{self.prefix}:{job.id}", job.model_dump_json(), ex=self.result_ttl
+        )
+
+    async def load(self, job_id: str) -> Optional[Job]:
+        raw = await self.client.get(f"{self.prefix}:{job_id}")
+        return Job.model_validate_json(raw) if raw is not None else None
+
+    async def push(self, job_id: str, delay: float = 0) -> None:
+        if delay > 0:
+            await self.client.zadd(self.delayed_key, {job_id: time.time() + delay})
+        else:
+            await self.client.lpush(self.queue_key, job_id)
+
+    async def _promote_due(self) -> None:
+        due = await self.client.zrangebyscore(self.delayed_key, 0, time.time())
+        for job_id in due:
+            # Only the worker that wins the ZREM re-queues the job
+            if await self.client.zrem(self.delayed_key, job_id):
+                await self.client.lpush(self.queue_key, job_id)
+
+    async def heartbeat(self) -> None:
+        await self.client.sadd(self.consumers_key, self.consumer_id)
+        await self.client.set(self._alive_key(self.consumer_id), 1, ex=self.heartbeat_ttl)
+
+    async def _heartbeat_loop(self) -> None:
+        # Independent of pop(): while every worker is busy on long jobs nobody pops
+        while True:
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.error(f"Job consumer heartbeat failed: {str(e)}")
+            await asyncio.sleep(self.heartbeat_ttl / 3)
+
+    async def requeue_stale(self) -> int:
+        """Move in-flight jobs of consumers whose heartbeat expired back to the queue"""
+        requeued = 0
+        for member in await self.client.smembers(self.consumers_key):
+            consumer_id = member.decode() if isinstance(member, bytes) else member
+            if consumer_id == self.consumer_id or await self.client.exists(self._alive_key(consumer_id)):
+                continue
+            processing_key = self._processing_key(consumer_id)
+            # LMOVE is atomic, so concurrent reapers never requeue a job twice
+            while await self.client.lmove(processing_key, self.queue_key, "RIGHT", "LEFT") is not None:
+                requeued += 1
+            await self.client.srem(self.consumers_key, consumer_id)
+        if requeued:
+            logger.warning(f"Requeued {requeued} jobs from dead job consumers")
+        return requeued
+
+    async def pop(self, timeout: float) -> Optional[str]:
+        if self._heartbeat_task is None:
+            await self.heartbeat()
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+        now = time.monotonic()
+        if now >= self._next_reap:
+            self._next_reap = now + self.reap_interval
+            await self.requeue_stale()
+        await self._promote_due()
+        job_id = await self.client.blmove(
+            self.queue_key, self.processing_key, max(1, int(timeout)), "RIGHT", "LEFT"
+        )
+        if job_id is None:
+            return None
+        return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+    async def ack(self, job_id: str) -> None:
+        """The attempt is settled (done, failed or re-pushed); stop tracking it"""
+        await self.client.lrem(self.processing_key, 1, job_id)
+
+    async def close(self) -> None:
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+            self._heartbeat_task = None
+            # Clean shutdown: anything still in flight goes back right away
+            await self.client.delete(self._alive_key(self.consumer_id))
+            while await self.client.lmove(self.processing_key, self.queue_key, "RIGHT", "LEFT") is not None:
+                pass
+            await self.client.srem(self.consumers_key, self.consumer_id)
+        await self.client.aclose()
+
+
+class JobQueue:
+    """Submits jobs and runs them on a pool of asyncio worker tasks.
+
+    Each attempt is bounded by ``timeout``; failed attempts are retried with
+    exponential backoff and jitter until ``max_attempts`` is reached. A
+    ``PermanentJobError`` fails the job without retrying.
+    """
+
+    def __init__(
+        self,
+        backend,
+        handlers: Dict[str, JobHandler],
+        context: Optional[Dict[str, Any]] = None,
+        timeout: float = settings.JOB_TIMEOUT,
+        max_attempts: int = settings.JOB_MAX_ATTEMPTS,
+        retry_backoff: float = settings.JOB_RETRY_BACKOFF,
+    ):
+        self.backend = backend
+        self.handlers = handlers
+        self.context = context or {}
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self._workers: List[asyncio.Task] = []
+
+    async def submit(self, job_type: str, payload: Dict[str, Any], owner: Optional[str] = None) -> Job:
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job = Job(id=uuid.uuid4().hex, type=job_type, payload=payload, owner=owner)
+        await self.backend.save(job)
+        await self.backend.push(job.id)
+        return job
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        return await self.backend.load(job_id)
+
+    def start(self, workers: int = settings.JOB_WORKERS) -> None:
+        for i in range(workers):
+            self._workers.append(asyncio.create_task(self._worker_loop(i)))
+        logger.info(f"Started {workers} job workers")
+
+    async def close(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+        await self.backend.close()
+
+    async def run_forever(self, workers: int = settings.JOB_WORKERS) -> None:
+        """Entry point for standalone worker processes"""
+        self.start(workers)
+        await asyncio.gather(*self._workers)
+
+    async def _worker_loop(self, worker_id: int) -> None:
+        while True:
+            try:
+                job_id = await self.backend.pop(timeout=1.0)
+                if job_id is not None:
+                    try:
+                        await self._process(job_id)
+                    finally:
+                        await self.backend.ack(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {worker_id} error: {str(e)}", exc_info=True)
+                await asyncio.sleep(1)
+
+    def _backoff_delay(self, attempt: int) -> float:
+        delay = self.retry_backoff * (2 ** (attempt - 1))
+        return delay * random.uniform(0.8, 1.2)
+
+    async def _process(self, job_id: str) -> None:
+        job = await self.backend.load(job_id)
+        if job is None or job.status in (JobStatus.SUCCEEDED, JobStatus.FAILED):
+            return
+
+        job.status = JobStatus.RUNNING
+        job.attempts += 1
+        job.updated_at = time.time()
+        await self.backend.save(job)
+
+        try:
+            result = await asyncio.wait_for(
+                self.handlers[job.type](job.payload, self.context), self.timeout
+            )
+        except asyncio.CancelledError:
+            # Worker shutdown: put the job back for another worker
+            job.status = JobStatus.QUEUED
+            job.attempts -= 1
+            await self.backend.save(job)
+            await self.backend.push(job.id)
+            raise
+        except Exception as e:
+            error = "Job timed out" if isinstance(e, asyncio.TimeoutError) else str(e)
+            job.error = error
+            job.updated_at = time.time()
+            if job.attempts < self.max_attempts and not isinstance(e, PermanentJobError):
+                delay = self._backoff_delay(job.attempts)
+                logger.warning(f"Job {job.id} attempt {job.attempts} failed ({error}), retrying in {delay:.1f}s")
+                job.status = JobStatus.QUEUED
+                await self.backend.save(job)
+                await self.backend.push(job.id, delay=delay)
+            else:
+                logger.error(f"Job {job.id} failed after {job.attempts} attempts: {error}")
+                job.status = JobStatus.FAILED
+                await self.backend.save(job)
+            return
+
+        job.status = JobStatus.SUCCEEDED
+        job.result = result
+        job.error = None
+        job.updated_at = time.time()
+        await self.backend.save(job)
+
+
+def create_job_backend():
+    if settings.JOB_BACKEND == "redis":
+        return RedisJobBackend()
+    return InMemoryJobBackend()
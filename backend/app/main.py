@@ -1,14 +1,86 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.json_codec import CodecJSONResponse, dumps_bytes
+from app.core.metrics import MetricsMiddleware, metrics_response
+from app.core.query_profiler import QueryProfilerMiddleware
+from app.core.google_verifier import create_google_http_client, google_token_verifier
+from app.core.idempotency import IdempotencyStore
+from app.core.revocation import revocation_list
+from app.db.async_session import dispose_async_engine, init_async_engine
+from app.middleware.compression import StreamingAwareGZipMiddleware
+from app.middleware.rate_limiter import RateLimiter
+from app.services.ai_enhancement import ResumeEnhancementService, enhancement_cache
+from app.services.ai_service import AIService
+from app.services.llm_registry import AgentRegistry
+from app.services.pdf_executor import PDFRenderExecutor
+from app.jobs.handlers import JOB_HANDLERS
+from app.jobs.queue import JobQueue, create_job_backend
+from app.api.router import router as generation_router
+from app.api.endpoints.job_endpoints import router as job_router
+from app.api.endpoints.admin_endpoints import router as admin_router
+from app.api.endpoints.auth_endpoints import router as auth_router
 from app.api.endpoints.resume_endpoints import router as resume_router
 from fastapi.openapi.utils import get_openapi
+from starlette.routing import Route
+from typing import Optional
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging once, for the whole process
+logging.basicConfig(level=settings.LOG_LEVEL)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Heavy subsystems are built here rather than at import so workers boot fast
+    init_async_engine()
+    # Logins and key fetches reuse warm (HTTP/2) connections to Google from one pool
+    app.state.google_http_client = create_google_http_client()
+    google_token_verifier.use_http_client(app.state.google_http_client)
+    # Warm Google's signing keys so the first authenticated request doesn't pay for it
+    await google_token_verifier.start()
+    if settings.STATELESS_SESSIONS:
+        await revocation_list.start()
+    # One set of agents and one provider connection pool for the whole process
+    app.state.agent_registry = AgentRegistry()
+    app.state.enhancement_service = ResumeEnhancementService(app.state.agent_registry)
+    app.state.ai_service = AIService(app.state.agent_registry)
+    app.state.idempotency_store = IdempotencyStore()
+    app.state.pdf_executor = PDFRenderExecutor()
+    await app.state.pdf_executor.start()
+    app.state.job_queue = JobQueue(
+        create_job_backend(),
+        JOB_HANDLERS,
+        context={
+            "enhancement_service": app.state.enhancement_service,
+            "ai_service": app.state.ai_service,
+            "pdf_executor": app.state.pdf_executor,
+        },
+    )
+    if settings.JOB_RUN_WORKERS_IN_API:
+        app.state.job_queue.start(settings.JOB_WORKERS)
+    # Imported here so numpy stays out of `import app.main`; the fit runs off-request
+    from app.services.match_service import idf_refresher
+
+    await idf_refresher.start()
+    yield
+    await idf_refresher.close()
+    await app.state.job_queue.close()
+    await app.state.pdf_executor.close()
+    await app.state.agent_registry.close()
+    await app.state.idempotency_store.close()
+    await revocation_list.close()
+    await google_token_verifier.close()
+    await app.state.google_http_client.aclose()
+    if getattr(app.state, "rate_limiter", None) is not None:
+        await app.state.rate_limiter.backend.close()
+    logger.info(f"Enhancement cache stats at shutdown: {enhancement_cache.stats()}")
+    await enhancement_cache.close()
+    await dispose_async_engine()
+
+
 def get_application() -> FastAPI:
     # Log the ENABLE_SWAGGER_AUTH value
     logger.info(f"ENABLE_SWAGGER_AUTH is set to: {settings.ENABLE_SWAGGER_AUTH}")
@@ -17,8 +89,27 @@ def get_application() -> FastAPI:
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
         description="Resume Builder API with AI-powered enhancements",
+        lifespan=lifespan,
+        default_response_class=CodecJSONResponse,
     )
 
+    # Rate limiting (registered before CORS so 429 responses still carry CORS headers)
+    app.state.rate_limiter = None
+    if settings.RATE_LIMIT_ENABLED:
+        app.state.rate_limiter = RateLimiter()
+        app.middleware("http")(app.state.rate_limiter)
+
+    if settings.QUERY_PROFILER_ENABLED:
+        app.middleware("http")(QueryProfilerMiddleware())
+
+    # Outermost http middleware, so rate-limited responses are counted too
+    if settings.METRICS_ENABLED:
+        app.middleware("http")(MetricsMiddleware())
+        app.add_route("/metrics", metrics_response, include_in_schema=False)
+
+    # Compress larger responses; streamed SSE/NDJSON responses are left alone
+    app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
+
     # Configure CORS
     app.add_middleware(
         CORSMiddleware,
@@ -29,7 +120,11 @@ def get_application() -> FastAPI:
     )
 
     # Include routers
+    app.include_router(auth_router, prefix="/auth", tags=["Auth"])
     app.include_router(resume_router, prefix="/resumes", tags=["Resumes"])
+    app.include_router(generation_router, tags=["Generation"])
+    app.include_router(job_router, prefix="/jobs", tags=["Jobs"])
+    app.include_router(admin_router, prefix="/admin", tags=["Admin"])
 
     def custom_openapi():
         if app.openapi_schema:
@@ -53,9 +148,9 @@ def get_application() -> FastAPI:
                     "type": "oauth2",
                     "flows": {
                         "authorizationCode": {
-                            "authorizationUrl": "https://accounts.google.com/o/oauth2/v2/auth",
-                            "tokenUrl": "https://oauth2.googleapis.com/token",
-                            "refreshUrl": "https://oauth2.googleapis.com/token",
+                            "authorizationUrl": settings.GOOGLE_AUTH_URL,
+                            "tokenUrl": settings.GOOGLE_TOKEN_URL,
+                            "refreshUrl": settings.GOOGLE_TOKEN_URL,
                             "scopes": {
                                 "https://www.googleapis.com/auth/userinfo.email": "Access email address",
                                 "https://www.googleapis.com/auth/userinfo.profile": "Access user profile"
@@ -77,6 +172,18 @@ def get_application() -> FastAPI:
 
     app.openapi = custom_openapi
 
+    # Serve the schema serialized once instead of re-encoding it per request;
+    # inserted first so it shadows FastAPI's built-in openapi route
+    openapi_body: Optional[bytes] = None
+
+    async def openapi_json(request: Request) -> Response:
+        nonlocal openapi_body
+        if openapi_body is None:
+            openapi_body = dumps_bytes(app.openapi())
+        return Response(openapi_body, media_type="application/json")
+
+    app.router.routes.insert(0, Route(app.openapi_url, openapi_json, include_in_schema=False))
+
     @app.get("/", tags=["Health Check"])
     async def health_check():
         """
@@ -0,0 +1,36 @@
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware, GZipResponder
+from starlette.types import Message, Receive, Scope, Send
+
+# Streamed formats: gzip would hold events/lines in the compressor until the
+# stream ends, defeating incremental delivery. PDFs are already compressed.
+UNCOMPRESSED_MEDIA_TYPES = frozenset({"text/event-stream", "application/x-ndjson", "application/pdf"})
+
+
+class StreamingAwareGZipResponder(GZipResponder):
+    """Decides from the response headers whether to compress.
+
+    Responses whose Content-Type is in ``UNCOMPRESSED_MEDIA_TYPES`` take the
+    same pass-through path Starlette uses when Content-Encoding is already
+    set.
+    """
+
+    async def send_with_gzip(self, message: Message) -> None:
+        await super().send_with_gzip(message)
+        if message["type"] == "http.response.start":
+            content_type = Headers(raw=message["headers"]).get("content-type", "")
+            if content_type.split(";", 1)[0].strip().lower() in UNCOMPRESSED_MEDIA_TYPES:
+                self.content_encoding_set = True
+
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """GZip responses above ``minimum_size`` unless they are streams or PDFs"""
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and "gzip" in Headers(scope=scope).get("accept-encoding", ""):
+            responder = StreamingAwareGZipResponder(
+                self.app, self.minimum_size, compresslevel=self.compresslevel
+            )
+            await responder(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
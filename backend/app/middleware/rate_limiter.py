@@ -1,39 +1,269 @@
-from fastapi import Request, HTTPException
+from fastapi import Request
 from fastapi.responses import JSONResponse
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+from jose import jwt
+import logging
+import math
 import time
-from collections import defaultdict
 from app.core.config import settings
+from app.core.google_verifier import google_token_verifier
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitResult(NamedTuple):
+    allowed: bool
+    remaining: int
+    retry_after: int  # Seconds until the key is expected to be allowed again
+
+
+def _estimate(window: int, now: float, current: int, previous: int) -> float:
+    """Sliding-window-counter estimate shared by every backend.
+
+    The previous fixed window's count is weighted by how much of it still
+    overlaps the sliding window ending at ``now``.
+    """
+    return previous * (1 - (now % window) / window) + current
+
+
+def _sliding_window_result(
+    limit: int, window: int, now: float, current: int, previous: int, allowed: bool
+) -> RateLimitResult:
+    if allowed:
+        remaining = max(0, int(limit - _estimate(window, now, current, previous)))
+        return RateLimitResult(True, remaining, 0)
+
+    elapsed = now % window
+    if current >= limit or previous == 0:
+        retry_after = window - elapsed
+    else:
+        # Wait until enough of the previous window has slid out
+        needed_elapsed = window * (1 - (limit - current) / previous)
+        retry_after = max(needed_elapsed - elapsed, 0)
+    return RateLimitResult(False, 0, max(1, math.ceil(retry_after)))
+
+
+def _combine(
+    checks: Sequence[Tuple[str, int]],
+    window: int,
+    now: float,
+    counts: Sequence[Tuple[int, int]],
+    allowed: bool,
+) -> RateLimitResult:
+    """Most restrictive result over ``checks``.
+
+    ``counts`` are (current, previous) per check: after the increment if
+    ``allowed``, untouched otherwise.
+    """
+    results = []
+    for (_, limit), (current, previous) in zip(checks, counts):
+        ok = allowed or _estimate(window, now, current, previous) < limit
+        results.append(_sliding_window_result(limit, window, now, current, previous, ok))
+    denied = [r for r in results if not r.allowed]
+    if denied:
+        return max(denied, key=lambda r: r.retry_after)
+    return min(results, key=lambda r: r.remaining)
+
+
+class InMemoryRateLimitBackend:
+    """Per-process sliding-window counters with LRU eviction of idle keys.
+
+    Each key costs three integers regardless of traffic, and at most
+    ``max_keys`` keys are tracked; the least recently seen are dropped first.
+    """
+
+    def __init__(self, max_keys: int = settings.RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        # key -> [window_start, current_count, previous_count]
+        self._windows: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def _state(self, key: str, window: int, window_start: int) -> List[int]:
+        state = self._windows.get(key)
+        if state is None:
+            state = [window_start, 0, 0]
+            self._windows[key] = state
+            self._evict(window_start - window)
+        else:
+            self._windows.move_to_end(key)
+            if state[0] != window_start:
+                state[2] = state[1] if window_start - state[0] == window else 0
+                state[1] = 0
+                state[0] = window_start
+        return state
+
+    async def hit(self, checks: Sequence[Tuple[str, int]], window: int) -> RateLimitResult:
+        """Count one request against every ``(key, limit)`` if all of them allow it"""
+        now = time.time()
+        window_start = int(now // window) * window
+        states = [self._state(key, window, window_start) for key, _ in checks]
+        allowed = all(
+            _estimate(window, now, state[1], state[2]) < limit
+            for state, (_, limit) in zip(states, checks)
+        )
+        if allowed:
+            for state in states:
+                state[1] += 1
+        return _combine(checks, window, now, [(state[1], state[2]) for state in states], allowed)
+
+    def _evict(self, stale_before: int) -> None:
+        while len(self._windows) > self.max_keys:
+            self._windows.popitem(last=False)
+        # Opportunistically drop a couple of keys that have fully aged out
+        for _ in range(2):
+            oldest_key = next(iter(self._windows), None)
+            if oldest_key is None or self._windows[oldest_key][0] >= stale_before:
+                break
+            del self._windows[oldest_key]
+
+    async def close(self) -> None:
+        self._windows.clear()
+
+
+# KEYS[2i-1] = current window counter of check i, KEYS[2i] = its previous window counter
+# ARGV[1] = window seconds, ARGV[2] = weight of previous window, ARGV[2+i] = limit of check i
+# Returns {allowed, current_1, previous_1, current_2, previous_2, ...}
+SLIDING_WINDOW_LUA = """
+local weight = tonumber(ARGV[2])
+local counts = {}
+local allowed = 1
+for i = 1, #KEYS / 2 do
+    local current = tonumber(redis.call('GET', KEYS[2 * i - 1]) or '0')
+    local previous = tonumber(redis.call('GET', KEYS[2 * i]) or '0')
+    counts[2 * i - 1] = current
+    counts[2 * i] = previous
+    if previous * weight + current >= tonumber(ARGV[2 + i]) then
+        allowed = 0
+    end
+end
+if allowed == 1 then
+    for i = 1, #KEYS / 2 do
+        local current = redis.call('INCR', KEYS[2 * i - 1])
+        if current == 1 then
+            redis.call('EXPIRE', KEYS[2 * i - 1], tonumber(ARGV[1]) * 2)
+        end
+        counts[2 * i - 1] = current
+    end
+end
+table.insert(counts, 1, allowed)
+return counts
+"""
+
+
+class RedisRateLimitBackend:
+    """Sliding-window counters shared by every worker through Redis.
+
+    The check-and-increment of all of a request's keys runs as a single
+    Lua script, so concurrent workers cannot overshoot a limit and a denied
+    request consumes none of its buckets. Idle keys expire after two
+    windows.
+    """
+
+    def __init__(self, client=None, prefix: str = "ratelimit"):
+        if client is None:
+            import redis.asyncio as redis
+
+            client = redis.Redis.from_url(settings.REDIS_URL)
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(SLIDING_WINDOW_LUA)
+
+    async def hit(self, checks: Sequence[Tuple[str, int]], window: int) -> RateLimitResult:
+        """Count one request against every ``(key, limit)`` if all of them allow it"""
+        now = time.time()
+        window_index = int(now // window)
+        weight = 1 - (now % window) / window
+        keys = []
+        for key, _ in checks:
+            keys += [f"{self.prefix}:{key}:{window_index}", f"{self.prefix}:{key}:{window_index - 1}"]
+        allowed, *flat = await self._script(
+            keys=keys, args=[window, weight, *(limit for _, limit in checks)]
+        )
+        counts = [(int(flat[i]), int(flat[i + 1])) for i in range(0, len(flat), 2)]
+        return _combine(checks, window, now, counts, bool(allowed))
+
+    async def close(self) -> None:
+        await self.client.aclose()
+
+
+def create_rate_limit_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend()
+    return InMemoryRateLimitBackend()
+
+
+async def _user_key(request: Request) -> Optional[str]:
+    """Identify the caller from a verified bearer token, if any.
+
+    App tokens (HS256, cheap to check) carry the email as ``sub``; Google ID
+    tokens, used by the resume, job and admin routes, are verified with the
+    shared verifier, whose per-token cache the route's own authentication
+    then hits. Either way the bucket is the user's email. A forged or
+    expired token can neither drain another user's bucket nor mint fresh
+    buckets; such requests are limited by IP only.
+    """
+    authorization = request.headers.get("authorization", "")
+    if not authorization.lower().startswith("bearer "):
+        return None
+    token = authorization[7:]
+    try:
+        if jwt.get_unverified_header(token).get("alg") == "HS256":
+            email = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"]).get("sub")
+        else:
+            email = (await google_token_verifier.verify(token)).get("email")
+    except Exception:
+        return None
+    return f"user:{email}" if email else None
 
 
 class RateLimiter:
-    def __init__(self):
-        self.requests = defaultdict(list)
+    def __init__(
+        self,
+        backend=None,
+        ip_limit: int = settings.RATE_LIMIT_PER_MINUTE,
+        user_limit: int = settings.RATE_LIMIT_PER_USER,
+        window: int = settings.RATE_LIMIT_WINDOW,
+    ):
+        self.backend = backend or create_rate_limit_backend()
+        self.ip_limit = ip_limit
+        self.user_limit = user_limit
+        self.window = window
 
-    async def __call__(self, request: Request, call_next):
-        # Get client IP
-        client_ip = request.client.host
+    async def _check(self, request: Request) -> Optional[RateLimitResult]:
+        """Return the most restrictive result, or None if the backend is unavailable"""
+        client_ip = request.client.host if request.client else "unknown"
+        checks = [(f"ip:{client_ip}", self.ip_limit)]
+        user_key = await _user_key(request)
+        if user_key:
+            checks.append((user_key, self.user_limit))
+
+        try:
+            return await self.backend.hit(checks, self.window)
+        except Exception as e:
+            # Fail open: an outage of the limiter store shouldn't take the API down
+            logger.error(f"Rate limiter backend error: {str(e)}")
+            return None
 
-        # Clean old requests
-        current_time = time.time()
-        self.requests[client_ip] = [
-            req_time
-            for req_time in self.requests[client_ip]
-            if current_time - req_time < 60  # Keep last minute
-        ]
+    async def __call__(self, request: Request, call_next):
+        result = await self._check(request)
 
         # Check rate limit
-        if len(self.requests[client_ip]) >= settings.RATE_LIMIT_PER_MINUTE:
+        if result is not None and not result.allowed:
             return JSONResponse(
                 status_code=429,
-                content={"detail": "Too many requests", "retry_after": "60 seconds"},
+                content={
+                    "detail": "Too many requests",
+                    "retry_after": f"{result.retry_after} seconds",
+                },
+                headers={"Retry-After": str(result.retry_after)},
             )
 
-        # Add current request
-        self.requests[client_ip].append(current_time)
-
         # Process request
         response = await call_next(request)
 
+        if result is not None:
+            response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+
         # Add security headers
         response.headers["X-Content-Type-Options"] = "nosniff"
         response.headers["X-Frame-Options"] = "DENY"
@@ -1,6 +1,6 @@
 from app.models.base import Base
-from app.models.user import User
-from app.models.resume_models import Resume  # Updated to correct filename
+from app.models.user_models import User
+from app.models.resume_models import Resume, ResumeVersion  # Updated to correct filename
 
 # Export all models
-__all__ = ['Base', 'User', 'Resume']
+__all__ = ['Base', 'User', 'Resume', 'ResumeVersion']
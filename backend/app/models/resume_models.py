@@ -1,12 +1,43 @@
-from sqlalchemy import Column, Integer, String, JSON, ForeignKey, DateTime
+from sqlalchemy import Boolean, Column, FetchedValue, Integer, ForeignKey, DateTime, Index, UniqueConstraint
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.models.base import Base
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Serves per-user keyset pagination ordered by (created_at, id)
+        Index("ix_resumes_user_id_created_at_id", "user_id", "created_at", "id"),
+        # Full-text search scoped per user (needs the btree_gin extension)
+        Index("ix_resumes_user_id_search_vector", "user_id", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    content = Column(JSON)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    content = Column(JSONB)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Maintained by the resumes_search_vector_update trigger on every insert and
+    # update of content (migration 0004); not loaded by default
+    search_vector = deferred(Column(
+        TSVECTOR, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    ))
+
+class ResumeVersion(Base):
+    """One entry in a resume's history.
+
+    Snapshots store the full content; the versions between them store the
+    JSON diff against the previous version.
+    """
+    __tablename__ = "resume_versions"
+    __table_args__ = (
+        UniqueConstraint("resume_id", "version", name="uq_resume_versions_resume_id_version"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False)
+    is_snapshot = Column(Boolean, nullable=False)
+    data = Column(JSONB, nullable=False)  # Full content, or list of diff operations
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean
-from app.core.database import Base
+from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy.sql import func
+from app.models.base import Base
 
 
 class User(Base):
@@ -11,3 +12,5 @@ class User(Base):
     google_id = Column(String, unique=True)
     picture = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
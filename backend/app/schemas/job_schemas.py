@@ -0,0 +1,36 @@
+from enum import Enum
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+import time
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+class Job(BaseModel):
+    id: str
+    type: str
+    payload: Dict[str, Any]
+    owner: Optional[str] = None
+    status: JobStatus = JobStatus.QUEUED
+    attempts: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float = Field(default_factory=time.time)
+    updated_at: float = Field(default_factory=time.time)
+
+class JobSubmit(BaseModel):
+    type: str
+    payload: Dict[str, Any]
+
+class JobResponse(BaseModel):
+    id: str
+    type: str
+    status: JobStatus
+    attempts: int
+    result: Any = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
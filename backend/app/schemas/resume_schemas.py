@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Dict, Any, Optional
+from pydantic import BaseModel, Field
+from datetime import datetime
+from typing import Dict, Any, List, Optional
 
 class ResumeBase(BaseModel):
     content: Dict[str, Any]
@@ -7,9 +8,77 @@ class ResumeBase(BaseModel):
 class ResumeCreate(ResumeBase):
     pass
 
+class ResumeUpdate(ResumeBase):
+    pass
+
 class ResumeResponse(ResumeBase):
     id: int
     user_id: int
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ResumePage(BaseModel):
+    items: List[ResumeResponse]
+    next_cursor: Optional[str] = None
+
+class ResumeSearchHit(ResumeResponse):
+    rank: float
+    highlight: str
+
+class ResumeSearchPage(BaseModel):
+    items: List[ResumeSearchHit]
+    next_cursor: Optional[str] = None
+
+class JobMatchRequest(BaseModel):
+    job_descriptions: List[str] = Field(..., min_length=1)
+
+class JobMatchScore(BaseModel):
+    index: int
+    score: float
+
+class ResumeMatchRequest(BaseModel):
+    job_description: str
+    resume_ids: Optional[List[int]] = None
+    limit: int = Field(20, ge=1, le=10000)
+
+class ResumeMatchScore(BaseModel):
+    resume_id: int
+    score: float
+
+class ResumeVersionInfo(BaseModel):
+    version: int
+    is_snapshot: bool
+    created_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
+
+class ResumeVersionContent(ResumeBase):
+    version: int
+
+class ResumeVersionDiff(BaseModel):
+    from_version: int
+    to_version: int
+    operations: List[Dict[str, Any]]
+
+class ResumeContent(BaseModel):
+    education: List[str] = []
+    experience: List[str] = []
+    skills: List[str] = []
+
+class ResumeRequest(BaseModel):
+    name: str
+    email: str
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    description: str
+
+class ResumeData(BaseModel):
+    name: str
+    email: str
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    content: ResumeContent
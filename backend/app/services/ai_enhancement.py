@@ -1,38 +1,146 @@
-from pydantic_ai import Agent
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple, Union
+import asyncio
 import logging
-from dotenv import load_dotenv
+from app.core import json_codec
+from app.core.cache import CachedResult, RedisCacheTier, ResultCache, canonical_hash
+from app.core.config import settings
+from app.core.metrics import record_llm_usage, track_llm_call
+from app.core.singleflight import SingleFlight
+from app.services.llm_registry import AgentRegistry
+from app.services.prompting import build_prompt
 
-# Load environment variables from .env
-load_dotenv()
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
-class ResumeEnhancementService:
-    def __init__(self):
-        self.agent = Agent(
-            model="openai:gpt-4o-mini",
-            system_prompt="""You are an expert resume writer and career counselor with years of experience in helping 
+ENHANCEMENT_SYSTEM_PROMPT = """You are an expert resume writer and career counselor with years of experience in helping 
             professionals create compelling resumes. Your task is to enhance resumes by:
             1. Improving content and impact of experience descriptions
             2. Suggesting relevant skills based on experience
             3. Providing a more compelling professional summary
             4. Offering specific suggestions for improvement
             Please maintain factual accuracy while making the content more impactful."""
+
+ENHANCEMENT_INSTRUCTION = "Please enhance this resume:"
+
+# Shared across requests so identical resumes skip the LLM round trip
+enhancement_cache = ResultCache(
+    name="enhancement",
+    ttl=settings.ENHANCE_CACHE_TTL,
+    maxsize=settings.ENHANCE_CACHE_MAX_ENTRIES,
+    persistent=(
+        RedisCacheTier("cache:enhance", ttl=settings.ENHANCE_CACHE_TTL)
+        if settings.ENHANCE_CACHE_PERSISTENT
+        else None
+    ),
+)
+
+
+class ResumeEnhancementService:
+    """Long-lived service; build once per process from the shared AgentRegistry"""
+
+    def __init__(self, registry: AgentRegistry, cache: ResultCache = enhancement_cache):
+        self.model_name = settings.LLM_ENHANCE_MODEL
+        self.agent = registry.router(
+            [self.model_name, *settings.LLM_ENHANCE_FALLBACK_MODELS], ENHANCEMENT_SYSTEM_PROMPT
         )
+        self.cache = cache
+        # Identical resumes submitted concurrently (double clicks, client
+        # retries) share one model call
+        self.inflight = SingleFlight("enhance")
         logger.info("Resume Enhancement Service initialized successfully")
 
+    def cache_key(self, resume_data: Dict[Any, Any]) -> str:
+        return canonical_hash(
+            resume_data, self.model_name, ENHANCEMENT_SYSTEM_PROMPT, ENHANCEMENT_INSTRUCTION
+        )
+
     async def enhance_resume(self, resume_data: Dict[Any, Any]) -> Dict[Any, Any]:
+        return (await self.enhance_resume_cached(resume_data)).value
+
+    async def enhance_resume_cached(
+        self, resume_data: Dict[Any, Any], bypass_cache: bool = False
+    ) -> CachedResult:
+        """Enhance a resume, serving identical requests from the result cache"""
+        key = self.cache_key(resume_data)
+        compute = lambda: self.inflight.do(key, lambda: self._run_agent(resume_data))
+        if not settings.ENHANCE_CACHE_ENABLED:
+            return CachedResult(await compute(), False)
+        result = await self.cache.get_or_compute(key, compute, bypass=bypass_cache)
+        if result.hit:
+            logger.info("Serving enhanced resume from cache")
+        return result
+
+    async def enhance_many(
+        self,
+        resumes: List[Dict[Any, Any]],
+        concurrency: int = settings.ENHANCE_BATCH_CONCURRENCY,
+        bypass_cache: bool = False,
+    ) -> AsyncIterator[Tuple[int, Union[CachedResult, Exception]]]:
+        """Enhance several resumes concurrently, yielding ``(index, outcome)``
+        in completion order.
+
+        At most ``concurrency`` model calls are in flight. A failing item
+        yields its exception instead of aborting the batch; closing the
+        iterator early cancels the items still pending.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(index: int, resume_data: Dict[Any, Any]):
+            async with semaphore:
+                try:
+                    return index, await self.enhance_resume_cached(
+                        resume_data, bypass_cache=bypass_cache
+                    )
+                except Exception as e:
+                    return index, e
+
+        tasks = [asyncio.create_task(run_one(i, r)) for i, r in enumerate(resumes)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream_enhancement(
+        self, resume_data: Dict[Any, Any], bypass_cache: bool = False
+    ) -> AsyncIterator[str]:
+        """Yield the enhanced resume as text deltas while the model generates it.
+
+        Closing the iterator early (e.g. the client disconnected) exits
+        ``run_stream`` and aborts the provider request, so no further tokens
+        are generated. Completed streams populate the result cache.
+        """
+        use_cache = settings.ENHANCE_CACHE_ENABLED
+        key = self.cache_key(resume_data)
+        if use_cache and not bypass_cache:
+            cached = await self.cache.get(key)
+            if cached is not None:
+                yield cached if isinstance(cached, str) else json_codec.dumps(cached)
+                return
+
+        chunks = []
+        logger.info("Streaming enhancement from OpenAI API...")
+        with track_llm_call(self.model_name, "enhance_stream") as call:
+            async with self.agent.run_stream(self._prompt(resume_data, "enhance_stream")) as result:
+                call.model = result.model_name
+                async for delta in result.stream_text(delta=True):
+                    chunks.append(delta)
+                    yield delta
+            record_llm_usage(result.model_name, "enhance_stream", result.usage())
+        logger.info("Enhancement stream completed")
+        if use_cache:
+            await self.cache.set(key, "".join(chunks))
+
+    def _prompt(self, resume_data: Dict[Any, Any], operation: str) -> str:
+        return build_prompt(ENHANCEMENT_INSTRUCTION, resume_data, self.model_name, operation).text
+
+    async def _run_agent(self, resume_data: Dict[Any, Any]) -> Dict[Any, Any]:
         try:
             logger.info("Attempting to call OpenAI API...")
-            result = await self.agent.run(
-                f"Please enhance this resume: {resume_data}"
-            )
+            with track_llm_call(self.model_name, "enhance") as call:
+                result = await self.agent.run(self._prompt(resume_data, "enhance"))
+                call.model = result.model_name
+            record_llm_usage(result.model_name, "enhance", result.usage())
             logger.info("Successfully received API response")
             return result.data
             
@@ -1,29 +1,138 @@
-from pydantic_ai import Agent
-from app.models.resume_schemas import ResumeContent
-import json
+import asyncio
+import logging
+from typing import Any, List
+from pydantic import ValidationError
+from app.schemas.resume_schemas import ResumeContent
+from app.core import json_codec
+from app.core.cache import canonical_hash
+from app.core.config import settings
+from app.core.metrics import record_llm_usage, track_llm_call
+from app.core.singleflight import SingleFlight
+from app.services.llm_registry import AgentRegistry
+from app.services.prompting import build_prompt
 
+logger = logging.getLogger(__name__)
 
-class AIService:
-    def __init__(self):
-        self.agent = Agent(
-            "gpt-4",
-            system_prompt="""You are a professional resume writer. Generate specific and detailed entries for education, work experience, and skills based on the user's description.
+GENERATION_SYSTEM_PROMPT = """You are a professional resume writer. Generate specific and detailed entries for education, work experience, and skills based on the user's description.
             Always return the response in the following JSON format:
             {
                 "education": ["entry1", "entry2", ...],
                 "experience": ["entry1", "entry2", ...],
                 "skills": ["skill1", "skill2", ...]
-            }""",
-        )
+            }"""
+
+GENERATION_INSTRUCTION = "Create a professional resume content based on this description:"
+
+SECTIONS = ("education", "experience", "skills")
+
+SECTION_SYSTEM_PROMPTS = {
+    "education": """You are a professional resume writer. Generate specific and detailed education entries based on the user's description.
+            Always return only a JSON array of strings: ["entry1", "entry2", ...]""",
+    "experience": """You are a professional resume writer. Generate specific and detailed work experience entries based on the user's description.
+            Always return only a JSON array of strings: ["entry1", "entry2", ...]""",
+    "skills": """You are a professional resume writer. List the relevant skills based on the user's description.
+            Always return only a JSON array of strings: ["skill1", "skill2", ...]""",
+}
+
+SECTION_INSTRUCTION = "Create this resume section based on this description:"
+
+
+class SectionGenerationError(Exception):
+    """A section's output was not a non-empty list of strings"""
+
+
+def parse_section(section: str, data: Any) -> List[str]:
+    """Validate one section's model output independently of the others"""
+    if isinstance(data, str):
+        # Tolerate prose or code fences around the array
+        start, end = data.find("["), data.rfind("]")
+        if start == -1 or end < start:
+            raise SectionGenerationError(f"No JSON array in {section} output")
+        try:
+            data = json_codec.loads(data[start:end + 1])
+        except ValueError as e:
+            raise SectionGenerationError(f"Invalid JSON in {section} output: {e}")
+    if isinstance(data, dict):
+        data = data.get(section)
+    try:
+        entries = getattr(ResumeContent(**{section: data}), section)
+    except ValidationError as e:
+        raise SectionGenerationError(f"Invalid {section} entries: {e}")
+    entries = [entry.strip() for entry in entries if entry.strip()]
+    if not entries:
+        raise SectionGenerationError(f"Empty {section} section")
+    return entries
+
+
+class AIService:
+    def __init__(self, registry: AgentRegistry):
+        self.model_name = settings.LLM_GENERATE_MODEL
+        self.mode = settings.LLM_GENERATE_MODE
+        models = [self.model_name, *settings.LLM_GENERATE_FALLBACK_MODELS]
+        self.agent = registry.router(models, GENERATION_SYSTEM_PROMPT)
+        self.section_agents = {
+            section: registry.router(models, SECTION_SYSTEM_PROMPTS[section]) for section in SECTIONS
+        }
+        self.inflight = SingleFlight("generate")
 
     async def generate_resume_content(self, description: str) -> ResumeContent:
-        result = await self.agent.run(
-            f"Create a professional resume content based on this description: {description}"
+        """Concurrent calls with the same description share one model call"""
+        key = canonical_hash(description, self.model_name, self.mode, GENERATION_SYSTEM_PROMPT)
+        if self.mode == "sections":
+            return await self.inflight.do(key, lambda: self._generate_sections(description))
+        return await self.inflight.do(key, lambda: self._generate(description))
+
+    async def _generate(self, description: str) -> ResumeContent:
+        prompt = build_prompt(
+            GENERATION_INSTRUCTION, {"description": description}, self.model_name, "generate"
         )
+        with track_llm_call(self.model_name, "generate") as call:
+            result = await self.agent.run(prompt.text)
+            call.model = result.model_name
+        record_llm_usage(result.model_name, "generate", result.usage())
 
         if isinstance(result.data, str):
-            content_dict = json.loads(result.data)
+            content_dict = json_codec.loads(result.data)
         else:
             content_dict = result.data
 
         return ResumeContent(**content_dict)
+
+    async def _generate_sections(self, description: str) -> ResumeContent:
+        """Generate each section from its own prompt, concurrently.
+
+        Latency is that of the slowest section rather than the sum of all
+        of them. A section that fails or comes back invalid is retried on
+        its own; the others are kept. Once a section has used up its
+        retries the whole result is lost, so the sections still running are
+        cancelled rather than left spending tokens.
+        """
+        tasks = [
+            asyncio.create_task(self._generate_section(section, description)) for section in SECTIONS
+        ]
+        try:
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for task in tasks:
+            if task in done and task.exception() is not None:
+                raise task.exception()
+        return ResumeContent(**{section: task.result() for section, task in zip(SECTIONS, tasks)})
+
+    async def _generate_section(self, section: str, description: str) -> List[str]:
+        operation = f"generate_{section}"
+        prompt = build_prompt(SECTION_INSTRUCTION, {"description": description}, self.model_name, operation)
+        for attempt in range(settings.LLM_SECTION_RETRIES + 1):
+            try:
+                with track_llm_call(self.model_name, operation) as call:
+                    result = await self.section_agents[section].run(prompt.text)
+                    call.model = result.model_name
+                record_llm_usage(result.model_name, operation, result.usage())
+                return parse_section(section, result.data)
+            except Exception as e:
+                if attempt == settings.LLM_SECTION_RETRIES:
+                    raise
+                logger.warning(f"Retrying {section} section after attempt {attempt + 1} failed: {str(e)}")
+                await asyncio.sleep(settings.LLM_SECTION_RETRY_BACKOFF * 2 ** attempt)
@@ -0,0 +1,101 @@
+from typing import TYPE_CHECKING, Dict, Optional, Sequence, Tuple
+import logging
+import httpx
+from app.core.config import settings
+from app.services.llm_router import LLMRouter
+
+if TYPE_CHECKING:
+    from pydantic_ai import Agent
+
+logger = logging.getLogger(__name__)
+
+
+def create_llm_http_client() -> httpx.AsyncClient:
+    """Keep-alive connection pool shared by every LLM provider client"""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.LLM_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            settings.LLM_READ_TIMEOUT,
+            connect=settings.LLM_CONNECT_TIMEOUT,
+            pool=settings.LLM_POOL_TIMEOUT,
+        ),
+    )
+
+
+class AgentRegistry:
+    """Process-wide pydantic_ai agents, created once in the app lifespan.
+
+    Agents are keyed by (model, system prompt) and all share one provider
+    client and HTTP connection pool, so requests reuse warm TLS connections
+    instead of building a new client per call.
+    """
+
+    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+        # Provider SDKs are slow to import; load them when the lifespan builds
+        # the registry rather than when app.main is imported
+        from openai import AsyncOpenAI
+
+        self.http_client = http_client or create_llm_http_client()
+        self.openai_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            http_client=self.http_client,
+            max_retries=settings.LLM_MAX_RETRIES,
+        )
+        self._agents: Dict[Tuple[str, str], "Agent"] = {}
+        self._routers: Dict[Tuple[Tuple[str, ...], str], LLMRouter] = {}
+
+    def _model(self, model_name: str):
+        """Build a pydantic_ai model from ``provider:model`` (bare names are OpenAI)"""
+        provider, _, name = model_name.rpartition(":")
+        provider = provider or "openai"
+        if provider == "openai":
+            from pydantic_ai.models.openai import OpenAIModel
+
+            return OpenAIModel(name, openai_client=self.openai_client)
+        if provider == "anthropic":
+            from pydantic_ai.models.anthropic import AnthropicModel
+
+            return AnthropicModel(
+                name, api_key=settings.ANTHROPIC_API_KEY, http_client=self.http_client
+            )
+        if provider == "groq":
+            from pydantic_ai.models.groq import GroqModel
+
+            return GroqModel(name, api_key=settings.GROQ_API_KEY, http_client=self.http_client)
+        if provider == "mistral":
+            from pydantic_ai.models.mistral import MistralModel
+
+            return MistralModel(
+                name, api_key=settings.MISTRAL_API_KEY, http_client=self.http_client
+            )
+        raise ValueError(f"Unknown LLM provider '{provider}' in model '{model_name}'")
+
+    def agent(self, model_name: str, system_prompt: str) -> "Agent":
+        key = (model_name, system_prompt)
+        agent = self._agents.get(key)
+        if agent is None:
+            from pydantic_ai import Agent
+
+            agent = Agent(self._model(model_name), system_prompt=system_prompt)
+            self._agents[key] = agent
+            logger.info(f"Created shared agent for model {model_name}")
+        return agent
+
+    def router(self, model_names: Sequence[str], system_prompt: str) -> LLMRouter:
+        """Shared router over one agent per model, in preference order"""
+        key = (tuple(model_names), system_prompt)
+        router = self._routers.get(key)
+        if router is None:
+            router = LLMRouter([(name, self.agent(name, system_prompt)) for name in key[0]])
+            self._routers[key] = router
+        return router
+
+    async def close(self) -> None:
+        self._routers.clear()
+        self._agents.clear()
+        await self.openai_client.close()
+        await self.http_client.aclose()
@@ -0,0 +1,334 @@
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Iterator, List, Optional, Sequence, Tuple
+from app.core.config import settings
+from app.core.metrics import LLM_BREAKER_OPEN, LLM_ROUTER_CALLS
+
+logger = logging.getLogger(__name__)
+
+
+class NoProviderAvailable(Exception):
+    """Raised when every provider's circuit breaker is open"""
+
+
+class ProviderStats:
+    """Rolling latency and error rate over the last ``window`` calls"""
+
+    def __init__(self, window: int = settings.LLM_ROUTER_WINDOW):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+
+    def record(self, ok: bool, latency: Optional[float] = None) -> None:
+        self.outcomes.append(ok)
+        if ok and latency is not None:
+            self.latencies.append(latency)
+
+    @property
+    def warm(self) -> bool:
+        return len(self.latencies) >= settings.LLM_ROUTER_MIN_SAMPLES
+
+    def quantile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    @property
+    def error_rate(self) -> float:
+        return self.outcomes.count(False) / len(self.outcomes) if self.outcomes else 0.0
+
+    def expected_latency(self) -> float:
+        """Median latency inflated by the retries its error rate implies"""
+        if not self.warm:
+            return settings.LLM_ROUTER_DEFAULT_LATENCY
+        return self.quantile(0.5) / max(1 - self.error_rate, 0.05)
+
+    def hedge_delay(self) -> float:
+        if not self.warm:
+            return settings.LLM_ROUTER_DEFAULT_LATENCY
+        return max(self.quantile(settings.LLM_HEDGE_QUANTILE), settings.LLM_HEDGE_MIN_DELAY)
+
+
+class CircuitBreaker:
+    """Closed -> open after ``threshold`` consecutive failures; after
+    ``cooldown`` one probe call is let through (half-open) and its outcome
+    closes or re-opens the breaker.
+
+    ``allow`` only reports availability; a call must ``acquire`` its slot
+    before it starts. Acquiring claims the half-open probe in the same step
+    that checks for it, so a burst of concurrent calls sends exactly one.
+    """
+
+    def __init__(
+        self,
+        threshold: int = settings.LLM_BREAKER_FAILURES,
+        cooldown: float = settings.LLM_BREAKER_COOLDOWN,
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        return state == "closed" or (state == "half_open" and not self._probing)
+
+    def acquire(self) -> Optional[bool]:
+        """Claim a call: None if refused, else whether the call is the half-open probe"""
+        state = self.state
+        if state == "closed":
+            return False
+        if state == "half_open" and not self._probing:
+            self._probing = True
+            return True
+        return None
+
+    def on_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def on_failure(self, probe: bool = False) -> None:
+        self.failures += 1
+        if probe:
+            self._probing = False
+        if self.opened_at is not None or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+    def on_cancel(self, probe: bool = False) -> None:
+        if probe:
+            self._probing = False
+
+
+class Provider:
+    def __init__(self, name: str, agent: Any, index: int):
+        self.name = name
+        self.agent = agent
+        self.index = index
+        self.stats = ProviderStats()
+        self.breaker = CircuitBreaker()
+
+    def _update_breaker_metric(self) -> None:
+        LLM_BREAKER_OPEN.labels(self.name).set(0 if self.breaker.state == "closed" else 1)
+
+    def record_success(self, latency: float) -> None:
+        self.stats.record(True, latency)
+        self.breaker.on_success()
+        self._update_breaker_metric()
+
+    def record_failure(self, probe: bool = False) -> None:
+        self.stats.record(False)
+        self.breaker.on_failure(probe)
+        self._update_breaker_metric()
+        if self.breaker.state != "closed":
+            logger.warning(f"Circuit breaker open for LLM provider {self.name}")
+
+
+class RoutedResult:
+    """A provider's result plus ``model_name``, the provider that produced it.
+
+    Attribute access falls through to the wrapped result, so callers use it
+    as the agent's own result and label metrics by the model that answered
+    rather than the configured primary.
+    """
+
+    def __init__(self, result: Any, model_name: str):
+        self._result = result
+        self.model_name = model_name
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._result, name)
+
+
+class ProviderStream(RoutedResult):
+    """Wraps a provider's stream result and remembers errors the provider
+    raised while the caller consumed it.
+
+    The caller's ``async with`` body mixes reading the stream with its own
+    work, so an exception thrown back into ``run_stream`` may come from
+    either. It only counts against the provider if the provider raised.
+    """
+
+    def __init__(self, result: Any, model_name: str):
+        super().__init__(result, model_name)
+        self.error: Optional[BaseException] = None
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._result, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args: Any, **kwargs: Any) -> Any:
+            value = attr(*args, **kwargs)
+            if hasattr(value, "__aiter__"):
+                return self._iterate(value)
+            if inspect.isawaitable(value):
+                return self._await(value)
+            return value
+
+        return call
+
+    async def _iterate(self, iterator: Any) -> AsyncIterator[Any]:
+        try:
+            async for item in iterator:
+                yield item
+        except Exception as e:
+            self.error = e
+            raise
+        finally:
+            if hasattr(iterator, "aclose"):
+                await iterator.aclose()
+
+    async def _await(self, awaitable: Any) -> Any:
+        try:
+            return await awaitable
+        except Exception as e:
+            self.error = e
+            raise
+
+
+class LLMRouter:
+    """Routes agent calls across interchangeable models.
+
+    Each call goes to the provider with the lowest expected latency (rolling
+    median, inflated by its error rate; cold providers keep their configured
+    order). If the primary has not answered within its own p95, one hedged
+    duplicate is sent to the next provider and whichever finishes first wins;
+    the loser is cancelled. A provider that errors is failed over to the next
+    immediately. Providers whose circuit breaker is open are skipped.
+
+    Providers are ``(name, agent)`` pairs where the agent exposes
+    ``run(prompt)`` and ``run_stream(prompt)``, so local fakes that inject
+    latency and errors can stand in for real models.
+    """
+
+    def __init__(self, providers: Sequence[Tuple[str, Any]], hedge: bool = settings.LLM_HEDGE_ENABLED):
+        if not providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.providers = [Provider(name, agent, i) for i, (name, agent) in enumerate(providers)]
+        self.hedge = hedge
+
+    def ranked(self) -> List[Provider]:
+        available = [p for p in self.providers if p.breaker.allow()]
+        return sorted(available, key=lambda p: (p.stats.expected_latency(), p.index))
+
+    async def _call(self, provider: Provider, prompt: str, probe: bool) -> RoutedResult:
+        start = time.perf_counter()
+        try:
+            result = await provider.agent.run(prompt)
+        except asyncio.CancelledError:
+            LLM_ROUTER_CALLS.labels(provider.name, "cancelled").inc()
+            raise
+        except Exception:
+            provider.record_failure(probe)
+            LLM_ROUTER_CALLS.labels(provider.name, "error").inc()
+            raise
+        provider.record_success(time.perf_counter() - start)
+        LLM_ROUTER_CALLS.labels(provider.name, "ok").inc()
+        return RoutedResult(result, provider.name)
+
+    def _start(self, candidates: Iterator[Provider], prompt: str) -> Optional[Tuple[Provider, asyncio.Task]]:
+        """Launch the next candidate whose breaker still grants a slot.
+
+        The slot is claimed in the same step the task is created. A task
+        cancelled before it ever runs never reaches ``_call``'s handlers,
+        so a done callback gives back the probe claim.
+        """
+        for provider in candidates:
+            probe = provider.breaker.acquire()
+            if probe is None:
+                continue
+            task = asyncio.create_task(self._call(provider, prompt, probe))
+
+            def release(done: asyncio.Task, provider: Provider = provider, probe: bool = probe) -> None:
+                if done.cancelled():
+                    provider.breaker.on_cancel(probe)
+
+            task.add_done_callback(release)
+            return provider, task
+        return None
+
+    async def run(self, prompt: str) -> RoutedResult:
+        fallbacks = iter(self.ranked())
+        started = self._start(fallbacks, prompt)
+        if started is None:
+            raise NoProviderAvailable("All LLM providers are failing; circuit breakers are open")
+
+        primary, task = started
+        pending = {task}
+        hedge_at: Optional[float] = primary.stats.hedge_delay() if self.hedge else None
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=hedge_at, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # Primary is slower than its p95: hedge once on the next provider
+                    hedge_at = None
+                    started = self._start(fallbacks, prompt)
+                    if started is not None:
+                        backup, task = started
+                        logger.info(f"Hedging LLM call from {primary.name} to {backup.name}")
+                        LLM_ROUTER_CALLS.labels(backup.name, "hedged").inc()
+                        pending.add(task)
+                    continue
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                if not pending:
+                    # Everything in flight failed: fail over to the next provider
+                    started = self._start(fallbacks, prompt)
+                    if started is not None:
+                        pending.add(started[1])
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    @asynccontextmanager
+    async def run_stream(self, prompt: str) -> AsyncIterator[Any]:
+        """Stream from the best available provider.
+
+        Streams are not hedged (tokens are already flowing to the client);
+        the outcome still feeds the provider's stats and breaker. A stream
+        the caller abandons (cancellation, ``aclose`` on client disconnect,
+        or its own error) records neither success nor failure, but always
+        gives back a half-open probe claim.
+        """
+        for provider in self.ranked():
+            probe = provider.breaker.acquire()
+            if probe is not None:
+                break
+        else:
+            raise NoProviderAvailable("All LLM providers are failing; circuit breakers are open")
+        start = time.perf_counter()
+        abandoned = False
+        try:
+            async with provider.agent.run_stream(prompt) as raw:
+                result = ProviderStream(raw, provider.name)
+                try:
+                    yield result
+                except BaseException:
+                    abandoned = result.error is None
+                    raise
+        except BaseException as e:
+            if abandoned or not isinstance(e, Exception):
+                provider.breaker.on_cancel(probe)
+                LLM_ROUTER_CALLS.labels(provider.name, "cancelled").inc()
+            else:
+                provider.record_failure(probe)
+                LLM_ROUTER_CALLS.labels(provider.name, "error").inc()
+            raise
+        provider.record_success(time.perf_counter() - start)
+        LLM_ROUTER_CALLS.labels(provider.name, "ok").inc()
@@ -0,0 +1,279 @@
+import asyncio
+import logging
+import re
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+import numpy as np
+from cachetools import LRUCache
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.models.resume_models import Resume
+
+logger = logging.getLogger(__name__)
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+SKILL_WEIGHT = 2  # Skills count twice as much as experience text
+# Encoding more uncached documents than this is moved off the event loop
+INLINE_ENCODE_LIMIT = 32
+
+
+class EncodedDoc(NamedTuple):
+    indices: np.ndarray  # Hashed feature ids, unique and sorted
+    tf: np.ndarray  # Sublinear term frequency per feature
+
+
+class SparseBatch(NamedTuple):
+    """CSR-style batch of documents: row i spans indptr[i]:indptr[i + 1]"""
+
+    indices: np.ndarray
+    tf: np.ndarray
+    indptr: np.ndarray
+
+    @property
+    def size(self) -> int:
+        return len(self.indptr) - 1
+
+    def row_sums(self, values: np.ndarray) -> np.ndarray:
+        """Per-row sums of ``values`` aligned with ``indices`` (sparse reduce)"""
+        sums = np.zeros(self.size, dtype=np.float32)
+        starts = self.indptr[:-1]
+        nonempty = starts < self.indptr[1:]
+        if nonempty.any():
+            # reduceat misreads empty segments, so reduce over non-empty rows only
+            sums[nonempty] = np.add.reduceat(values, starts[nonempty])
+        return sums
+
+
+def resume_match_text(content: Dict[str, Any]) -> str:
+    """Text used for matching: skills (weighted) and experience, else all strings"""
+    skills = content.get("skills") or []
+    experience = content.get("experience") or []
+    if skills or experience:
+        skills_text = " ".join(map(str, skills)) if isinstance(skills, list) else str(skills)
+        experience_text = " ".join(map(str, experience)) if isinstance(experience, list) else str(experience)
+        return " ".join([skills_text] * SKILL_WEIGHT + [experience_text])
+
+    strings: List[str] = []
+
+    def collect(value: Any) -> None:
+        if isinstance(value, str):
+            strings.append(value)
+        elif isinstance(value, dict):
+            for item in value.values():
+                collect(item)
+        elif isinstance(value, list):
+            for item in value:
+                collect(item)
+
+    collect(content)
+    return " ".join(strings)
+
+
+class MatchEngine:
+    """Hashed-feature TF-IDF cosine similarity computed with batched NumPy ops.
+
+    Tokens are hashed into ``n_features`` buckets, so there is no vocabulary
+    to grow; document-frequency statistics are fitted from a corpus sample
+    and cached. Per-document encodings are cached by content key. Scoring
+    loops over the smaller side only, each step being a vectorized pass over
+    all non-zeros of the other side.
+    """
+
+    def __init__(self, n_features: int = settings.MATCH_FEATURES, cache_size: int = 50000):
+        self.n_features = n_features
+        self._idf = np.ones(n_features, dtype=np.float32)
+        self.fitted_at = 0.0
+        self.corpus_size = 0
+        self._encodings = LRUCache(maxsize=cache_size)
+
+    def cached(self, key: Any) -> Optional[EncodedDoc]:
+        return self._encodings.get(key)
+
+    def store(self, key: Any, doc: EncodedDoc) -> None:
+        self._encodings[key] = doc
+
+    def encode(self, text: str, key: Optional[Any] = None) -> EncodedDoc:
+        if key is not None:
+            cached = self._encodings.get(key)
+            if cached is not None:
+                return cached
+        tokens = TOKEN_RE.findall(text.lower())
+        ids = np.fromiter(
+            (zlib.crc32(token.encode()) for token in tokens), dtype=np.uint32, count=len(tokens)
+        ) % self.n_features
+        indices, counts = np.unique(ids.astype(np.int32), return_counts=True)
+        doc = EncodedDoc(indices, (1 + np.log(counts)).astype(np.float32))
+        if key is not None:
+            self._encodings[key] = doc
+        return doc
+
+    @staticmethod
+    def batch(docs: Sequence[EncodedDoc]) -> SparseBatch:
+        lengths = np.fromiter((len(d.indices) for d in docs), dtype=np.int64, count=len(docs))
+        indptr = np.zeros(len(docs) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        if not docs:
+            empty = np.zeros(0, dtype=np.int32)
+            return SparseBatch(empty, empty.astype(np.float32), indptr)
+        return SparseBatch(
+            np.concatenate([d.indices for d in docs]),
+            np.concatenate([d.tf for d in docs]),
+            indptr,
+        )
+
+    def encode_contents(self, contents: Sequence[Optional[Dict[str, Any]]]) -> List[EncodedDoc]:
+        """Encode resume contents without touching the encoding cache.
+
+        Safe to run in a worker thread; the caller stores results on the loop.
+        """
+        return [self.encode(resume_match_text(content or {})) for content in contents]
+
+    def fit(self, docs: Iterable[EncodedDoc]) -> None:
+        """Recompute smoothed IDF from a corpus sample"""
+        df = np.zeros(self.n_features, dtype=np.int64)
+        n_docs = 0
+        for doc in docs:
+            df[doc.indices] += 1
+            n_docs += 1
+        # Swapped in as one attribute assignment, so scoring never sees a partial fit
+        self._idf = (np.log((1 + n_docs) / (1 + df)) + 1).astype(np.float32)
+        self.corpus_size = n_docs
+        self.fitted_at = time.time()
+
+    def fit_contents(self, contents: Sequence[Optional[Dict[str, Any]]]) -> None:
+        """Encode and fit in one call; CPU-bound, meant for ``asyncio.to_thread``"""
+        self.fit(self.encode(resume_match_text(content or {})) for content in contents)
+
+    def _weights(self, batch: SparseBatch) -> np.ndarray:
+        """L2-normalized TF-IDF weights aligned with ``batch.indices``"""
+        weights = batch.tf * self._idf[batch.indices]
+        norms = np.sqrt(batch.row_sums(weights * weights))
+        norms[norms == 0] = 1.0
+        return weights / np.repeat(norms, np.diff(batch.indptr))
+
+    def score(self, queries: SparseBatch, docs: SparseBatch) -> np.ndarray:
+        """Cosine similarity matrix of shape (queries.size, docs.size)"""
+        if queries.size > docs.size:
+            return self.score(docs, queries).T
+
+        doc_weights = self._weights(docs)
+        query_weights = self._weights(queries)
+        scores = np.zeros((queries.size, docs.size), dtype=np.float32)
+        dense = np.zeros(self.n_features, dtype=np.float32)
+        for q in range(queries.size):
+            start, end = queries.indptr[q], queries.indptr[q + 1]
+            dense[queries.indices[start:end]] = query_weights[start:end]
+            scores[q] = docs.row_sums(doc_weights * dense[docs.indices])
+            dense[queries.indices[start:end]] = 0
+        return scores
+
+
+match_engine = MatchEngine()
+
+
+class IdfRefresher:
+    """Refits ``match_engine``'s IDF statistics in the background.
+
+    Runs from the app lifespan, never inside a request: the sample is loaded
+    from the database and encoding plus fitting run in a worker thread, so
+    the event loop keeps serving while the fit takes seconds. Until the
+    first fit completes, matching uses plain TF cosine similarity.
+    """
+
+    def __init__(
+        self,
+        engine: MatchEngine = match_engine,
+        refresh_interval: int = settings.MATCH_IDF_REFRESH_SECONDS,
+    ):
+        self.engine = engine
+        self.refresh_interval = refresh_interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh(self) -> None:
+        async with AsyncSessionLocal() as db:
+            contents = (await db.scalars(
+                select(Resume.content)
+                .order_by(Resume.id.desc())
+                .limit(settings.MATCH_IDF_SAMPLE_SIZE)
+            )).all()
+        await asyncio.to_thread(self.engine.fit_contents, contents)
+        logger.info(f"Fitted match IDF statistics on {self.engine.corpus_size} resumes")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._refresh_loop())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Match IDF refresh failed: {str(e)}")
+            await asyncio.sleep(self.refresh_interval)
+
+
+idf_refresher = IdfRefresher()
+
+
+class ResumeMatchService:
+    """Scores stored resumes against job descriptions without any LLM call"""
+
+    def __init__(self, db: AsyncSession, engine: MatchEngine = match_engine):
+        self.db = db
+        self.engine = engine
+
+    async def _encode_resumes(self, resumes: Sequence[Resume]) -> SparseBatch:
+        """Batch resume encodings; bulk cache misses are encoded in a worker thread"""
+        keys = [(resume.id, resume.updated_at) for resume in resumes]
+        docs = [self.engine.cached(key) for key in keys]
+        missing = [i for i, doc in enumerate(docs) if doc is None]
+        if missing:
+            contents = [resumes[i].content for i in missing]
+            if len(missing) > INLINE_ENCODE_LIMIT:
+                encoded = await asyncio.to_thread(self.engine.encode_contents, contents)
+            else:
+                encoded = self.engine.encode_contents(contents)
+            # Cache writes stay on the event loop; the LRU is not thread-safe
+            for i, doc in zip(missing, encoded):
+                docs[i] = doc
+                self.engine.store(keys[i], doc)
+        return self.engine.batch(docs)
+
+    def _encode_texts(self, texts: Sequence[str]) -> SparseBatch:
+        return self.engine.batch([self.engine.encode(text) for text in texts])
+
+    async def match_jobs(self, resume: Resume, job_descriptions: List[str]) -> List[float]:
+        """Score one resume against many job descriptions"""
+        scores = self.engine.score(
+            await self._encode_resumes([resume]), self._encode_texts(job_descriptions)
+        )
+        return scores[0].tolist()
+
+    async def match_resumes(
+        self, user_id: int, job_description: str, resume_ids: Optional[List[int]] = None
+    ) -> List[tuple]:
+        """Score many of a user's resumes against one job description"""
+        query = select(Resume).where(Resume.user_id == user_id)
+        if resume_ids:
+            query = query.where(Resume.id.in_(resume_ids))
+        resumes = list(
+            (await self.db.scalars(query.limit(settings.MATCH_MAX_RESUMES))).all()
+        )
+        if not resumes:
+            return []
+        scores = await asyncio.to_thread(
+            self.engine.score, self._encode_texts([job_description]), await self._encode_resumes(resumes)
+        )
+        return list(zip(resumes, scores[0].tolist()))
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Union
+from app.core.config import settings
+from app.core.metrics import PDF_RENDER_LATENCY, PDF_RENDER_PENDING
+
+logger = logging.getLogger(__name__)
+
+
+class RenderQueueFull(Exception):
+    """Raised when the render queue is at PDF_RENDER_QUEUE_DEPTH"""
+
+
+def _warm_worker() -> None:
+    """Child-process initializer: import reportlab, register fonts and
+    compile every template once"""
+    from app.services.pdf_templates import get_template_engine
+
+    get_template_engine()
+
+
+def _noop() -> None:
+    return None
+
+
+def render_resume(
+    data: Dict[str, Any], output_dir: str = "output", template: str = "classic"
+) -> str:
+    """Render a ResumeData payload with PDFService inside a pool process"""
+    from app.schemas.resume_schemas import ResumeData
+    from app.services.pdf_service import PDFService
+
+    return PDFService.create_resume(ResumeData(**data), output_dir, template)
+
+
+class PDFRenderExecutor:
+    """Runs CPU-bound reportlab rendering on a warm process pool.
+
+    Render functions must be picklable module-level callables. At most
+    ``queue_depth`` renders may be queued or running; beyond that callers get
+    ``RenderQueueFull`` immediately instead of piling onto the backlog.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.PDF_RENDER_WORKERS,
+        queue_depth: int = settings.PDF_RENDER_QUEUE_DEPTH,
+        start_method: str = settings.PDF_RENDER_START_METHOD,
+    ):
+        self.workers = workers or multiprocessing.cpu_count()
+        self.queue_depth = queue_depth
+        self.start_method = start_method
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def start(self) -> None:
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context(self.start_method),
+            initializer=_warm_worker,
+        )
+        # Children are spawned lazily; force them up now so the first render is warm
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(self._pool, _noop) for _ in range(self.workers))
+        )
+        logger.info(f"PDF render pool started with {self.workers} workers")
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.to_thread(pool.shutdown, wait=True, cancel_futures=True)
+
+    def _reserve(self, count: int) -> None:
+        if self._pending + count > self.queue_depth:
+            raise RenderQueueFull(
+                f"PDF render queue is full ({self._pending}/{self.queue_depth})"
+            )
+        self._pending += count
+        PDF_RENDER_PENDING.inc(count)
+
+    async def _run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await loop.run_in_executor(self._pool, fn, *args)
+            outcome = "ok"
+            return result
+        finally:
+            self._pending -= 1
+            PDF_RENDER_PENDING.dec()
+            PDF_RENDER_LATENCY.labels(outcome).observe(time.perf_counter() - start)
+
+    async def render(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run one render in the pool, raising RenderQueueFull under backpressure"""
+        if self._pool is None:
+            raise RuntimeError("PDF render executor is not started")
+        self._reserve(1)
+        return await self._run(fn, *args)
+
+    async def render_many(
+        self, fn: Callable[..., Any], arg_list: List[tuple]
+    ) -> List[Union[Any, Exception]]:
+        """Render a batch in parallel across cores.
+
+        The whole batch is admitted or rejected up front; per-item failures
+        are returned in place of that item's result.
+        """
+        if self._pool is None:
+            raise RuntimeError("PDF render executor is not started")
+        if len(arg_list) > self.queue_depth:
+            # Could never be admitted; retrying would loop forever
+            raise ValueError(
+                f"Batch of {len(arg_list)} exceeds the render queue depth ({self.queue_depth})"
+            )
+        self._reserve(len(arg_list))
+        return await asyncio.gather(
+            *(self._run(fn, *args) for args in arg_list), return_exceptions=True
+        )
@@ -1,41 +1,22 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import (
-    SimpleDocTemplate,
-    Paragraph,
-    Spacer,
-    ListFlowable,
-    ListItem,
-)
-from reportlab.lib.styles import getSampleStyleSheet
-from app.schemas.resume_schemas import ResumeCreate, EnhancedResume
+from typing import Any, BinaryIO, Dict, Optional, Union
+from app.schemas.resume_schemas import ResumeData
+from app.services.pdf_templates import get_template_engine, resume_data_document
 
 
 class PDFGeneratorService:
     @staticmethod
     def generate_pdf(
-        resume_data: ResumeCreate, enhanced_data: EnhancedResume, output_path: str
+        resume_data: ResumeData,
+        output: Union[str, BinaryIO],
+        template: str = "classic",
+        summary: Optional[str] = None,
     ):
-        doc = SimpleDocTemplate(
-            output_path,
-            pagesize=letter,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72,
-        )
+        """Render a resume through a precompiled template.
 
-        styles = getSampleStyleSheet()
-        story = []
-
-        # Name and Contact
-        story.append(Paragraph(resume_data.full_name, styles["Heading1"]))
-        contact_info = f"{resume_data.email} | {resume_data.phone}"
-        if resume_data.linkedin:
-            contact_info += f" | LinkedIn: {resume_data.linkedin}"
-        story.append(Paragraph(contact_info, styles["Normal"]))
-        story.append(Spacer(1, 12))
-
-        # Rest of the PDF generation code...
-        # (Keep the existing PDF generation logic here)
-
-        doc.build(story)
+        ``summary`` (e.g. from AI enhancement) is placed above the experience
+        section when the template includes one.
+        """
+        document: Dict[str, Any] = resume_data_document(resume_data)
+        if summary:
+            document["sections"]["summary"] = summary
+        get_template_engine().render(document, output, template=template)
@@ -1,23 +1,24 @@
-from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import letter
-from app.models.resume_schemas import ResumeData
+from app.schemas.resume_schemas import ResumeData
+from app.services.pdf_templates import get_template_engine, resume_data_document
 import os
+import re
+import uuid
 
 
 class PDFService:
     @staticmethod
-    def create_resume(user_data: ResumeData, output_dir: str = "output") -> str:
+    def create_resume(
+        user_data: ResumeData, output_dir: str = "output", template: str = "classic"
+    ) -> str:
         os.makedirs(output_dir, exist_ok=True)
+        # Unique per render: same-named resumes must not overwrite each
+        # other, and the name must not be able to leave output_dir
+        safe_name = re.sub(r"[^A-Za-z0-9_-]+", "_", user_data.name).strip("_")[:64] or "resume"
         file_path = os.path.join(
-            output_dir, f"resume_{user_data.name.replace(' ', '_')}.pdf"
+            output_dir, f"resume_{safe_name}_{uuid.uuid4().hex}.pdf"
         )
 
-        c = canvas.Canvas(file_path, pagesize=letter)
-
-        # Header section
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(50, 750, user_data.name)
-        # ... rest of the PDF generation code ...
-
-        c.save()
+        get_template_engine().render(
+            resume_data_document(user_data), file_path, template=template
+        )
         return file_path
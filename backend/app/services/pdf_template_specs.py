@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+# Layout declarations only; kept free of reportlab so the API process can
+# validate template names without importing the PDF stack.
+
+SECTION_TITLES = {
+    "summary": "Professional Summary",
+    "experience": "Experience",
+    "education": "Education",
+    "skills": "Skills",
+}
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    """Declarative description of a resume layout"""
+
+    name: str
+    sections: Tuple[str, ...] = ("summary", "experience", "education", "skills")
+    page_size: str = "letter"
+    margin: float = 72
+    name_size: float = 20
+    heading_size: float = 12
+    body_size: float = 10
+    leading_ratio: float = 1.3
+    section_gap: float = 10
+    accent: str = "#000000"
+    centered_header: bool = False
+    heading_rule: bool = True
+    inline_skills: bool = False  # Comma-separated line instead of bullets
+
+
+TEMPLATES: Dict[str, TemplateSpec] = {
+    spec.name: spec
+    for spec in (
+        TemplateSpec(name="classic"),
+        TemplateSpec(
+            name="compact",
+            margin=48,
+            name_size=16,
+            heading_size=10.5,
+            body_size=9,
+            leading_ratio=1.2,
+            section_gap=6,
+            inline_skills=True,
+        ),
+        TemplateSpec(
+            name="modern",
+            page_size="A4",
+            margin=56,
+            name_size=24,
+            heading_size=12.5,
+            accent="#1F4E79",
+            centered_header=True,
+            heading_rule=False,
+        ),
+    )
+}
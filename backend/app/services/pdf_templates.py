@@ -0,0 +1,206 @@
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Union
+from xml.sax.saxutils import escape
+import copy
+import logging
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer
+from app.core.config import settings
+from app.services.pdf_template_specs import SECTION_TITLES, TEMPLATES, TemplateSpec
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZES = {"letter": letter, "A4": A4}
+
+# Logical font roles -> registered font names; TTF fonts replace these when available
+_fonts = {"regular": "Helvetica", "bold": "Helvetica-Bold"}
+_fonts_registered = False
+
+
+def register_fonts(font_dir: Optional[str] = settings.PDF_FONT_DIR) -> Dict[str, str]:
+    """Register the resume fonts once per process.
+
+    When ``PDF_FONT_DIR`` holds the configured TTF family, those fonts are
+    used; reportlab embeds only the glyphs a document actually uses, so the
+    files stay small. Otherwise the base-14 Helvetica fonts are used and
+    nothing is embedded.
+    """
+    global _fonts_registered
+    if _fonts_registered:
+        return _fonts
+    _fonts_registered = True
+
+    if font_dir:
+        family = settings.PDF_FONT_FAMILY
+        regular = Path(font_dir) / f"{family}.ttf"
+        bold = Path(font_dir) / f"{family}-Bold.ttf"
+        if regular.exists() and bold.exists():
+            pdfmetrics.registerFont(TTFont(f"{family}", str(regular)))
+            pdfmetrics.registerFont(TTFont(f"{family}-Bold", str(bold)))
+            _fonts.update(regular=family, bold=f"{family}-Bold")
+            logger.info(f"Registered embedded PDF font family {family}")
+        else:
+            logger.warning(f"Font family {family} not found in {font_dir}, using Helvetica")
+    return _fonts
+
+
+class CompiledTemplate:
+    """A TemplateSpec compiled into a reusable layout plan.
+
+    Styles, page geometry and the parsed markup of every static heading are
+    built once; ``bind`` only creates the flowables that depend on the data.
+    """
+
+    def __init__(self, spec: TemplateSpec):
+        fonts = register_fonts()
+        self.spec = spec
+        self.page_size = PAGE_SIZES[spec.page_size]
+        accent = colors.HexColor(spec.accent)
+
+        def leading(size: float) -> float:
+            return size * spec.leading_ratio
+
+        self.styles = {
+            "name": ParagraphStyle(
+                f"{spec.name}-name",
+                fontName=fonts["bold"],
+                fontSize=spec.name_size,
+                leading=leading(spec.name_size),
+                textColor=accent,
+                alignment=TA_CENTER if spec.centered_header else TA_LEFT,
+            ),
+            "contact": ParagraphStyle(
+                f"{spec.name}-contact",
+                fontName=fonts["regular"],
+                fontSize=spec.body_size,
+                leading=leading(spec.body_size),
+                alignment=TA_CENTER if spec.centered_header else TA_LEFT,
+            ),
+            "heading": ParagraphStyle(
+                f"{spec.name}-heading",
+                fontName=fonts["bold"],
+                fontSize=spec.heading_size,
+                leading=leading(spec.heading_size),
+                textColor=accent,
+                spaceBefore=spec.section_gap,
+                spaceAfter=2,
+                keepWithNext=1,
+            ),
+            "body": ParagraphStyle(
+                f"{spec.name}-body",
+                fontName=fonts["regular"],
+                fontSize=spec.body_size,
+                leading=leading(spec.body_size),
+            ),
+            "bullet": ParagraphStyle(
+                f"{spec.name}-bullet",
+                fontName=fonts["regular"],
+                fontSize=spec.body_size,
+                leading=leading(spec.body_size),
+                leftIndent=12,
+                bulletIndent=2,
+                bulletFontName=fonts["regular"],
+            ),
+        }
+
+        # Pre-parse static heading markup; bind() copies the fragments
+        self._heading_frags = {
+            section: Paragraph(escape(title), self.styles["heading"]).frags
+            for section, title in SECTION_TITLES.items()
+        }
+        self._header_gap = spec.section_gap / 2
+
+    def _heading(self, section: str) -> List[Any]:
+        heading = [Paragraph("", self.styles["heading"], frags=copy.copy(self._heading_frags[section]))]
+        if self.spec.heading_rule:
+            heading.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey, spaceAfter=3))
+        return heading
+
+    def bind(self, document: Dict[str, Any]) -> List[Any]:
+        """Build the story for one resume from the precompiled plan"""
+        styles = self.styles
+        story = [Paragraph(escape(document["name"]), styles["name"])]
+        contact = [escape(str(v)) for v in document.get("contact", []) if v]
+        if contact:
+            story.append(Paragraph(" | ".join(contact), styles["contact"]))
+        story.append(Spacer(1, self._header_gap))
+
+        sections = document.get("sections", {})
+        for section in self.spec.sections:
+            entries = sections.get(section)
+            if not entries:
+                continue
+            story.extend(self._heading(section))
+            if isinstance(entries, str):
+                story.append(Paragraph(escape(entries), styles["body"]))
+            elif section == "skills" and self.spec.inline_skills:
+                story.append(Paragraph(escape(", ".join(entries)), styles["body"]))
+            else:
+                story.extend(
+                    Paragraph(escape(entry), styles["bullet"], bulletText="•")
+                    for entry in entries
+                )
+        return story
+
+    def render(self, document: Dict[str, Any], output: Union[str, BinaryIO]) -> None:
+        margin = self.spec.margin
+        doc = SimpleDocTemplate(
+            output,
+            pagesize=self.page_size,
+            leftMargin=margin,
+            rightMargin=margin,
+            topMargin=margin,
+            bottomMargin=margin,
+            pageCompression=1,
+            title=document["name"],
+        )
+        doc.build(self.bind(document))
+
+
+class PDFTemplateEngine:
+    """Process-wide registry of compiled templates"""
+
+    def __init__(self, templates: Dict[str, TemplateSpec] = TEMPLATES):
+        self._compiled = {name: CompiledTemplate(spec) for name, spec in templates.items()}
+
+    @property
+    def template_names(self) -> List[str]:
+        return list(self._compiled)
+
+    def get(self, name: str) -> CompiledTemplate:
+        try:
+            return self._compiled[name]
+        except KeyError:
+            raise ValueError(f"Unknown PDF template: {name}")
+
+    def render(self, document: Dict[str, Any], output: Union[str, BinaryIO], template: str = "classic") -> None:
+        self.get(template).render(document, output)
+
+
+_engine: Optional[PDFTemplateEngine] = None
+
+
+def get_template_engine() -> PDFTemplateEngine:
+    """Compile all templates on first use and reuse them for every render"""
+    global _engine
+    if _engine is None:
+        _engine = PDFTemplateEngine()
+    return _engine
+
+
+def resume_data_document(data: Any) -> Dict[str, Any]:
+    """Map a ResumeData into the engine's document shape"""
+    return {
+        "name": data.name,
+        "contact": [data.email, data.phone, data.address],
+        "sections": {
+            "experience": data.content.experience,
+            "education": data.content.education,
+            "skills": data.content.skills,
+        },
+    }
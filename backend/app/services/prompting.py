@@ -0,0 +1,179 @@
+import logging
+import math
+from functools import lru_cache
+from typing import Any, Callable, List, NamedTuple, Optional, Tuple
+from app.core.config import settings
+from app.core.metrics import LLM_PROMPT_TOKENS, LLM_PROMPT_TRIMMED
+
+logger = logging.getLogger(__name__)
+
+ELLIPSIS = " …"
+# Lists of short scalars (skills) are written inline when each item is at most this long
+INLINE_ITEM_CHARS = 40
+
+
+@lru_cache(maxsize=16)
+def _tiktoken_counter(model_name: str) -> Optional[Callable[[str], int]]:
+    if settings.LLM_TOKENIZER == "heuristic":
+        return None
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        encoding = tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        encoding = tiktoken.get_encoding("o200k_base")
+    return lambda text: len(encoding.encode(text, disallowed_special=()))
+
+
+def count_tokens(text: str, model_name: str = settings.LLM_ENHANCE_MODEL) -> int:
+    """Local token count: tiktoken when installed, otherwise ~4 chars per token"""
+    counter = _tiktoken_counter(model_name)
+    if counter is not None:
+        return counter(text)
+    return math.ceil(len(text) / 4)
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+
+def _label(key: Any) -> str:
+    return str(key).replace("_", " ")
+
+
+def encode_compact(value: Any, indent: str = "") -> List[str]:
+    """Render JSON-like data as indented ``label: value`` lines.
+
+    Empty fields are dropped, and there are no quotes, braces or escapes.
+    Lists of short scalars become one comma-separated line, and longer
+    items become ``-`` bullets.
+    """
+    lines: List[str] = []
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if _is_empty(item):
+                continue
+            if isinstance(item, (dict, list)):
+                nested = encode_compact(item, indent + "  ")
+                if not nested:
+                    # Every field inside was empty
+                    continue
+                if isinstance(item, list) and len(nested) == 1 and not nested[0].lstrip().startswith("-"):
+                    lines.append(f"{indent}{_label(key)}: {nested[0].strip()}")
+                else:
+                    lines.append(f"{indent}{_label(key)}:")
+                    lines.extend(nested)
+            else:
+                lines.append(f"{indent}{_label(key)}: {item}")
+    elif isinstance(value, list):
+        items = [item for item in value if not _is_empty(item)]
+        if items and all(
+            not isinstance(item, (dict, list)) and len(str(item)) <= INLINE_ITEM_CHARS for item in items
+        ):
+            lines.append(f"{indent}{', '.join(str(item) for item in items)}")
+        else:
+            for item in items:
+                if isinstance(item, (dict, list)):
+                    nested = encode_compact(item, indent + "  ")
+                    if not nested:
+                        continue
+                    lines.append(f"{indent}- {nested[0].strip()}")
+                    lines.extend(nested[1:])
+                else:
+                    lines.append(f"{indent}- {item}")
+    elif not _is_empty(value):
+        lines.append(f"{indent}{value}")
+    return lines
+
+
+def _truncate(text: str, max_tokens: int, model_name: str) -> str:
+    tokens = count_tokens(text, model_name)
+    if tokens <= max_tokens:
+        return text
+    # Cut proportionally at a word boundary; close enough for a budget
+    keep = max(int(len(text) * max_tokens / tokens), 1)
+    return text[:keep].rsplit(" ", 1)[0] + ELLIPSIS
+
+
+def _leaves(value: Any, path: Tuple = ()) -> List[Tuple[Tuple, str]]:
+    if isinstance(value, dict):
+        return [leaf for key, item in value.items() for leaf in _leaves(item, path + (key,))]
+    if isinstance(value, list):
+        return [leaf for i, item in enumerate(value) for leaf in _leaves(item, path + (i,))]
+    return [(path, value)] if isinstance(value, str) else []
+
+
+def _set(value: Any, path: Tuple, new: Any) -> None:
+    for key in path[:-1]:
+        value = value[key]
+    value[path[-1]] = new
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _copy(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy(v) for v in value]
+    return value
+
+
+def fit_to_budget(
+    data: Any, budget: int, model_name: str, field_limit: int = settings.LLM_PROMPT_FIELD_TOKEN_LIMIT
+) -> Tuple[Any, bool]:
+    """Trim ``data`` until its compact encoding fits ``budget`` tokens.
+
+    Any single text field is first capped at ``field_limit`` tokens. If the
+    document is still too large, the longest remaining field is halved
+    repeatedly. Returns ``(data, trimmed)``; the input is not modified.
+    """
+    trimmed = False
+    data = _copy(data)
+    for path, text in _leaves(data):
+        short = _truncate(text, field_limit, model_name)
+        if short != text:
+            _set(data, path, short)
+            trimmed = True
+
+    for _ in range(64):
+        if count_tokens("\n".join(encode_compact(data)), model_name) <= budget:
+            break
+        leaves = _leaves(data)
+        if not leaves:
+            break
+        path, text = max(leaves, key=lambda leaf: len(leaf[1]))
+        if len(text) <= 2 * len(ELLIPSIS):
+            break
+        _set(data, path, _truncate(text, max(count_tokens(text, model_name) // 2, 1), model_name))
+        trimmed = True
+    return data, trimmed
+
+
+class Prompt(NamedTuple):
+    text: str
+    tokens: int
+    trimmed: bool
+
+
+def build_prompt(
+    instruction: str,
+    data: Any,
+    model_name: str,
+    operation: str,
+    budget: int = settings.LLM_PROMPT_TOKEN_BUDGET,
+) -> Prompt:
+    """Fixed instruction first, variable payload last.
+
+    The system prompt lives on the agent and never changes, so together with
+    the fixed instruction every request starts with the same bytes. Providers
+    that cache prompt prefixes can then reuse it.
+    """
+    fitted, trimmed = fit_to_budget(data, budget, model_name)
+    text = f"{instruction}\n\n" + "\n".join(encode_compact(fitted))
+    tokens = count_tokens(text, model_name)
+    LLM_PROMPT_TOKENS.labels(model_name, operation).observe(tokens)
+    if trimmed:
+        LLM_PROMPT_TRIMMED.labels(model_name, operation).inc()
+        logger.info(f"Trimmed {operation} prompt to {tokens} tokens (budget {budget})")
+    return Prompt(text, tokens, trimmed)
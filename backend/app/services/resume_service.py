@@ -0,0 +1,114 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import Text, and_, cast, func, literal_column, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.resume_models import Resume
+from app.services.resume_versions import ResumeVersionService
+from app.utils.pagination import decode_cursor, encode_cursor
+
+
+class ResumeService:
+    """Persistence for a user's stored resumes; every write records a version"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.versions = ResumeVersionService(db)
+
+    async def create(self, user_id: int, content: Dict[str, Any]) -> Resume:
+        resume = Resume(user_id=user_id, content=content)
+        self.db.add(resume)
+        await self.db.flush()
+        await self.versions.record(resume.id, None, content)
+        await self.db.commit()
+        await self.db.refresh(resume)
+        return resume
+
+    async def get(self, user_id: int, resume_id: int) -> Optional[Resume]:
+        return await self.db.scalar(
+            select(Resume).where(Resume.id == resume_id, Resume.user_id == user_id)
+        )
+
+    async def update(self, resume: Resume, content: Dict[str, Any]) -> Resume:
+        await self.versions.record(resume.id, resume.content, content)
+        resume.content = content
+        await self.db.commit()
+        await self.db.refresh(resume)
+        return resume
+
+    async def delete(self, resume: Resume) -> None:
+        await self.db.delete(resume)
+        await self.db.commit()
+
+    async def list(
+        self, user_id: int, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Resume], Optional[str]]:
+        """Newest-first page of a user's resumes using keyset pagination.
+
+        The (user_id, created_at, id) index makes each page an index range
+        scan, so the cost per page does not grow with the user's history.
+        """
+        query = select(Resume).where(Resume.user_id == user_id)
+        if cursor:
+            created_at, resume_id = decode_cursor(cursor)
+            query = query.where(
+                tuple_(Resume.created_at, Resume.id)
+                < tuple_(datetime.fromisoformat(created_at), int(resume_id))
+            )
+        query = query.order_by(Resume.created_at.desc(), Resume.id.desc()).limit(limit + 1)
+
+        rows = list((await self.db.scalars(query)).all())
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].created_at, rows[-1].id)
+        return rows, next_cursor
+
+    async def search(
+        self, user_id: int, query: str, limit: int, cursor: Optional[str] = None
+    ) -> Tuple[List[Tuple[Resume, float, str]], Optional[str]]:
+        """Ranked full-text search over a user's resumes.
+
+        Matches come from the GIN index on (user_id, search_vector) and are
+        paged by (rank, id). Highlights are only computed for the returned page.
+        """
+        config = literal_column("'english'::regconfig")
+        tsquery = func.websearch_to_tsquery(config, query)
+        rank = func.ts_rank(Resume.search_vector, tsquery)
+
+        page = select(Resume.id.label("id"), rank.label("rank")).where(
+            Resume.user_id == user_id, Resume.search_vector.op("@@")(tsquery)
+        )
+        if cursor:
+            cursor_rank, cursor_id = decode_cursor(cursor)
+            page = page.where(
+                or_(
+                    rank < float(cursor_rank),
+                    and_(rank == float(cursor_rank), Resume.id < int(cursor_id)),
+                )
+            )
+        page = page.order_by(rank.desc(), Resume.id.desc()).limit(limit + 1).subquery()
+
+        # Highlight the string values of the document, not its JSON keys
+        text_values = cast(
+            func.jsonb_path_query_array(Resume.content, 'strict $.** ? (@.type() == "string")'),
+            Text,
+        )
+        highlight = func.ts_headline(
+            config,
+            text_values,
+            tsquery,
+            "MaxFragments=3, MinWords=5, MaxWords=20, StartSel=<mark>, StopSel=</mark>",
+        )
+        rows = (
+            await self.db.execute(
+                select(Resume, page.c.rank, highlight)
+                .join(page, Resume.id == page.c.id)
+                .order_by(page.c.rank.desc(), page.c.id.desc())
+            )
+        ).all()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][1], rows[-1][0].id)
+        return [(resume, rank_value, snippet) for resume, rank_value, snippet in rows], next_cursor
@@ -0,0 +1,131 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import json_codec
+from app.core.config import settings
+from app.models.resume_models import ResumeVersion
+from app.utils import json_diff
+
+
+class ResumeVersionService:
+    """Delta-compressed resume history.
+
+    Every ``snapshot_interval`` versions a full snapshot is stored; the
+    versions in between store only the diff against their predecessor, so
+    storage and write I/O per edit scale with the size of the change.
+    Reconstructing any version reads one snapshot plus at most
+    ``snapshot_interval - 1`` small deltas.
+
+    Methods only add to the session; the caller commits.
+    """
+
+    def __init__(self, db: AsyncSession, snapshot_interval: int = settings.RESUME_SNAPSHOT_INTERVAL):
+        self.db = db
+        self.snapshot_interval = snapshot_interval
+
+    async def _latest(self, resume_id: int, snapshots_only: bool = False) -> Optional[ResumeVersion]:
+        query = select(ResumeVersion).where(ResumeVersion.resume_id == resume_id)
+        if snapshots_only:
+            query = query.where(ResumeVersion.is_snapshot.is_(True))
+        return await self.db.scalar(query.order_by(ResumeVersion.version.desc()).limit(1))
+
+    async def record(
+        self, resume_id: int, previous: Optional[Dict[str, Any]], content: Dict[str, Any]
+    ) -> Optional[ResumeVersion]:
+        """Append a version for ``content``; ``previous`` is the prior live content"""
+        latest = await self._latest(resume_id)
+        if latest is None or previous is None:
+            return self._add(resume_id, 1 if latest is None else latest.version + 1, True, content)
+
+        ops = json_diff.diff(previous, content)
+        if not ops:
+            return None
+
+        version = latest.version + 1
+        snapshot = await self._latest(resume_id, snapshots_only=True)
+        chain_length = version - (snapshot.version if snapshot else 0)
+        # A diff that is nearly as large as the document buys nothing
+        too_large = len(json_codec.dumps_bytes(ops)) * 2 > len(json_codec.dumps_bytes(content))
+        if chain_length >= self.snapshot_interval or too_large:
+            return self._add(resume_id, version, True, content)
+        return self._add(resume_id, version, False, ops)
+
+    def _add(self, resume_id: int, version: int, is_snapshot: bool, data: Any) -> ResumeVersion:
+        entry = ResumeVersion(resume_id=resume_id, version=version, is_snapshot=is_snapshot, data=data)
+        self.db.add(entry)
+        return entry
+
+    async def list(self, resume_id: int) -> List[ResumeVersion]:
+        result = await self.db.scalars(
+            select(ResumeVersion)
+            .where(ResumeVersion.resume_id == resume_id)
+            .order_by(ResumeVersion.version.desc())
+        )
+        return list(result.all())
+
+    async def reconstruct(self, resume_id: int, version: int) -> Optional[Dict[str, Any]]:
+        """Content at ``version``: nearest snapshot at or before it plus deltas"""
+        base = await self.db.scalar(
+            select(func.max(ResumeVersion.version)).where(
+                ResumeVersion.resume_id == resume_id,
+                ResumeVersion.is_snapshot.is_(True),
+                ResumeVersion.version <= version,
+            )
+        )
+        if base is None:
+            return None
+        chain = (
+            await self.db.scalars(
+                select(ResumeVersion)
+                .where(
+                    ResumeVersion.resume_id == resume_id,
+                    ResumeVersion.version >= base,
+                    ResumeVersion.version <= version,
+                )
+                .order_by(ResumeVersion.version)
+            )
+        ).all()
+        if not chain or chain[-1].version != version:
+            return None
+
+        content = chain[0].data
+        for entry in chain[1:]:
+            content = entry.data if entry.is_snapshot else json_diff.apply(content, entry.data)
+        return content
+
+    async def diff(self, resume_id: int, from_version: int, to_version: int) -> Optional[List[Dict[str, Any]]]:
+        old = await self.reconstruct(resume_id, from_version)
+        new = await self.reconstruct(resume_id, to_version)
+        if old is None or new is None:
+            return None
+        return json_diff.diff(old, new)
+
+    async def compact(self, resume_id: int, keep_last: int = settings.RESUME_VERSION_KEEP_LAST) -> int:
+        """Drop the deltas older than the newest ``keep_last`` versions.
+
+        Older snapshots are kept as sparse history. The oldest retained
+        version is rewritten as a snapshot first so it stays reconstructable.
+        Returns the number of versions removed.
+        """
+        latest = await self._latest(resume_id)
+        if latest is None or latest.version <= keep_last:
+            return 0
+        boundary = latest.version - keep_last + 1
+
+        first_kept = await self.db.scalar(
+            select(ResumeVersion).where(
+                ResumeVersion.resume_id == resume_id, ResumeVersion.version == boundary
+            )
+        )
+        if first_kept is not None and not first_kept.is_snapshot:
+            first_kept.data = await self.reconstruct(resume_id, boundary)
+            first_kept.is_snapshot = True
+
+        result = await self.db.execute(
+            delete(ResumeVersion).where(
+                ResumeVersion.resume_id == resume_id,
+                ResumeVersion.version < boundary,
+                ResumeVersion.is_snapshot.is_(False),
+            )
+        )
+        return result.rowcount
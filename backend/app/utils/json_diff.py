@@ -0,0 +1,96 @@
+import copy
+from typing import Any, Dict, List
+
+# Structural JSON diffs as a list of RFC 6902 style operations
+# ({"op": "add" | "remove" | "replace", "path": "/a/0", "value": ...}).
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Operations that turn ``old`` into ``new``; their size tracks the change"""
+    if type(old) is not type(new):
+        return [{"op": "replace", "path": path, "value": new}]
+
+    if isinstance(old, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, child))
+        return ops
+
+    if isinstance(old, list):
+        return _diff_list(old, new, path)
+
+    return [] if old == new else [{"op": "replace", "path": path, "value": new}]
+
+
+def _diff_list(old: List[Any], new: List[Any], path: str) -> List[Dict[str, Any]]:
+    # Keep the common prefix and suffix; only the middle differs
+    prefix = 0
+    while prefix < len(old) and prefix < len(new) and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < len(old) - prefix
+        and suffix < len(new) - prefix
+        and old[-1 - suffix] == new[-1 - suffix]
+    ):
+        suffix += 1
+
+    old_mid = old[prefix:len(old) - suffix]
+    new_mid = new[prefix:len(new) - suffix]
+    ops: List[Dict[str, Any]] = []
+    if len(old_mid) == len(new_mid):
+        # Edited in place: recurse element by element
+        for offset, (a, b) in enumerate(zip(old_mid, new_mid)):
+            ops.extend(diff(a, b, f"{path}/{prefix + offset}"))
+        return ops
+
+    for index in reversed(range(prefix, prefix + len(old_mid))):
+        ops.append({"op": "remove", "path": f"{path}/{index}"})
+    for offset, value in enumerate(new_mid):
+        ops.append({"op": "add", "path": f"{path}/{prefix + offset}", "value": value})
+    return ops
+
+
+def apply(document: Any, ops: List[Dict[str, Any]]) -> Any:
+    """Return a copy of ``document`` with ``ops`` applied"""
+    result = copy.deepcopy(document)
+    for op in ops:
+        tokens = [_unescape(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            result = copy.deepcopy(op.get("value"))
+            continue
+
+        parent = result
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+
+        last = tokens[-1]
+        if isinstance(parent, list):
+            index = int(last)
+            if op["op"] == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del parent[index]
+            else:
+                parent[index] = copy.deepcopy(op["value"])
+        else:
+            if op["op"] == "remove":
+                del parent[last]
+            else:
+                parent[last] = copy.deepcopy(op["value"])
+    return result
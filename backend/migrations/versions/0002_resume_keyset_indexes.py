@@ -0,0 +1,68 @@
+"""Resume keyset pagination index and JSONB content
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'resumes',
+        'content',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        postgresql_using='content::jsonb',
+    )
+
+    # Keyset pagination needs a total order on (created_at, id)
+    op.execute("UPDATE resumes SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column(
+        'resumes',
+        'created_at',
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text('now()'),
+        nullable=False,
+    )
+
+    # Leads with user_id, so it also serves the foreign key lookups.
+    # Built concurrently so large tables stay writable meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_resumes_user_id_created_at_id',
+            'resumes',
+            ['user_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resumes_user_id_created_at_id', table_name='resumes')
+    op.alter_column(
+        'resumes',
+        'created_at',
+        existing_type=sa.DateTime(timezone=True),
+        existing_server_default=sa.text('now()'),
+        nullable=True,
+    )
+    op.alter_column(
+        'resumes',
+        'content',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        postgresql_using='content::json',
+    )
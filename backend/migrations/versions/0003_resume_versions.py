@@ -0,0 +1,45 @@
+"""Delta-compressed resume version history
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'resume_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('resume_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('is_snapshot', sa.Boolean(), nullable=False),
+        sa.Column('data', postgresql.JSONB(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        # Its index serves snapshot lookups and ordered chain reads
+        sa.UniqueConstraint('resume_id', 'version', name='uq_resume_versions_resume_id_version'),
+    )
+
+    # Existing resumes start their history with a snapshot of the current content
+    op.execute(
+        "INSERT INTO resume_versions (resume_id, version, is_snapshot, data) "
+        "SELECT id, 1, true, content FROM resumes WHERE content IS NOT NULL"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('resume_versions')
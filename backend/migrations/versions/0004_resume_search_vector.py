@@ -0,0 +1,80 @@
+"""Full-text search vector on resumes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR = """jsonb_to_tsvector('english'::regconfig, coalesce({content}, '{{}}'::jsonb), '["string"]'::jsonb)"""
+BACKFILL_BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    # Lets user_id share the GIN index with the search vector (trusted since PG 13)
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    # A GENERATED ... STORED column would rewrite the whole table under an
+    # ACCESS EXCLUSIVE lock. A nullable column without a default is a
+    # catalog-only change; a trigger keeps it current from here on and the
+    # existing rows are backfilled in batches below.
+    op.add_column('resumes', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+    op.execute(
+        f"""
+        CREATE FUNCTION resumes_search_vector_update() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            NEW.search_vector := {SEARCH_VECTOR.format(content="NEW.content")};
+            RETURN NEW;
+        END
+        $$
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER resumes_search_vector_update
+        BEFORE INSERT OR UPDATE OF content ON resumes
+        FOR EACH ROW EXECUTE FUNCTION resumes_search_vector_update()
+        """
+    )
+
+    with op.get_context().autocommit_block():
+        # Each batch commits on its own, so row locks are short-lived
+        connection = op.get_bind()
+        max_id = connection.scalar(sa.text("SELECT max(id) FROM resumes")) or 0
+        for start in range(0, max_id, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(
+                    f"UPDATE resumes SET search_vector = {SEARCH_VECTOR.format(content='content')} "
+                    "WHERE id > :start AND id <= :end AND search_vector IS NULL"
+                ),
+                {"start": start, "end": start + BACKFILL_BATCH_SIZE},
+            )
+
+        op.create_index(
+            'ix_resumes_user_id_search_vector',
+            'resumes',
+            ['user_id', 'search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_resumes_user_id_search_vector', table_name='resumes')
+    op.execute("DROP TRIGGER resumes_search_vector_update ON resumes")
+    op.execute("DROP FUNCTION resumes_search_vector_update()")
+    op.drop_column('resumes', 'search_vector')
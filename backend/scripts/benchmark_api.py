@@ -0,0 +1,321 @@
+"""Load and latency benchmark for the API with Google, the LLM provider and
+Postgres replaced by local stand-ins.
+
+The app is built with ``get_application`` and driven in-process through
+httpx's ASGI transport, with the lifespan run explicitly. A throwaway
+database is created on the configured Postgres server, migrated to head and
+dropped afterwards.
+
+    python scripts/benchmark_api.py --duration 15 --concurrency 32 --save baseline.json
+    python scripts/benchmark_api.py --compare baseline.json
+
+Client and server share one event loop, so absolute numbers are a lower bound
+on a real deployment; compare runs made on the same machine.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the parent directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+SCENARIOS = ("health", "enhance", "callback", "pdf")
+
+SAMPLE_RESUME = {
+    "name": "Jane Doe",
+    "email": "jane.doe@example.com",
+    "phone": "+1 555 0100",
+    "address": "Seattle, WA",
+    "content": {
+        "education": ["BSc Computer Science, University of Washington"],
+        "experience": [f"Senior Engineer at Company {i}: shipped async APIs" for i in range(6)],
+        "skills": ["Python", "FastAPI", "PostgreSQL", "Redis", "Docker"],
+    },
+}
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class LoopLagMonitor:
+    """Samples how late the event loop wakes a task that sleeps ``interval``"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(time.perf_counter() - start - self.interval, 0.0))
+
+    def start(self) -> None:
+        self.samples = []
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+
+def build_requests(users: int) -> Dict[str, Callable[[int], Tuple[str, str, Dict[str, Any]]]]:
+    def auth(i: int) -> Dict[str, str]:
+        return {"Authorization": f"Bearer bench-user-{i % users}"}
+
+    return {
+        "health": lambda i: ("GET", "/", {}),
+        "enhance": lambda i: (
+            "POST",
+            "/resumes/enhance",
+            # Distinct payloads so every request reaches the (fake) model
+            {"json": {"content": {**SAMPLE_RESUME["content"], "request": i}}, "headers": auth(i)},
+        ),
+        "callback": lambda i: ("GET", "/auth/callback", {"params": {"code": f"bench-code-{i % users}"}}),
+        "pdf": lambda i: ("POST", "/generate-pdf", {"json": SAMPLE_RESUME, "headers": auth(i)}),
+    }
+
+
+async def run_scenario(client, make_request, duration: float, concurrency: int, warmup: float) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    counter = iter(range(10**9))
+    monitor = LoopLagMonitor()
+
+    async def worker(deadline: float, record: bool) -> None:
+        while time.perf_counter() < deadline:
+            method, url, kwargs = make_request(next(counter))
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, url, **kwargs)
+                status = str(response.status_code)
+            except Exception as e:
+                status = type(e).__name__
+            if record:
+                latencies.append(time.perf_counter() - start)
+                statuses[status] = statuses.get(status, 0) + 1
+
+    if warmup:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(deadline, False) for _ in range(concurrency)))
+
+    monitor.start()
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(deadline, True) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    await monitor.stop()
+    ok = sum(count for status, count in statuses.items() if status.startswith("2"))
+
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": max(latencies, default=0.0) * 1000,
+        "statuses": statuses,
+        "error_rate": 1 - ok / len(latencies) if latencies else 0.0,
+        "loop_lag_p50_ms": percentile(monitor.samples, 0.50) * 1000,
+        "loop_lag_p99_ms": percentile(monitor.samples, 0.99) * 1000,
+        "loop_lag_max_ms": max(monitor.samples, default=0.0) * 1000,
+    }
+
+
+async def _admin_execute(statement: str) -> None:
+    import asyncpg
+    from app.core.config import settings
+
+    connection = await asyncpg.connect(
+        user=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        database="postgres",
+    )
+    try:
+        await connection.execute(statement)
+    finally:
+        await connection.close()
+
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    from scripts.benchmark_fakes import FakeLatency, install
+
+    install(FakeLatency(
+        google=args.google_latency,
+        llm=args.llm_latency,
+        llm_jitter=args.llm_jitter,
+        llm_error_rate=args.llm_error_rate,
+    ))
+
+    from app.main import get_application
+
+    app = get_application()
+    results: Dict[str, Any] = {}
+    requests = build_requests(args.users)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for name in args.scenarios:
+                print(f"Running {name} for {args.duration}s at concurrency {args.concurrency}...")
+                results[name] = await run_scenario(
+                    client, requests[name], args.duration, args.concurrency, args.warmup
+                )
+    return results
+
+
+def print_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> None:
+    header = f"{'scenario':<10}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'lag p99':>10}  statuses"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<10}{r['rps']:>10.1f}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}"
+            f"{r['p99_ms']:>10.1f}{r['loop_lag_p99_ms']:>10.1f}  {r['statuses']}"
+        )
+        if baseline and name in baseline:
+            base = baseline[name]
+            deltas = [
+                f"{key} {(r[key] - base[key]) / base[key] * 100:+.1f}%"
+                for key in ("rps", "p50_ms", "p99_ms")
+                if base[key]
+            ]
+            print(f"{'':<10}vs baseline: {', '.join(deltas)}")
+
+
+def regressions(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    found = []
+    for name, r in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if base["rps"] and r["rps"] < base["rps"] * (1 - tolerance):
+            found.append(f"{name}: rps {base['rps']:.1f} -> {r['rps']:.1f}")
+        if base["p99_ms"] and r["p99_ms"] > base["p99_ms"] * (1 + tolerance):
+            found.append(f"{name}: p99 {base['p99_ms']:.1f}ms -> {r['p99_ms']:.1f}ms")
+    return found
+
+
+def failed_scenarios(results: Dict[str, Any], max_error_rate: float) -> List[str]:
+    """Scenarios whose share of non-2xx responses means the numbers measure failures"""
+    return [
+        f"{name}: {r['error_rate']:.1%} of requests failed {r['statuses']}"
+        for name, r in results.items()
+        if r["error_rate"] > max_error_rate
+    ]
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=backend_dir, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help="Comma-separated subset of " + ", ".join(SCENARIOS))
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds per scenario")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--users", type=int, default=50, help="Distinct fake Google accounts")
+    parser.add_argument("--google-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Extra random LLM delay, up to N seconds")
+    parser.add_argument("--llm-error-rate", type=float, default=0.0, help="Fraction of LLM calls that fail")
+    parser.add_argument("--cache", action="store_true", help="Keep the enhancement result cache enabled")
+    parser.add_argument("--keep-db", action="store_true", help="Do not drop the benchmark database")
+    parser.add_argument("--save", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed regression vs baseline")
+    parser.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=0.01,
+        help="Fail when a scenario has more non-2xx responses than this (raise it with --llm-error-rate)",
+    )
+    args = parser.parse_args()
+    args.scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"Unknown scenarios: {sorted(unknown)}")
+
+    # Settings are read at import time, so configure before importing the app
+    database = f"resume_bench_{uuid.uuid4().hex[:8]}"
+    os.environ["POSTGRES_DB"] = database
+    os.environ.pop("DATABASE_URL", None)
+    os.environ["RATE_LIMIT_ENABLED"] = "false"
+    os.environ["ENHANCE_CACHE_ENABLED"] = "true" if args.cache else "false"
+    os.environ["ENHANCE_CACHE_PERSISTENT"] = "false"
+    os.environ["JOB_BACKEND"] = "memory"
+    pdf_output_dir = tempfile.TemporaryDirectory(prefix="resume_bench_")
+    os.environ["PDF_OUTPUT_DIR"] = pdf_output_dir.name
+    for key, value in {
+        "GOOGLE_CLIENT_ID": "bench-client",
+        "GOOGLE_CLIENT_SECRET": "bench-secret",
+        "OPENAI_API_KEY": "bench-key",
+        "SECRET_KEY": "bench-secret-key",
+    }.items():
+        os.environ.setdefault(key, value)
+
+    asyncio.run(_admin_execute(f'CREATE DATABASE "{database}"'))
+    try:
+        subprocess.run([sys.executable, "-m", "alembic", "upgrade", "head"], cwd=backend_dir, check=True)
+        results = asyncio.run(benchmark(args))
+    finally:
+        pdf_output_dir.cleanup()
+        if not args.keep_db:
+            asyncio.run(_admin_execute(f'DROP DATABASE IF EXISTS "{database}" WITH (FORCE)'))
+
+    baseline = None
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())["results"]
+    print_results(results, baseline)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps({
+            "revision": git_revision(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "params": {
+                key: getattr(args, key)
+                for key in ("duration", "warmup", "concurrency", "users", "google_latency", "llm_latency", "llm_jitter", "llm_error_rate", "cache")
+            },
+            "results": results,
+        }, indent=2))
+        print(f"Saved baseline to {args.save}")
+
+    failed = failed_scenarios(results, args.max_error_rate)
+    for line in failed:
+        print(f"FAILED {line}")
+    found = regressions(results, baseline, args.tolerance) if baseline else []
+    for line in found:
+        print(f"REGRESSION {line}")
+    return 1 if failed or found else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Deterministic local stand-ins for Google and the LLM provider.
+
+Each fake sleeps for a configurable latency instead of doing network I/O, so
+benchmark runs measure this service rather than third-party jitter. Import
+only after the benchmark has set up its environment; ``install`` patches the
+already-imported app modules in place.
+"""
+import asyncio
+import hashlib
+import json
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict
+import httpx
+
+
+@dataclass
+class FakeLatency:
+    google: float = 0.05  # Token exchange and ID token verification
+    llm: float = 0.5  # Whole model call
+    llm_first_token: float = 0.1  # Streaming: delay before the first delta
+    llm_jitter: float = 0.0  # Extra uniform random delay, up to this many seconds
+    llm_error_rate: float = 0.0  # Fraction of model calls that raise
+    # Per-model overrides (keyed by "provider:model"), for exercising the LLM router
+    llm_models: Dict[str, "FakeLatency"] = field(default_factory=dict)
+
+
+class FakeProviderError(Exception):
+    """Injected model failure"""
+
+
+def fake_email(seed: str) -> str:
+    return f"bench-{hashlib.sha1(seed.encode()).hexdigest()[:10]}@example.com"
+
+
+class FakeGoogleVerifier:
+    """Accepts any bearer token; the email is derived from the token"""
+
+    def __init__(self, latency: FakeLatency):
+        self.latency = latency
+
+    async def start(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    async def verify(self, token: str) -> Dict[str, Any]:
+        await asyncio.sleep(self.latency.google)
+        return {"email": fake_email(token), "sub": token, "email_verified": True, "name": "Bench User"}
+
+
+def google_oauth_transport(latency: FakeLatency) -> httpx.MockTransport:
+    """Google's token endpoint, keyed off the authorization code.
+
+    The returned ``id_token`` is the code itself, which the fake verifier
+    accepts and maps to a stable fake account.
+    """
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency.google)
+        if request.url.path.endswith("/token"):
+            code = dict(httpx.QueryParams(request.content.decode()))["code"]
+            return httpx.Response(
+                200,
+                json={"access_token": code, "id_token": code, "token_type": "Bearer", "expires_in": 3600},
+            )
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+class _FakeUsage:
+    def __init__(self, request_tokens: int, response_tokens: int):
+        self.request_tokens = request_tokens
+        self.response_tokens = response_tokens
+
+
+class _FakeRunResult:
+    def __init__(self, data: Any, prompt: str):
+        self.data = data
+        self._usage = _FakeUsage(len(prompt) // 4, len(str(data)) // 4)
+
+    def usage(self) -> _FakeUsage:
+        return self._usage
+
+
+class _FakeStreamResult(_FakeRunResult):
+    def __init__(self, data: str, prompt: str, latency: FakeLatency):
+        super().__init__(data, prompt)
+        self.latency = latency
+
+    async def stream_text(self, delta: bool = False):
+        words = self.data.split(" ")
+        per_word = max(self.latency.llm - self.latency.llm_first_token, 0) / len(words)
+        await asyncio.sleep(self.latency.llm_first_token)
+        for word in words:
+            await asyncio.sleep(per_word)
+            yield word + " "
+
+
+class _FakeStream:
+    def __init__(self, result: _FakeStreamResult):
+        self.result = result
+
+    async def __aenter__(self) -> _FakeStreamResult:
+        return self.result
+
+    async def __aexit__(self, *exc: Any) -> None:
+        return None
+
+
+class FakeAgent:
+    """Mimics the slice of the pydantic_ai Agent API the services use"""
+
+    def __init__(self, model_name: str, system_prompt: str, latency: FakeLatency):
+        self.model_name = model_name
+        self.system_prompt = system_prompt
+        self.latency = latency
+        self.random = random.Random(model_name)
+
+    async def _delay(self) -> None:
+        if self.random.random() < self.latency.llm_error_rate:
+            await asyncio.sleep(self.latency.llm_first_token)
+            raise FakeProviderError(f"Injected failure from {self.model_name}")
+        await asyncio.sleep(self.latency.llm + self.random.uniform(0, self.latency.llm_jitter))
+
+    def _answer(self, prompt: str) -> str:
+        if "JSON array" in self.system_prompt:
+            # Per-section generation prompts
+            return json.dumps(["Entry one with measurable impact", "Entry two"])
+        if '"education"' in self.system_prompt:
+            return json.dumps({
+                "education": ["BSc Computer Science"],
+                "experience": ["Built APIs serving millions of requests per day"],
+                "skills": ["Python", "FastAPI", "PostgreSQL"],
+            })
+        return "Enhanced resume: " + " ".join(["Improved impact statement."] * 40)
+
+    async def run(self, prompt: str) -> _FakeRunResult:
+        await self._delay()
+        return _FakeRunResult(self._answer(prompt), prompt)
+
+    def run_stream(self, prompt: str) -> _FakeStream:
+        if self.random.random() < self.latency.llm_error_rate:
+            raise FakeProviderError(f"Injected failure from {self.model_name}")
+        return _FakeStream(_FakeStreamResult(self._answer(prompt), prompt, self.latency))
+
+
+def install(latency: FakeLatency) -> None:
+    """Swap Google and the LLM provider for the fakes in the imported app"""
+    from app.core import google_verifier
+    from app.services import llm_registry
+
+    verifier = FakeGoogleVerifier(latency)
+    for name in ("start", "close", "verify"):
+        setattr(google_verifier.google_token_verifier, name, getattr(verifier, name))
+
+    # The lifespan builds the shared Google client with this factory; must be
+    # patched before app.main imports it
+    transport = google_oauth_transport(latency)
+    google_verifier.create_google_http_client = lambda: httpx.AsyncClient(transport=transport)
+
+    def agent(self, model_name: str, system_prompt: str) -> FakeAgent:
+        return FakeAgent(model_name, system_prompt, latency.llm_models.get(model_name, latency))
+
+    llm_registry.AgentRegistry.agent = agent
@@ -0,0 +1,116 @@
+"""Fail when importing app.main gets slower than the startup budget.
+
+Runs ``python -X importtime -c "import app.main"`` in fresh interpreters and
+takes the fastest run. The check fails when the cumulative import time is
+over budget, or when a subsystem that should load lazily (LLM SDKs,
+reportlab, numpy, google.auth, database drivers) is imported eagerly.
+
+    python scripts/check_import_time.py --budget-ms 500 --top 15
+"""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+backend_dir = Path(__file__).resolve().parent.parent
+
+DEFAULT_BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 500))
+
+# Loaded in the lifespan or on first use, never by importing the app
+LAZY_MODULES = (
+    "pydantic_ai",
+    "openai",
+    "anthropic",
+    "groq",
+    "mistralai",
+    "reportlab",
+    "numpy",
+    "google.auth",
+    "asyncpg",
+    "psycopg2",
+)
+
+
+def measure_once() -> Tuple[int, Dict[str, int]]:
+    """Cumulative microseconds for app.main, and for every imported module"""
+    env = dict(os.environ)
+    # Settings without defaults; values are irrelevant to import cost
+    for key in (
+        "GOOGLE_CLIENT_ID",
+        "GOOGLE_CLIENT_SECRET",
+        "OPENAI_API_KEY",
+        "POSTGRES_USER",
+        "POSTGRES_PASSWORD",
+        "SECRET_KEY",
+    ):
+        env.setdefault(key, "import-check")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=backend_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import app.main failed:\n{result.stderr[-2000:]}")
+
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+    return modules["app.main"], modules
+
+
+def measure(runs: int) -> Tuple[float, Dict[str, int]]:
+    """Fastest of ``runs`` fresh imports: (milliseconds, per-module microseconds)"""
+    total_us, modules = min((measure_once() for _ in range(runs)), key=lambda run: run[0])
+    return total_us / 1000, modules
+
+
+def eager_lazy_modules(modules: Dict[str, int]) -> List[str]:
+    return sorted(
+        name for name in modules
+        if any(name == lazy or name.startswith(lazy + ".") for lazy in LAZY_MODULES)
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help="Maximum cumulative import time of app.main",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to try; the fastest counts")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest top-level imports")
+    args = parser.parse_args()
+
+    total_ms, modules = measure(args.runs)
+
+    top_level = sorted(
+        ((name, us) for name, us in modules.items() if "." not in name and name != "app"),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    print(f"import app.main: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, us in top_level[:args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failed = False
+    eager = eager_lazy_modules(modules)
+    if eager:
+        failed = True
+        print(f"FAIL: lazily loaded subsystems imported eagerly: {', '.join(eager[:10])}")
+    if total_ms > args.budget_ms:
+        failed = True
+        print(f"FAIL: import time {total_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
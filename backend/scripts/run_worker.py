@@ -0,0 +1,46 @@
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add the parent directory to Python path
+backend_dir = Path(__file__).resolve().parent.parent
+sys.path.append(str(backend_dir))
+
+from app.core.config import settings
+from app.jobs.handlers import JOB_HANDLERS
+from app.jobs.queue import JobQueue, RedisJobBackend
+from app.services.ai_enhancement import ResumeEnhancementService
+from app.services.ai_service import AIService
+from app.services.llm_registry import AgentRegistry
+from app.services.pdf_executor import PDFRenderExecutor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def run_worker() -> None:
+    """Process jobs from the shared Redis queue, independently of the API nodes"""
+    registry = AgentRegistry()
+    pdf_executor = PDFRenderExecutor()
+    await pdf_executor.start()
+    queue = JobQueue(
+        RedisJobBackend(),
+        JOB_HANDLERS,
+        context={
+            "enhancement_service": ResumeEnhancementService(registry),
+            "ai_service": AIService(registry),
+            "pdf_executor": pdf_executor,
+        },
+    )
+    logger.info(f"Starting {settings.JOB_WORKERS} job workers")
+    try:
+        await queue.run_forever(settings.JOB_WORKERS)
+    finally:
+        await queue.close()
+        await pdf_executor.close()
+        await registry.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())
@@ -0,0 +1,17 @@
+import os
+import sys
+from pathlib import Path
+
+# Make `app` importable when pytest runs from the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings without defaults; tests never talk to these services
+for key in (
+    "GOOGLE_CLIENT_ID",
+    "GOOGLE_CLIENT_SECRET",
+    "OPENAI_API_KEY",
+    "POSTGRES_USER",
+    "POSTGRES_PASSWORD",
+    "SECRET_KEY",
+):
+    os.environ.setdefault(key, "test")
@@ -0,0 +1,93 @@
+import asyncio
+import time
+import pytest
+from app.core.config import settings
+from app.services.ai_service import SECTIONS, AIService
+from app.services.llm_router import LLMRouter
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+    def usage(self):
+        return None
+
+
+class ScriptedAgent:
+    """Plays back ``outcomes`` in turn: a delay in seconds, then data or an exception"""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = []
+        self.cancelled = False
+
+    async def run(self, prompt):
+        self.calls.append(time.monotonic())
+        delay, outcome = self.outcomes.pop(0)
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResult(outcome)
+
+
+def make_service(agents) -> AIService:
+    service = AIService.__new__(AIService)
+    service.model_name = "fake"
+    service.section_agents = {
+        section: LLMRouter([("fake", agent)], hedge=False) for section, agent in zip(SECTIONS, agents)
+    }
+    return service
+
+
+@pytest.fixture
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_SECTION_RETRIES", 1)
+    monkeypatch.setattr(settings, "LLM_SECTION_RETRY_BACKOFF", 0.05)
+
+
+def test_failed_section_cancels_the_others(fast_retries):
+    failing = ScriptedAgent((0, RuntimeError("boom")), (0, RuntimeError("boom again")))
+    slow = [ScriptedAgent((5, '["x"]')) for _ in range(2)]
+    service = make_service([failing, *slow])
+
+    start = time.monotonic()
+    with pytest.raises(RuntimeError, match="boom again"):
+        asyncio.run(service._generate_sections("description"))
+
+    assert time.monotonic() - start < 1
+    assert all(agent.cancelled for agent in slow)
+
+
+def test_section_retry_waits_for_backoff(fast_retries):
+    flaky = ScriptedAgent((0, "no array here"), (0, '["BSc"]'))
+    others = [ScriptedAgent((0, '["x"]')) for _ in range(2)]
+    service = make_service([flaky, *others])
+
+    content = asyncio.run(service._generate_sections("description"))
+
+    assert content.education == ["BSc"]
+    assert flaky.calls[1] - flaky.calls[0] >= 0.05
+
+
+def test_section_metrics_are_labelled_with_the_answering_model(fast_retries):
+    from prometheus_client import REGISTRY
+
+    def latency_count(model):
+        labels = {"model": model, "operation": "generate_education", "outcome": "ok"}
+        return REGISTRY.get_sample_value("llm_request_duration_seconds_count", labels) or 0.0
+
+    service = make_service([ScriptedAgent((0, '["x"]')) for _ in SECTIONS])
+    service.section_agents["education"] = LLMRouter(
+        [("primary", ScriptedAgent((0, RuntimeError("down")))), ("fallback", ScriptedAgent((0, '["BSc"]')))],
+        hedge=False,
+    )
+    before = latency_count("fallback"), latency_count("fake")
+
+    asyncio.run(service._generate_sections("description"))
+
+    assert (latency_count("fallback"), latency_count("fake")) == (before[0] + 1, before[1])
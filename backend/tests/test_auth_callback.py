@@ -0,0 +1,110 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+from app.api.deps import get_google_http_client
+from app.api.endpoints import auth_endpoints
+from app.core.config import settings
+from app.core.google_verifier import GoogleTokenVerifier
+from app.db.async_session import get_async_db
+from tests.test_google_verifier import AUDIENCE, LocalKey
+
+TOKEN_URL = "https://oauth.test/token"
+JWKS_URL = "https://oauth.test/certs"
+
+
+class StubGoogle:
+    """Local stand-in for Google's token and key endpoints; records every request"""
+
+    def __init__(self, key: LocalKey, id_token: str):
+        self.key = key
+        self.id_token = id_token
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.method, str(request.url)))
+        if str(request.url) == TOKEN_URL and request.method == "POST":
+            return httpx.Response(200, json={"access_token": "ya29.x", "id_token": self.id_token})
+        if str(request.url) == JWKS_URL:
+            return httpx.Response(200, json={"keys": [self.key.jwk]}, headers={"Cache-Control": "max-age=3600"})
+        return httpx.Response(404)
+
+
+class RecordingSession:
+    """Just enough AsyncSession for get_or_create on an empty users table"""
+
+    def __init__(self):
+        self.added = []
+
+    async def scalar(self, query):
+        return None
+
+    def add(self, instance):
+        instance.id = len(self.added) + 1
+        self.added.append(instance)
+
+    async def commit(self):
+        pass
+
+    async def refresh(self, instance):
+        pass
+
+
+@pytest.fixture(scope="module")
+def key():
+    return LocalKey("k1")
+
+
+def login(monkeypatch, key, id_token):
+    google = StubGoogle(key, id_token)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(google))
+    monkeypatch.setattr(settings, "GOOGLE_TOKEN_URL", TOKEN_URL)
+    monkeypatch.setattr(
+        auth_endpoints,
+        "google_token_verifier",
+        GoogleTokenVerifier(AUDIENCE, jwks_url=JWKS_URL, http_client=client),
+    )
+    session = RecordingSession()
+    app = FastAPI()
+    app.include_router(auth_endpoints.router, prefix="/auth")
+    app.dependency_overrides[get_google_http_client] = lambda: client
+    app.dependency_overrides[get_async_db] = lambda: session
+    response = TestClient(app).get("/auth/callback", params={"code": "auth-code"})
+    return response, google, session
+
+
+def test_login_creates_user_from_id_token_in_one_round_trip(monkeypatch, key):
+    id_token = key.sign(sub="g-42", email="ada@example.com", name="Ada Lovelace", picture="https://pic.test/a")
+
+    response, google, session = login(monkeypatch, key, id_token)
+
+    assert response.status_code == 200
+    assert [r for r in google.requests if r[1] != JWKS_URL] == [("POST", TOKEN_URL)]
+    [user] = session.added
+    assert (user.email, user.google_id, user.full_name, user.picture) == (
+        "ada@example.com", "g-42", "Ada Lovelace", "https://pic.test/a"
+    )
+    claims = jwt.decode(response.json()["access_token"], settings.SECRET_KEY, algorithms=["HS256"])
+    assert claims["sub"] == "ada@example.com" and claims["uid"] == user.id
+
+
+def test_invalid_id_token_is_rejected(monkeypatch, key):
+    forged = LocalKey("k1").sign(email="mallory@example.com")  # right kid, wrong key
+
+    response, _, session = login(monkeypatch, key, forged)
+
+    assert response.status_code == 401
+    assert session.added == []
+
+
+def test_verifier_shares_but_does_not_close_the_lifespan_pool():
+    import asyncio
+
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(404)))
+    verifier = GoogleTokenVerifier(AUDIENCE, jwks_url=JWKS_URL)
+    verifier.use_http_client(shared)
+
+    asyncio.run(verifier.close())
+
+    assert verifier.http_client is shared and not shared.is_closed
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from jose import jwt
+from app.api.deps import get_current_user
+from app.api.endpoints import admin_endpoints, auth_endpoints
+from app.core.config import settings
+from app.core.revocation import revocation_list
+from app.core.security import create_token_pair
+from app.db.async_session import get_async_db
+from app.models.user import User
+
+CLAIMS = {"sub": "ada@example.com", "uid": 1, "full_name": "Ada"}
+
+
+def test_access_token_authenticates_statelessly(monkeypatch):
+    monkeypatch.setattr(settings, "STATELESS_SESSIONS", True)
+    access_token, _ = create_token_pair(CLAIMS)
+    user = asyncio.run(get_current_user(token=access_token, db=None))
+    assert user.id == 1 and user.email == "ada@example.com"
+
+
+def test_refresh_token_is_not_a_bearer_token(monkeypatch):
+    monkeypatch.setattr(settings, "STATELESS_SESSIONS", True)
+    _, refresh_token = create_token_pair(CLAIMS)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_user(token=refresh_token, db=None))
+    assert exc.value.status_code == 401
+
+
+def test_refresh_tokens_are_individually_revocable():
+    _, refresh_token = create_token_pair(CLAIMS)
+    claims = jwt.decode(refresh_token, settings.SECRET_KEY, algorithms=["HS256"])
+    assert claims["type"] == "refresh" and claims["jti"]
+
+
+class FakeSession:
+    """Answers the single-user lookups the auth and admin endpoints make"""
+
+    def __init__(self, user):
+        self.user = user
+        self.commits = 0
+
+    async def scalar(self, query):
+        return self.user
+
+    async def get(self, model, ident):
+        return self.user if ident == self.user.id else None
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def clean_revocations(monkeypatch):
+    monkeypatch.setattr(revocation_list, "_revoked_tokens", {})
+    monkeypatch.setattr(revocation_list, "_local_revoked_users", set())
+    monkeypatch.setattr(settings, "STATELESS_SESSIONS", True)
+
+
+def make_client(session):
+    app = FastAPI()
+    app.include_router(auth_endpoints.router, prefix="/auth")
+    app.include_router(admin_endpoints.router, prefix="/admin")
+    app.dependency_overrides[get_async_db] = lambda: session
+    return TestClient(app)
+
+
+def test_refresh_token_can_be_exchanged_once(clean_revocations):
+    session = FakeSession(User(id=1, email="ada@example.com", is_active=True))
+    client = make_client(session)
+    _, refresh_token = create_token_pair(CLAIMS)
+
+    first = client.post("/auth/refresh-token", params={"refresh_token": refresh_token})
+    again = client.post("/auth/refresh-token", params={"refresh_token": refresh_token})
+    rotated = client.post("/auth/refresh-token", params={"refresh_token": first.json()["refresh_token"]})
+
+    assert first.status_code == 200
+    assert again.status_code == 401
+    assert rotated.status_code == 200
+
+
+def test_logout_revokes_access_and_refresh_tokens(clean_revocations):
+    client = make_client(FakeSession(User(id=1, email="ada@example.com", is_active=True)))
+    access_token, refresh_token = create_token_pair(CLAIMS)
+
+    response = client.post(
+        "/auth/logout",
+        params={"refresh_token": refresh_token},
+        headers={"Authorization": f"Bearer {access_token}"},
+    )
+
+    assert response.status_code == 204
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_user(token=access_token, db=None))
+    assert exc.value.status_code == 401
+    assert client.post("/auth/refresh-token", params={"refresh_token": refresh_token}).status_code == 401
+
+
+def test_deactivated_user_tokens_stop_working(clean_revocations, monkeypatch):
+    user = User(id=1, email="ada@example.com", is_active=True)
+    session = FakeSession(user)
+    client = make_client(session)
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", ["admin@example.com"])
+    admin = User(id=2, email="admin@example.com", is_active=True)
+    client.app.dependency_overrides[admin_endpoints.get_current_user] = lambda: admin
+    access_token, _ = create_token_pair(CLAIMS)
+
+    response = client.post("/admin/users/1/deactivate")
+
+    assert response.status_code == 204
+    assert user.is_active is False and session.commits == 1
+    with pytest.raises(HTTPException):
+        asyncio.run(get_current_user(token=access_token, db=None))
+    assert client.post("/admin/users/99/deactivate").status_code == 404
@@ -0,0 +1,53 @@
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.middleware.compression import StreamingAwareGZipMiddleware
+
+CHUNK = "data: " + "x" * 2000 + "\n\n"
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(StreamingAwareGZipMiddleware, minimum_size=500)
+
+    async def events():
+        for _ in range(3):
+            yield CHUNK
+
+    @app.post("/sse")
+    async def sse():
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/ndjson")
+    async def ndjson():
+        return StreamingResponse(events(), media_type="application/x-ndjson")
+
+    @app.get("/pdf")
+    async def pdf():
+        return Response(b"%PDF" + b"0" * 5000, media_type="application/pdf")
+
+    @app.get("/json")
+    async def json_body():
+        return JSONResponse({"text": "y" * 5000})
+
+    return TestClient(app)
+
+
+def test_streams_are_not_compressed_even_with_wildcard_accept():
+    client = make_client()
+    for path in ("/sse", "/ndjson"):
+        response = client.post(path, headers={"Accept": "*/*", "Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text == CHUNK * 3
+
+
+def test_pdf_is_not_compressed():
+    response = make_client().get("/pdf", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.content.startswith(b"%PDF")
+
+
+def test_large_json_is_compressed():
+    response = make_client().get("/json", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == {"text": "y" * 5000}
@@ -0,0 +1,124 @@
+import asyncio
+import base64
+import time
+import httpx
+import pytest
+from app.core.google_verifier import GoogleTokenVerifier
+
+rsa = pytest.importorskip("rsa")
+from google.auth import crypt, jwt as google_jwt  # noqa: E402
+
+AUDIENCE = "client-id.apps.googleusercontent.com"
+JWKS_URL = "https://keys.test/oauth2/v3/certs"
+
+
+def _b64(value: int) -> str:
+    raw = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+class LocalKey:
+    def __init__(self, kid: str):
+        self.kid = kid
+        public, self.private = rsa.newkeys(1024)
+        self.jwk = {"kty": "RSA", "alg": "RS256", "use": "sig", "kid": kid, "n": _b64(public.n), "e": _b64(public.e)}
+
+    def sign(self, **overrides) -> str:
+        now = int(time.time())
+        claims = {
+            "iss": "https://accounts.google.com",
+            "aud": AUDIENCE,
+            "sub": "1234",
+            "email": "ada@example.com",
+            "iat": now,
+            "exp": now + 3600,
+            **overrides,
+        }
+        signer = crypt.RSASigner.from_string(self.private.save_pkcs1().decode(), key_id=self.kid)
+        return google_jwt.encode(signer, claims).decode()
+
+
+class StubJwks:
+    """Serves ``keys`` with the given max-age and counts fetches"""
+
+    def __init__(self, keys, max_age: int = 3600):
+        self.keys = keys
+        self.max_age = max_age
+        self.fetches = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        assert str(request.url) == JWKS_URL
+        self.fetches += 1
+        return httpx.Response(
+            200,
+            json={"keys": [key.jwk for key in self.keys]},
+            headers={"Cache-Control": f"public, max-age={self.max_age}, must-revalidate"},
+        )
+
+
+@pytest.fixture(scope="module")
+def keys():
+    return LocalKey("k1"), LocalKey("k2")
+
+
+def make_verifier(jwks: StubJwks) -> GoogleTokenVerifier:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(jwks))
+    return GoogleTokenVerifier(AUDIENCE, jwks_url=JWKS_URL, http_client=client, min_refresh_interval=0)
+
+
+def verify_all(verifier: GoogleTokenVerifier, *tokens: str):
+    async def run():
+        return [await verifier.verify(token) for token in tokens]
+
+    return asyncio.run(run())
+
+
+def test_keys_are_cached_for_max_age(keys):
+    jwks = StubJwks([keys[0]])
+    claims = verify_all(make_verifier(jwks), keys[0].sign(sub="a"), keys[0].sign(sub="b"))
+    assert [c["sub"] for c in claims] == ["a", "b"]
+    assert jwks.fetches == 1
+
+
+def test_expired_key_cache_is_refetched(keys):
+    jwks = StubJwks([keys[0]], max_age=0)
+    verify_all(make_verifier(jwks), keys[0].sign(sub="a"), keys[0].sign(sub="b"))
+    assert jwks.fetches == 2
+
+
+def test_unknown_kid_triggers_one_refetch(keys):
+    jwks = StubJwks([keys[0]])
+    verifier = make_verifier(jwks)
+    verify_all(verifier, keys[0].sign())
+
+    # Google rotates in a new key before the cached copy expires
+    jwks.keys = [keys[0], keys[1]]
+    assert verify_all(verifier, keys[1].sign())[0]["email"] == "ada@example.com"
+    assert jwks.fetches == 2
+
+
+def test_key_not_in_jwks_is_rejected(keys):
+    jwks = StubJwks([keys[0]])
+    with pytest.raises(ValueError, match="unknown key id"):
+        verify_all(make_verifier(jwks), keys[1].sign())
+
+
+@pytest.mark.parametrize(
+    "overrides",
+    [
+        {"aud": "someone-else"},
+        {"iss": "https://evil.example.com"},
+        {"iat": int(time.time()) - 7200, "exp": int(time.time()) - 3600},
+    ],
+    ids=["audience", "issuer", "expired"],
+)
+def test_invalid_claims_are_rejected(keys, overrides):
+    with pytest.raises(ValueError):
+        verify_all(make_verifier(StubJwks([keys[0]])), keys[0].sign(**overrides))
+
+
+def test_verified_claims_are_memoized_per_token(keys):
+    jwks = StubJwks([keys[0]], max_age=0)
+    token = keys[0].sign()
+    verify_all(make_verifier(jwks), token, token)
+    assert jwks.fetches == 1
@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app.api.deps import get_ai_service, get_idempotency_store
+from app.api.router import router
+from app.core.auth import get_current_user
+from app.core.idempotency import (
+    DONE,
+    PENDING,
+    IdempotencyStore,
+    InMemoryIdempotencyBackend,
+    RedisIdempotencyBackend,
+)
+from app.models.user import User
+from app.schemas.resume_schemas import ResumeContent
+
+REQUEST = {"name": "Ada", "email": "ada@example.com", "description": "Engineer"}
+
+
+class CountingAIService:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_resume_content(self, description: str) -> ResumeContent:
+        self.calls += 1
+        return ResumeContent(education=[], experience=[f"call {self.calls}"], skills=[])
+
+
+def fake_user(request: Request) -> User:
+    return User(id=int(request.headers["X-User"]), email="user@example.com")
+
+
+def make_client():
+    service = CountingAIService()
+    store = IdempotencyStore(InMemoryIdempotencyBackend())
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_ai_service] = lambda: service
+    app.dependency_overrides[get_idempotency_store] = lambda: store
+    app.dependency_overrides[get_current_user] = fake_user
+    return TestClient(app), service
+
+
+def test_generate_replays_only_for_the_same_user():
+    client, service = make_client()
+    first = client.post(
+        "/generate-resume", json=REQUEST, headers={"Idempotency-Key": "k", "X-User": "1"}
+    )
+    replay = client.post(
+        "/generate-resume", json=REQUEST, headers={"Idempotency-Key": "k", "X-User": "1"}
+    )
+    other = client.post(
+        "/generate-resume", json=REQUEST, headers={"Idempotency-Key": "k", "X-User": "2"}
+    )
+
+    assert replay.headers.get("Idempotent-Replayed") == "true"
+    assert replay.json() == first.json()
+    assert "Idempotent-Replayed" not in other.headers
+    assert other.json()["content"]["experience"] == ["call 2"]
+    assert service.calls == 2
+
+
+def test_pending_claim_outlives_lock_ttl_while_computing():
+    backend = InMemoryIdempotencyBackend()
+    store = IdempotencyStore(backend, lock_ttl=0.2)
+
+    async def slow():
+        await asyncio.sleep(0.5)
+        return {"ok": True}
+
+    async def scenario():
+        task = asyncio.create_task(store.run("key", "fp", slow))
+        await asyncio.sleep(0.4)
+        pending = await backend.get("key")
+        result = await task
+        return pending, result
+
+    pending, result = asyncio.run(scenario())
+    assert pending is not None and pending["state"] == PENDING
+    assert result.value == {"ok": True} and not result.hit
+
+
+def redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis runs Lua scripts through lupa
+    return RedisIdempotencyBackend(client=fakeredis.FakeAsyncRedis())
+
+
+BACKENDS = [InMemoryIdempotencyBackend, redis_backend]
+
+
+async def lapse(backend, key):
+    """Expire a pending claim as if its worker had stalled past lock_ttl"""
+    if isinstance(backend, RedisIdempotencyBackend):
+        await backend.client.delete(f"{backend.prefix}:{key}")
+    else:
+        backend.pending[key]["expires_at"] = 0
+
+
+def claim(token):
+    return {"state": PENDING, "fingerprint": "fp", "token": token}
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_lapsed_worker_cannot_touch_the_new_claim(make_backend):
+    backend = make_backend()
+    stale, current = claim("stale"), claim("current")
+
+    async def scenario():
+        assert await backend.reserve("key", stale, 60) is None
+        await lapse(backend, "key")
+        assert await backend.reserve("key", current, 60) is None
+
+        await backend.extend("key", stale, 60)
+        await backend.release("key", stale)
+        done = {"state": DONE, "fingerprint": "fp", "value": 1}
+        stored = await backend.complete("key", stale, done, 60)
+        return stored, await backend.get("key")
+
+    stored, record = asyncio.run(scenario())
+    assert stored is False
+    assert record["state"] == PENDING and record["token"] == "current"
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_owner_completes_and_releases(make_backend):
+    backend = make_backend()
+    done = {"state": DONE, "fingerprint": "fp", "value": 1}
+
+    async def scenario():
+        await backend.reserve("stored", claim("a"), 60)
+        stored = await backend.complete("stored", claim("a"), done, 60)
+        await backend.reserve("released", claim("b"), 60)
+        await backend.release("released", claim("b"))
+        return stored, await backend.get("stored"), await backend.get("released")
+
+    stored, record, released = asyncio.run(scenario())
+    assert stored is True and record == done
+    assert released is None
+
+
+class FailingCompleteBackend(InMemoryIdempotencyBackend):
+    async def complete(self, key, claim, record, ttl):
+        raise ConnectionError("redis went away")
+
+
+def test_failed_store_releases_the_claim_for_waiting_retries():
+    store = IdempotencyStore(FailingCompleteBackend(), wait_timeout=2)
+    calls = []
+
+    async def compute():
+        calls.append(None)
+        await asyncio.sleep(0.2)
+        return {"call": len(calls)}
+
+    async def scenario():
+        first = asyncio.create_task(store.run("key", "fp", compute))
+        await asyncio.sleep(0.05)
+        # Waits on the first request, then runs itself once the claim is gone
+        retry = await store.run("key", "fp", compute)
+        return await first, retry
+
+    first, retry = asyncio.run(scenario())
+    assert first.value == {"call": 1} and not first.hit
+    assert retry.value == {"call": 2} and not retry.hit
@@ -0,0 +1,84 @@
+import asyncio
+import pytest
+from app.jobs.queue import InMemoryJobBackend, JobQueue, PermanentJobError, RedisJobBackend
+from app.schemas.job_schemas import JobStatus
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_permanent_errors_are_not_retried():
+    calls = []
+
+    async def handler(payload, context):
+        calls.append(payload)
+        raise PermanentJobError("bad payload")
+
+    async def scenario():
+        queue = JobQueue(InMemoryJobBackend(), {"t": handler}, max_attempts=3, retry_backoff=0.01)
+        job = await queue.submit("t", {})
+        await queue._process(job.id)
+        return await queue.get(job.id)
+
+    job = run(scenario())
+    assert job.status == JobStatus.FAILED
+    assert len(calls) == 1
+
+
+def test_transient_errors_are_retried():
+    async def handler(payload, context):
+        raise RuntimeError("provider down")
+
+    async def scenario():
+        queue = JobQueue(InMemoryJobBackend(), {"t": handler}, max_attempts=3, retry_backoff=0.01)
+        job = await queue.submit("t", {})
+        await queue._process(job.id)
+        return await queue.get(job.id)
+
+    assert run(scenario()).status == JobStatus.QUEUED
+
+
+def _redis_backend(server, **kwargs):
+    fakeredis = pytest.importorskip("fakeredis")
+    return RedisJobBackend(client=fakeredis.FakeAsyncRedis(server=server), **kwargs)
+
+
+def test_jobs_of_a_dead_consumer_are_requeued():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    async def scenario():
+        crashed = _redis_backend(server, heartbeat_ttl=1)
+        await crashed.push("job-1")
+        assert await crashed.pop(timeout=1) == "job-1"
+        # The consumer dies mid-job: no ack, heartbeat stops
+        crashed._heartbeat_task.cancel()
+        await crashed.client.delete(crashed._alive_key(crashed.consumer_id))
+
+        survivor = _redis_backend(server)
+        assert await survivor.pop(timeout=1) == "job-1"
+        await survivor.ack("job-1")
+        assert await survivor.client.llen(survivor.processing_key) == 0
+        await survivor.close()
+
+    run(scenario())
+
+
+def test_acked_jobs_are_not_requeued():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    async def scenario():
+        first = _redis_backend(server)
+        await first.push("job-1")
+        assert await first.pop(timeout=1) == "job-1"
+        await first.ack("job-1")
+        first._heartbeat_task.cancel()
+        await first.client.delete(first._alive_key(first.consumer_id))
+
+        second = _redis_backend(server)
+        assert await second.requeue_stale() == 0
+        await second.close()
+
+    run(scenario())
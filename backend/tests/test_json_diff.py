@@ -0,0 +1,57 @@
+import pytest
+from app.utils import json_diff
+
+RESUME = {
+    "name": "Ada Lovelace",
+    "contact": {"email": "ada@example.com", "links": ["https://a.example", "https://b.example"]},
+    "experience": [
+        {"title": "Analyst", "skills": ["math", "notes"], "years": 2},
+        {"title": "Engineer", "skills": ["engines"], "years": 3},
+    ],
+    "skills": ["python", "sql", "rust"],
+}
+
+CASES = {
+    "unchanged": RESUME,
+    "nested field edited": {**RESUME, "contact": {**RESUME["contact"], "email": "ada@lovelace.dev"}},
+    "key added and removed": {k: v for k, v in {**RESUME, "summary": "Analyst"}.items() if k != "name"},
+    "item inserted in the middle": {**RESUME, "skills": ["python", "go", "sql", "rust"]},
+    "items removed": {**RESUME, "skills": ["python"]},
+    "list of dicts edited in place": {
+        **RESUME,
+        "experience": [
+            {"title": "Analyst", "skills": ["math", "notes", "tables"], "years": 2},
+            {"title": "Lead Engineer", "skills": [], "years": 3},
+        ],
+    },
+    "list item replaced by a dict": {**RESUME, "skills": ["python", {"name": "sql", "level": 3}, "rust"]},
+    "type change": {**RESUME, "experience": {"Analyst": 2, "Engineer": 3}},
+    "escaped keys": {**RESUME, "a/b": {"~c": 1}, "contact": {"x~/y": [1, 2]}},
+    "emptied": {},
+}
+
+
+@pytest.mark.parametrize("new", CASES.values(), ids=CASES.keys())
+def test_apply_diff_round_trips(new):
+    ops = json_diff.diff(RESUME, new)
+    assert json_diff.apply(RESUME, ops) == new
+    # And back again
+    assert json_diff.apply(new, json_diff.diff(new, RESUME)) == RESUME
+
+
+def test_diff_of_equal_documents_is_empty():
+    assert json_diff.diff(RESUME, {**RESUME}) == []
+
+
+def test_diff_size_tracks_the_change():
+    edited = {**RESUME, "experience": [RESUME["experience"][0], {**RESUME["experience"][1], "years": 4}]}
+    assert json_diff.diff(RESUME, edited) == [
+        {"op": "replace", "path": "/experience/1/years", "value": 4}
+    ]
+
+
+def test_apply_does_not_mutate_its_input():
+    before = {"skills": ["python"], "contact": {"email": "a@example.com"}}
+    after = {"skills": ["python", "sql"], "contact": {}}
+    json_diff.apply(before, json_diff.diff(before, after))
+    assert before == {"skills": ["python"], "contact": {"email": "a@example.com"}}
@@ -0,0 +1,237 @@
+import asyncio
+import contextlib
+import pytest
+from app.core.config import settings
+from app.services.llm_router import CircuitBreaker, LLMRouter, NoProviderAvailable
+
+
+class FakeAgent:
+    """Answers with its own name after ``latency`` seconds, or raises ``error``"""
+
+    def __init__(self, name, latency=0.0, error=None):
+        self.name = name
+        self.latency = latency
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def run(self, prompt):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.name
+
+
+class FakeStreamResult:
+    def __init__(self, deltas, error=None):
+        self.deltas = deltas
+        self.error = error
+
+    async def stream_text(self, delta=False):
+        for item in self.deltas:
+            await asyncio.sleep(0)
+            yield item
+        if self.error is not None:
+            raise self.error
+
+
+class FakeStreamAgent:
+    def __init__(self, deltas=("a", "b", "c"), error=None):
+        self.deltas = deltas
+        self.error = error
+
+    @contextlib.asynccontextmanager
+    async def run_stream(self, prompt):
+        yield FakeStreamResult(self.deltas, self.error)
+
+
+def half_open_stream_router(agent):
+    router = LLMRouter([("streamer", agent)], hedge=False)
+    breaker = router.providers[0].breaker
+    breaker.cooldown = 0
+    open_breaker(breaker)
+    return router, breaker
+
+
+async def consume(router, fail=None):
+    async with router.run_stream("p") as result:
+        async for i, delta in aenumerate(result.stream_text(delta=True)):
+            yield delta
+            if fail is not None and i == 0:
+                raise fail
+
+
+async def aenumerate(iterator):
+    i = 0
+    async for item in iterator:
+        yield i, item
+        i += 1
+
+
+def open_breaker(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.threshold):
+        breaker.on_failure()
+
+
+@pytest.fixture
+def quick_hedge(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_ROUTER_DEFAULT_LATENCY", 0.05)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY", 0.05)
+
+
+def test_breaker_opens_then_lets_one_probe_through_after_cooldown():
+    breaker = CircuitBreaker(threshold=2, cooldown=0.05)
+    breaker.on_failure()
+    assert breaker.state == "closed"
+    breaker.on_failure()
+    assert breaker.state == "open"
+    assert breaker.acquire() is None
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.state == "half_open"
+    assert breaker.acquire() is True
+    assert breaker.acquire() is None
+    assert not breaker.allow()
+
+    breaker.on_failure(probe=True)
+    assert breaker.state == "open"
+
+    asyncio.run(asyncio.sleep(0.06))
+    assert breaker.acquire() is True
+    breaker.on_success()
+    assert breaker.state == "closed"
+    assert breaker.acquire() is False
+
+
+def test_cancelled_probe_releases_the_claim():
+    breaker = CircuitBreaker(threshold=1, cooldown=0)
+    breaker.on_failure()
+    assert breaker.acquire() is True
+    breaker.on_cancel(probe=True)
+    assert breaker.acquire() is True
+
+
+def test_burst_sends_a_single_probe_to_a_half_open_provider():
+    flaky = FakeAgent("flaky", latency=0.05)
+    router = LLMRouter([("flaky", flaky)], hedge=False)
+    breaker = router.providers[0].breaker
+    breaker.cooldown = 0
+    open_breaker(breaker)
+
+    async def burst():
+        return await asyncio.gather(*(router.run("p") for _ in range(5)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert flaky.calls == 1
+    assert [r.model_name for r in results if not isinstance(r, Exception)] == ["flaky"]
+    assert sum(isinstance(r, NoProviderAvailable) for r in results) == 4
+    assert breaker.state == "closed"
+
+
+def test_burst_beyond_the_probe_goes_to_the_next_provider():
+    flaky, backup = FakeAgent("flaky", latency=0.05), FakeAgent("backup")
+    router = LLMRouter([("flaky", flaky), ("backup", backup)], hedge=False)
+    router.providers[0].breaker.cooldown = 0
+    open_breaker(router.providers[0].breaker)
+
+    async def burst():
+        return await asyncio.gather(*(router.run("p") for _ in range(5)))
+
+    results = asyncio.run(burst())
+    assert sorted(r.model_name for r in results) == ["backup"] * 4 + ["flaky"]
+
+
+def test_failover_to_next_provider_on_error():
+    primary = FakeAgent("primary", error=RuntimeError("down"))
+    backup = FakeAgent("backup")
+    router = LLMRouter([("primary", primary), ("backup", backup)], hedge=False)
+
+    result = asyncio.run(router.run("p"))
+    assert result.model_name == "backup"
+    assert router.providers[0].breaker.failures == 1
+
+
+def test_last_error_is_raised_when_every_provider_fails():
+    router = LLMRouter(
+        [("a", FakeAgent("a", error=RuntimeError("a down"))), ("b", FakeAgent("b", error=RuntimeError("b down")))],
+        hedge=False,
+    )
+    with pytest.raises(RuntimeError, match="b down"):
+        asyncio.run(router.run("p"))
+
+
+def test_slow_primary_is_hedged_and_cancelled(quick_hedge):
+    primary = FakeAgent("primary", latency=1.0)
+    backup = FakeAgent("backup", latency=0.01)
+    router = LLMRouter([("primary", primary), ("backup", backup)], hedge=True)
+
+    assert asyncio.run(router.run("p")).model_name == "backup"
+    assert primary.cancelled == 1
+    assert router.providers[0].breaker.failures == 0
+
+
+def test_hedge_skips_a_provider_whose_probe_is_taken(quick_hedge):
+    primary = FakeAgent("primary", latency=0.2)
+    backup = FakeAgent("backup", latency=0.01)
+    router = LLMRouter([("primary", primary), ("backup", backup)], hedge=True)
+    breaker = router.providers[1].breaker
+    breaker.cooldown = 0
+    open_breaker(breaker)
+    assert breaker.acquire() is True
+
+    assert asyncio.run(router.run("p")).model_name == "primary"
+    assert backup.calls == 0
+
+
+def test_abandoned_probe_stream_releases_the_claim():
+    router, breaker = half_open_stream_router(FakeStreamAgent())
+
+    async def read_one_then_close():
+        stream = consume(router)
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first
+
+    assert asyncio.run(read_one_then_close()) == "a"
+    assert not breaker._probing
+    assert router.ranked() == router.providers
+    assert breaker.failures == breaker.threshold
+
+
+def test_consumer_error_is_not_a_provider_failure():
+    router, breaker = half_open_stream_router(FakeStreamAgent())
+
+    async def run():
+        async for _ in consume(router, fail=ValueError("consumer bug")):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+    assert breaker.failures == breaker.threshold
+    assert breaker.acquire() is True
+
+
+def test_provider_error_mid_stream_is_recorded():
+    router = LLMRouter([("streamer", FakeStreamAgent(error=RuntimeError("reset")))], hedge=False)
+
+    async def run():
+        return [delta async for delta in consume(router)]
+
+    with pytest.raises(RuntimeError, match="reset"):
+        asyncio.run(run())
+    assert router.providers[0].breaker.failures == 1
+
+
+def test_completed_stream_closes_a_half_open_breaker():
+    router, breaker = half_open_stream_router(FakeStreamAgent())
+
+    async def run():
+        return [delta async for delta in consume(router)]
+
+    assert asyncio.run(run()) == ["a", "b", "c"]
+    assert breaker.state == "closed"
@@ -0,0 +1,37 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+from app.services.match_service import INLINE_ENCODE_LIMIT, MatchEngine, ResumeMatchService
+
+
+def make_resume(resume_id: int, skills):
+    return SimpleNamespace(id=resume_id, updated_at=datetime(2026, 1, 1), content={"skills": skills})
+
+
+def test_fit_contents_sets_idf():
+    engine = MatchEngine(n_features=2**12)
+    engine.fit_contents([{"skills": ["python"]}, {"skills": ["python", "rust"]}, None])
+    assert engine.corpus_size == 3
+    assert engine.fitted_at > 0
+
+
+def test_bulk_encoding_matches_inline_and_fills_cache():
+    engine = MatchEngine(n_features=2**12)
+    service = ResumeMatchService(db=None, engine=engine)
+    resumes = [make_resume(i, ["python", f"skill{i}"]) for i in range(INLINE_ENCODE_LIMIT + 5)]
+
+    batch = asyncio.run(service._encode_resumes(resumes))
+    assert batch.size == len(resumes)
+    assert all(engine.cached((r.id, r.updated_at)) is not None for r in resumes)
+
+    inline = engine.batch(engine.encode_contents([r.content for r in resumes]))
+    assert (batch.indices == inline.indices).all()
+
+
+def test_match_jobs_ranks_relevant_job_first():
+    engine = MatchEngine(n_features=2**12)
+    service = ResumeMatchService(db=None, engine=engine)
+    scores = asyncio.run(
+        service.match_jobs(make_resume(1, ["python", "fastapi"]), ["python fastapi developer", "pastry chef"])
+    )
+    assert scores[0] > scores[1]
@@ -0,0 +1,61 @@
+import os
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.api.deps import get_pdf_executor
+from app.api.router import router
+from app.core.auth import get_current_user
+from app.core.config import settings
+from app.models.user import User
+
+RESUME = {
+    "name": "Ada",
+    "email": "ada@example.com",
+    "content": {"education": [], "experience": [], "skills": []},
+}
+
+
+class IdleExecutor:
+    queue_depth = 64
+
+    async def render_many(self, fn, arg_list):
+        return ["out.pdf"] * len(arg_list)
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_pdf_executor] = lambda: IdleExecutor()
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="ada@example.com")
+    return TestClient(app)
+
+
+def test_oversized_batch_is_rejected_with_413():
+    response = make_client().post("/generate-pdf/batch", json=[RESUME] * (settings.PDF_RENDER_MAX_BATCH + 1))
+    assert response.status_code == 413
+
+
+def test_batch_within_limit_is_rendered():
+    response = make_client().post("/generate-pdf/batch", json=[RESUME] * 3)
+    assert response.status_code == 200
+    assert [r["status"] for r in response.json()["results"]] == ["ok"] * 3
+
+
+def test_pdf_endpoints_require_authentication():
+    app = FastAPI()
+    app.include_router(router)
+    app.dependency_overrides[get_pdf_executor] = lambda: IdleExecutor()
+    client = TestClient(app)
+    assert client.post("/generate-pdf", json=RESUME).status_code == 401
+    assert client.post("/generate-pdf/batch", json=[RESUME]).status_code == 401
+
+
+def test_same_named_resumes_get_separate_files(tmp_path):
+    from app.schemas.resume_schemas import ResumeData
+    from app.services.pdf_service import PDFService
+
+    data = ResumeData(**{**RESUME, "name": "../Ada Lovelace"})
+    first = PDFService.create_resume(data, str(tmp_path))
+    second = PDFService.create_resume(data, str(tmp_path))
+
+    assert first != second
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(map(os.path.basename, [first, second]))
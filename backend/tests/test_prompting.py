@@ -0,0 +1,34 @@
+from app.services.prompting import build_prompt, encode_compact, fit_to_budget
+
+
+def test_encode_compact_drops_empty_fields():
+    lines = encode_compact({"name": "Ada", "summary": "", "phone": None, "skills": []})
+    assert lines == ["name: Ada"]
+
+
+def test_encode_compact_inlines_short_lists():
+    assert encode_compact({"skills": ["Python", "SQL"]}) == ["skills: Python, SQL"]
+
+
+def test_encode_compact_skips_empty_nested_entries():
+    assert encode_compact({"experience": [{"company": "", "title": None}]}) == []
+    assert encode_compact({"experience": [{"company": "X"}, {"company": ""}]}) == [
+        "experience:",
+        "  - company: X",
+    ]
+    assert encode_compact({"x": [[None]]}) == []
+    assert encode_compact({"x": {"y": {"z": ""}}}) == []
+
+
+def test_build_prompt_with_empty_nested_entries():
+    prompt = build_prompt("E:", {"experience": [{"company": "", "title": None}]}, "gpt-4o-mini", "enhance")
+    assert prompt.text.startswith("E:")
+
+
+def test_fit_to_budget_trims_without_mutating_input():
+    data = {"summary": "word " * 5000, "skills": ["Python"]}
+    fitted, trimmed = fit_to_budget(data, budget=200, model_name="gpt-4o-mini")
+    assert trimmed
+    assert len(fitted["summary"]) < len(data["summary"])
+    assert data["summary"] == "word " * 5000
+    assert fitted["skills"] == ["Python"]
@@ -0,0 +1,67 @@
+import sys
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+from app.core.query_profiler import fingerprint, query_profiler
+
+
+@pytest.fixture
+def profiler(monkeypatch):
+    monkeypatch.setattr(query_profiler, "enabled", True)
+    monkeypatch.setattr(query_profiler, "sample_rate", 1.0)
+    query_profiler.reset()
+    yield query_profiler
+    query_profiler.reset()
+
+
+def select_samples() -> float:
+    return REGISTRY.get_sample_value("db_query_duration_seconds_count", {"statement": "SELECT"}) or 0.0
+
+
+def test_app_import_installs_the_cursor_hooks(profiler):
+    import app.main  # noqa: F401
+
+    assert "app.db.instrumentation" in sys.modules
+    before = select_samples()
+    engine = create_engine("sqlite://")
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    assert select_samples() == before + 1
+    assert [row["fingerprint"] for row in profiler.report()["queries"]] == ["SELECT ?"]
+
+
+def test_repeated_queries_in_one_request_are_flagged(profiler, monkeypatch):
+    from fastapi import FastAPI
+    from fastapi.testclient import TestClient
+    from app.core.query_profiler import QueryProfilerMiddleware
+    from app.db import instrumentation  # noqa: F401
+
+    monkeypatch.setattr(profiler, "n_plus_one_threshold", 3)
+    engine = create_engine("sqlite://")
+    app = FastAPI()
+    app.middleware("http")(QueryProfilerMiddleware(profiler))
+
+    @app.get("/items/{count}")
+    def items(count: int):
+        with engine.connect() as connection:
+            for i in range(count):
+                connection.execute(text("SELECT :i"), {"i": i})
+            connection.execute(text("SELECT 1, 2"))
+        return {}
+
+    client = TestClient(app)
+    client.get("/items/2")
+    assert profiler.report()["n_plus_one"] == []
+
+    client.get("/items/5")
+    report = profiler.report()
+    assert report["n_plus_one"] == [{"route": "GET /items/{count}", "fingerprint": "SELECT ?", "count": 5}]
+    counts = {row["fingerprint"]: row["count"] for row in report["queries"]}
+    assert counts == {"SELECT ?": 7, "SELECT ?, ?": 2}
+
+
+def test_fingerprint_ignores_literals_and_in_list_length():
+    assert fingerprint("SELECT * FROM t WHERE id IN (1, 2, 3) AND name = 'x'") == fingerprint(
+        "SELECT * FROM t WHERE id IN (%(id_1)s) AND name = %(name)s -- note"
+    )
@@ -0,0 +1,80 @@
+import base64
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.core.google_verifier import google_token_verifier
+from app.core.security import create_access_token
+from app.middleware.rate_limiter import InMemoryRateLimitBackend, RateLimiter, RedisRateLimitBackend
+
+
+def redis_backend():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis runs Lua scripts through lupa
+    return RedisRateLimitBackend(client=fakeredis.FakeAsyncRedis())
+
+
+BACKENDS = [InMemoryRateLimitBackend, redis_backend]
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_limit_is_enforced_per_key(make_backend):
+    backend = make_backend()
+
+    async def scenario():
+        results = [await backend.hit([("ip:a", 3)], 60) for _ in range(4)]
+        other = await backend.hit([("ip:b", 3)], 60)
+        return results, other
+
+    results, other = asyncio.run(scenario())
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results[:3]] == [2, 1, 0]
+    assert results[3].retry_after >= 1
+    assert other.allowed
+
+
+@pytest.mark.parametrize("make_backend", BACKENDS)
+def test_denied_request_consumes_no_bucket(make_backend):
+    backend = make_backend()
+
+    async def scenario():
+        await backend.hit([("user:ada", 1)], 60)
+        denied = [await backend.hit([("ip:a", 3), ("user:ada", 1)], 60) for _ in range(5)]
+        ip_only = await backend.hit([("ip:a", 3)], 60)
+        return denied, ip_only
+
+    denied, ip_only = asyncio.run(scenario())
+    assert not any(r.allowed for r in denied)
+    assert ip_only.allowed and ip_only.remaining == 2
+
+
+def make_client(limiter: RateLimiter) -> TestClient:
+    app = FastAPI()
+    app.middleware("http")(limiter)
+
+    @app.get("/ping")
+    async def ping():
+        return {}
+
+    return TestClient(app)
+
+
+# Shaped like a Google ID token: RS256 header, payload and signature unchecked here
+GOOGLE_TOKEN = base64.urlsafe_b64encode(b'{"alg":"RS256","kid":"k1"}').decode().rstrip("=") + ".e30.sig"
+
+
+def test_google_tokens_get_a_per_user_bucket(monkeypatch):
+    async def verify(token):
+        if token != GOOGLE_TOKEN:
+            raise ValueError("bad token")
+        return {"email": "ada@example.com", "sub": "123"}
+
+    monkeypatch.setattr(google_token_verifier, "verify", verify)
+    client = make_client(RateLimiter(InMemoryRateLimitBackend(), ip_limit=100, user_limit=2))
+    google = {"Authorization": f"Bearer {GOOGLE_TOKEN}"}
+
+    assert [client.get("/ping", headers=google).status_code for _ in range(3)] == [200, 200, 429]
+    # The same user with an app token shares the bucket; a forged token is limited by IP only
+    app_token = {"Authorization": f"Bearer {create_access_token({'sub': 'ada@example.com', 'uid': 1})}"}
+    assert client.get("/ping", headers=app_token).status_code == 429
+    assert client.get("/ping", headers={"Authorization": "Bearer forged"}).status_code == 200
@@ -0,0 +1,156 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+from app.api.endpoints import resume_endpoints
+from app.core.auth import get_current_user
+from app.models.resume_models import ResumeVersion
+from app.models.user import User
+from app.services.resume_service import ResumeService
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+class SyncSessionAdapter:
+    """The AsyncSession methods the resume services use, over a sync sqlite Session"""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def add(self, instance):
+        self.session.add(instance)
+
+    async def scalar(self, statement):
+        return self.session.scalar(statement)
+
+    async def scalars(self, statement):
+        return self.session.scalars(statement)
+
+    async def execute(self, statement):
+        return self.session.execute(statement)
+
+    async def flush(self):
+        self.session.flush()
+
+    async def commit(self):
+        self.session.commit()
+
+    async def refresh(self, instance):
+        self.session.refresh(instance)
+
+    async def delete(self, instance):
+        self.session.delete(instance)
+
+
+@pytest.fixture
+def session():
+    # TestClient runs the app on another thread; share one connection
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    with engine.begin() as conn:
+        # search_vector is generated by Postgres; a plain column stands in here
+        conn.execute(text(
+            "CREATE TABLE resumes (id INTEGER PRIMARY KEY, user_id INTEGER, content JSON,"
+            " created_at DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL, updated_at DATETIME,"
+            " search_vector TEXT)"
+        ))
+    ResumeVersion.__table__.create(engine)
+    with Session(engine) as sync_session:
+        yield SyncSessionAdapter(sync_session)
+    engine.dispose()
+
+
+@pytest.fixture
+def client(session):
+    def get_resume_service():
+        service = ResumeService(session)
+        service.versions.snapshot_interval = 3
+        return service
+
+    app = FastAPI()
+    app.include_router(resume_endpoints.router, prefix="/resumes")
+    app.dependency_overrides[get_current_user] = lambda: User(id=1, email="ada@example.com")
+    app.dependency_overrides[resume_endpoints.get_resume_service] = get_resume_service
+    return TestClient(app)
+
+
+SUMMARY = "Mathematician who wrote the first published algorithm for the Analytical Engine."
+V1 = {"name": "Ada", "summary": SUMMARY, "skills": ["math"], "experience": [{"title": "Analyst", "years": 2}]}
+V2 = {**V1, "skills": ["math", "engines"]}
+V3 = {**V2, "experience": [{"title": "Analyst", "years": 3}]}
+
+
+def make_history(client):
+    resume_id = client.post("/resumes", json={"content": V1}).json()["id"]
+    for content in (V2, V3):
+        assert client.put(f"/resumes/{resume_id}", json={"content": content}).status_code == 200
+    return resume_id
+
+
+def test_writes_record_a_snapshot_then_deltas(client, session):
+    resume_id = make_history(client)
+
+    versions = client.get(f"/resumes/{resume_id}/versions").json()
+    assert [(v["version"], v["is_snapshot"]) for v in versions] == [(3, False), (2, False), (1, True)]
+    # Deltas store operations, not the document
+    stored = session.session.get(ResumeVersion, 2)
+    assert stored.data == [{"op": "add", "path": "/skills/1", "value": "engines"}]
+
+
+def test_unchanged_update_records_no_version(client):
+    resume_id = client.post("/resumes", json={"content": V1}).json()["id"]
+    client.put(f"/resumes/{resume_id}", json={"content": V1})
+    assert len(client.get(f"/resumes/{resume_id}/versions").json()) == 1
+
+
+def test_every_version_is_reconstructed(client):
+    resume_id = make_history(client)
+    for version, content in enumerate((V1, V2, V3), start=1):
+        response = client.get(f"/resumes/{resume_id}/versions/{version}")
+        assert response.json() == {"version": version, "content": content}
+    assert client.get(f"/resumes/{resume_id}/versions/4").status_code == 404
+
+
+def test_diff_between_versions(client):
+    resume_id = make_history(client)
+    operations = client.get(f"/resumes/{resume_id}/versions/2/diff/1").json()["operations"]
+    assert operations == [{"op": "remove", "path": "/skills/1"}]
+
+
+def test_restore_makes_an_old_version_current(client):
+    resume_id = make_history(client)
+
+    response = client.post(f"/resumes/{resume_id}/versions/1/restore")
+    assert response.status_code == 200
+    assert response.json()["content"] == V1
+    assert client.get(f"/resumes/{resume_id}").json()["content"] == V1
+
+    # The restore is itself a version; the snapshot interval forces a full copy
+    versions = client.get(f"/resumes/{resume_id}/versions").json()
+    assert (versions[0]["version"], versions[0]["is_snapshot"]) == (4, True)
+    assert client.get(f"/resumes/{resume_id}/versions/3").json()["content"] == V3
+    assert client.get(f"/resumes/{resume_id}/versions/4").json()["content"] == V1
+
+
+def test_restore_of_missing_version_or_foreign_resume_is_404(client):
+    resume_id = make_history(client)
+    assert client.post(f"/resumes/{resume_id}/versions/9/restore").status_code == 404
+    assert client.post(f"/resumes/{resume_id + 1}/versions/1/restore").status_code == 404
+
+
+def test_compacted_history_still_reconstructs(client):
+    resume_id = make_history(client)
+    client.put(f"/resumes/{resume_id}", json={"content": V1})
+
+    assert client.post(f"/resumes/{resume_id}/versions/compact?keep_last=2").json() == {"removed": 1}
+    versions = client.get(f"/resumes/{resume_id}/versions").json()
+    assert [v["version"] for v in versions] == [4, 3, 1]
+    assert client.get(f"/resumes/{resume_id}/versions/3").json()["content"] == V3